@@ -0,0 +1,167 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+
+from models import UserActivity
+
+MODES = ('sync', 'async', 'drop')
+
+
+class ActivityLogger:
+    """Write-behind queue for ``UserActivity`` rows.
+
+    ``activity_logger.log(activity_type=..., message=..., ...)`` takes the
+    same fields as ``UserActivity`` but doesn't touch the request's session,
+    so endpoints no longer need a second commit just for the activity row.
+    A background thread writes queued records with one multi-row INSERT
+    per batch.
+
+    ``ACTIVITY_LOG_MODE`` picks the durability trade-off:
+
+    * ``sync``: write immediately in the calling thread;
+    * ``async`` (default): queue; when the queue is full, write inline so
+      nothing is lost;
+    * ``drop``: queue; when the queue is full, drop the record and count it.
+
+    Queued records are flushed at interpreter exit. Records still queued
+    when a process is killed outright are lost in the async modes.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.mode = 'async'
+        self.batch_size = 200
+        self.flush_interval = 1.0
+        self.queue = queue.Queue(maxsize=10000)
+        self.dropped = 0
+        self.written = 0
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+        self.mode = app.config.get('ACTIVITY_LOG_MODE',
+                                   os.getenv('ACTIVITY_LOG_MODE', 'async'))
+        if self.mode not in MODES:
+            raise ValueError(f'ACTIVITY_LOG_MODE must be one of {MODES}')
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', 200)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL',
+                                             1.0)
+        self.queue = queue.Queue(
+            maxsize=app.config.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+        atexit.register(self.shutdown)
+
+    def log(self, activity_type, message, username=None, user_id=None,
+            site_id=None, timestamp=None, mode=None):
+        """Record an activity; ``mode`` overrides ACTIVITY_LOG_MODE.
+
+        Call it after the change being recorded has committed: the row is
+        written on its own connection and survives a rollback. Pass
+        ``mode='sync'`` when the caller (or the next request) reads the
+        row back.
+        """
+        mode = mode or self.mode
+        record = {
+            'activity_type': activity_type,
+            'message': message,
+            'username': username,
+            'user_id': user_id,
+            'site_id': site_id,
+            'timestamp': timestamp or datetime.utcnow()
+        }
+        if mode == 'sync':
+            self.write([record])
+            return
+
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if mode == 'drop':
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    self.app.logger.warning(
+                        f'Activity queue full; {self.dropped} records dropped')
+            else:
+                self.write([record])
+
+    def write(self, records):
+        """Insert ``records`` in one statement on a connection of its own."""
+        try:
+            with self.app.app_context(), self.db.engine.begin() as conn:
+                conn.execute(UserActivity.__table__.insert(), records)
+            self.written += len(records)
+        except Exception as e:
+            if len(records) > 1:
+                # One bad row (e.g. its user was deleted meanwhile) shouldn't
+                # take the rest of the batch down with it
+                for record in records:
+                    self.write([record])
+                return
+            self.app.logger.error(
+                f'Failed to write activity record: {str(e)}')
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self.write(batch)
+
+    def shutdown(self):
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _drain(self, limit=None):
+        batch = []
+        while len(batch) < (self.batch_size if limit is None else limit):
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _ensure_thread(self):
+        # Started lazily, and again after a fork: worker processes don't
+        # inherit the parent's threads
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run,
+                                                name='activity-logger',
+                                                daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            # Let a burst accumulate so it goes out as one INSERT
+            time.sleep(0.05)
+            self.write([first] + self._drain(self.batch_size - 1))
+
+    def stats(self):
+        return {
+            'mode': self.mode,
+            'queued': self.queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+
+activity_logger = ActivityLogger()
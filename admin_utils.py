@@ -1,5 +1,6 @@
 
 from models import db, User
+from identity_cache import identity_cache
 
 def get_admins():
     """Get the list of admin usernames from database"""
@@ -20,6 +21,7 @@ def add_admin(username):
         if not user.is_admin:
             user.is_admin = True
             db.session.commit()
+            identity_cache.invalidate(user.id)
             return True
         return False
     except Exception as e:
@@ -37,6 +39,7 @@ def remove_admin(username):
         if user.is_admin:
             user.is_admin = False
             db.session.commit()
+            identity_cache.invalidate(user.id)
             return True
         return False
     except Exception as e:
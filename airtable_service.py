@@ -1,7 +1,9 @@
 import os
-import requests
 import json
 from datetime import datetime
+from lazy_imports import lazy_module
+
+requests = lazy_module('requests')
 
 class AirtableService:
     def __init__(self):
@@ -1,18 +1,41 @@
+import startup_profiler
+
+startup_profiler.install()
+
 import os
 import time
 import html
 import json
 import hashlib
-import requests
 import jinja2
 import werkzeug.exceptions
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timedelta
 from functools import wraps
 from dotenv import load_dotenv
 from flask import Flask, render_template, redirect, flash, request, jsonify, url_for, abort, session, Response
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from models import db, User, Site, SitePage, UserActivity, Club, ClubMembership, ClubFeaturedProject, ClubAssignment
+from models import db, content_digest, User, Site, SitePage, SiteRevision, UserActivity, ActivityDailyRollup, Club, ClubMembership, ClubFeaturedProject, ClubAssignment, PurgeJob, club_roles_for
+from query_metrics import query_metrics
+from slow_query_log import slow_query_log
+from identity_cache import identity_cache
+from template_profiler import template_profiler
+from asset_pipeline import assets
+from tag_facets import tag_facets
+from system_settings import system_settings
+from activity_logger import activity_logger
+from club_access import ROLE_RANK, club_access, current_club, has_club_role
+from purge import purge_worker, delete_sites, soft_delete_user, soft_delete_club
+from schema_version import check_schema_version, upgrade_database
+import text_search
+import text_patch
+import site_revisions
+from lazy_imports import lazy_module
+
+# Heavy SDKs are only needed by a few endpoints; load them on first use
+requests = lazy_module('requests')
+groq = lazy_module('groq')
 
 
 def slugify(text):
@@ -37,7 +60,6 @@ from github_routes import github_bp
 from slack_routes import slack_bp
 from routes.hackatime_routes import hackatime_bp
 from routes.pizza_grants_routes import pizza_grants_bp
-from groq import Groq
 
 load_dotenv()
 
@@ -62,8 +84,25 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
 }
 
 app.config['PREFERRED_URL_SCHEME'] = 'https'
-app.config['EXPLAIN_TEMPLATE_LOADING'] = True
-app.config['TEMPLATES_AUTO_RELOAD'] = True
+# Replit sets REPLIT_DEPLOYMENT in deployed (cloudrun) instances
+app.config['SPACES_ENV'] = os.getenv(
+    'SPACES_ENV',
+    'production' if os.getenv('REPLIT_DEPLOYMENT') else 'development')
+
+if app.config['SPACES_ENV'] == 'production':
+    # Templates don't change while a worker runs: skip the per-render stat()
+    # and load compiled templates from the cache filled by compile_templates.py
+    app.config['EXPLAIN_TEMPLATE_LOADING'] = False
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    template_cache_dir = os.getenv(
+        'TEMPLATE_CACHE_DIR', os.path.join(app.root_path, '.jinja_cache'))
+    os.makedirs(template_cache_dir, exist_ok=True)
+    app.jinja_options = dict(
+        app.jinja_options,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(template_cache_dir))
+else:
+    app.config['EXPLAIN_TEMPLATE_LOADING'] = True
+    app.config['TEMPLATES_AUTO_RELOAD'] = True
 
 
 def get_error_context(error):
@@ -276,6 +315,19 @@ def add_security_headers(response):
     return response
 
 
+@app.url_defaults
+def add_static_version(endpoint, values):
+    """Append ``?v=<mtime>`` to static URLs so browsers refetch changed files."""
+    if endpoint != 'static' or 'v' in values or 'filename' not in values:
+        return
+    try:
+        values['v'] = int(
+            os.stat(os.path.join(app.static_folder,
+                                 values['filename'])).st_mtime)
+    except OSError:
+        pass
+
+
 class RateLimiter:
 
     def __init__(self):
@@ -344,6 +396,17 @@ def rate_limit(limit_type='default'):
     return decorator
 
 
+_groq_client = None
+
+
+def get_groq_client():
+    """Create the Groq client on first use and reuse it afterwards."""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = groq.Groq(api_key=os.environ.get("GROQ_API_KEY"))
+    return _groq_client
+
+
 @app.route('/api/orphy/chat', methods=['POST'])
 @rate_limit('orphy')
 def orphy_chat_proxy():
@@ -365,7 +428,7 @@ def orphy_chat_proxy():
 
         try:
             app.logger.info("Attempting to use Groq API")
-            groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+            groq_client = get_groq_client()
 
             chat_completion = groq_client.chat.completions.create(
                 messages=[{
@@ -455,15 +518,43 @@ def orphy_chat_proxy():
         return jsonify({'error': str(e), 'provider': 'error'}), 500
 
 
-db.init_app(app)
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-
-app.register_blueprint(github_bp)
-app.register_blueprint(slack_bp)
-app.register_blueprint(hackatime_bp)
-app.register_blueprint(pizza_grants_bp)
+with startup_profiler.phase('db.init_app'):
+    db.init_app(app)
+with startup_profiler.phase('query_metrics.init_app'):
+    query_metrics.init_app(app)
+with startup_profiler.phase('slow_query_log.init_app'):
+    slow_query_log.init_app(app, db)
+with startup_profiler.phase('identity_cache.init_app'):
+    identity_cache.init_app(app)
+with startup_profiler.phase('template_profiler.init_app'):
+    template_profiler.init_app(app)
+with startup_profiler.phase('assets.init_app'):
+    assets.init_app(app)
+with startup_profiler.phase('tag_facets.init_app'):
+    tag_facets.init_app(app)
+with startup_profiler.phase('system_settings.init_app'):
+    system_settings.init_app(app)
+with startup_profiler.phase('activity_logger.init_app'):
+    activity_logger.init_app(app, db)
+with startup_profiler.phase('purge_worker.init_app'):
+    purge_worker.init_app(app)
+with startup_profiler.phase('login_manager.init_app'):
+    login_manager = LoginManager()
+    login_manager.init_app(app)
+    login_manager.login_view = 'login'
+
+# Schema migrations are run with `flask db upgrade`; keep Alembic off the
+# web worker boot path
+if os.environ.get('FLASK_RUN_FROM_CLI'):
+    from flask_migrate import Migrate
+    from schema_version import MIGRATIONS_DIR
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+
+with startup_profiler.phase('register_blueprints'):
+    app.register_blueprint(github_bp)
+    app.register_blueprint(slack_bp)
+    app.register_blueprint(hackatime_bp)
+    app.register_blueprint(pizza_grants_bp)
 
 
 def check_db_connection():
@@ -510,7 +601,7 @@ def error_page():
 @login_manager.user_loader
 def load_user(user_id):
     try:
-        return User.query.get(int(user_id))
+        return identity_cache.get(int(user_id))
     except Exception as e:
         app.logger.error(f"Failed to load user: {str(e)}")
         return None
@@ -541,14 +632,14 @@ def login():
         user = User.query.filter_by(email=email).first()
         if user and user.check_password(password):
             login_user(user)
+            identity_cache.invalidate(user.id)
             user.last_login = datetime.utcnow()
 
-            activity = UserActivity(activity_type="user_login",
-                                    message="User {username} logged in",
-                                    username=user.username,
-                                    user_id=user.id)
-            db.session.add(activity)
             db.session.commit()
+            activity_logger.log(activity_type="user_login",
+                                message="User {username} logged in",
+                                username=user.username,
+                                user_id=user.id)
 
             flash(f'Welcome back, {user.username}!', 'success')
             return redirect(url_for('welcome'))
@@ -568,11 +659,14 @@ def signup():
         email = request.form.get('email')
         password = request.form.get('password')
 
-        if User.query.filter_by(email=email).first():
+        # Deleted accounts keep their email and username until purged
+        if User.query.filter_by(email=email).execution_options(
+                include_deleted=True).first():
             flash('Email already registered', 'error')
             return render_template('signup.html')
 
-        if User.query.filter_by(username=username).first():
+        if User.query.filter_by(username=username).execution_options(
+                include_deleted=True).first():
             flash('Username already taken', 'error')
             return render_template('signup.html')
 
@@ -581,14 +675,13 @@ def signup():
         user.set_password(password)
 
         db.session.add(user)
-
-        activity = UserActivity(activity_type="user_registration",
-                                message="New user registered: {username}",
-                                username=username,
-                                user_id=user.id)
-        db.session.add(activity)
         db.session.commit()
 
+        activity_logger.log(activity_type="user_registration",
+                            message="New user registered: {username}",
+                            username=username,
+                            user_id=user.id)
+
         flash('Successfully registered! Please log in.', 'success')
         return redirect(url_for('login'))
 
@@ -600,7 +693,7 @@ def signup():
 def welcome():
     sites = Site.query.filter_by(user_id=current_user.id).order_by(
         Site.updated_at.desc()).all()
-    max_sites = get_max_sites_per_user()
+    max_sites = system_settings.get_all()['max_sites_per_user']
 
     club_memberships = db.session.query(ClubMembership).filter_by(
         user_id=current_user.id).all()
@@ -869,7 +962,7 @@ def view_site(slug, filename):
 def create_site():
     try:
         site_count = Site.query.filter_by(user_id=current_user.id).count()
-        max_sites = get_max_sites_per_user()
+        max_sites = system_settings.get('max_sites_per_user')
         if site_count >= max_sites:
             app.logger.warning(
                 f'User {current_user.id} attempted to exceed site limit of {max_sites}'
@@ -985,14 +1078,12 @@ h1 {
             app.logger.error(f"Error creating site pages: {str(e)}")
             db.session.rollback()
 
-        activity = UserActivity(activity_type="site_creation",
-                                message='New site "{}" created by {}'.format(
-                                    name, current_user.username),
-                                username=current_user.username,
-                                user_id=current_user.id,
-                                site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
+        activity_logger.log(activity_type="site_creation",
+                            message='New site "{}" created by {}'.format(
+                                name, current_user.username),
+                            username=current_user.username,
+                            user_id=current_user.id,
+                            site_id=site.id)
 
         app.logger.info(f'Successfully created site {site.id}')
         return jsonify({
@@ -1034,13 +1125,11 @@ def update_site(site_id):
         db.session.commit()
 
         activity_message = f'Updated {"Python" if python_content else "Web"} site "{site.name}"'
-        activity = UserActivity(activity_type='site_update',
-                                message=activity_message,
-                                username=current_user.username,
-                                user_id=current_user.id,
-                                site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
+        activity_logger.log(activity_type='site_update',
+                            message=activity_message,
+                            username=current_user.username,
+                            user_id=current_user.id,
+                            site_id=site.id)
 
         return jsonify({'message': 'Site updated successfully'})
     except Exception as e:
@@ -1086,7 +1175,7 @@ def rename_site(site_id):
 def create_python_site():
     try:
         site_count = Site.query.filter_by(user_id=current_user.id).count()
-        max_sites = get_max_sites_per_user()
+        max_sites = system_settings.get('max_sites_per_user')
         if site_count >= max_sites:
             return jsonify({
                 'message':
@@ -1134,15 +1223,13 @@ if __name__ == "__main__":
         db.session.add(site)
         db.session.commit()
 
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="site_creation",
             message='New Python space "{}" created by {}'.format(
                 name, current_user.username),
             username=current_user.username,
             user_id=current_user.id,
             site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Python script created successfully',
@@ -1200,22 +1287,16 @@ def delete_site(site_id):
         abort(403)
 
     try:
-        with db.engine.connect() as conn:
-            conn.execute(
-                db.text("DELETE FROM site_page WHERE site_id = :site_id"),
-                {"site_id": site_id})
-            conn.commit()
-
-        db.session.delete(site)
+        delete_sites([site.id])
+        # Gone from the database; keep the loaded attributes for the log
+        db.session.expunge(site)
         db.session.commit()
 
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="site_deletion",
             message=f'Site "{site.name}" deleted by {{username}}',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({'message': 'Site deleted successfully'})
     except Exception as e:
@@ -1241,15 +1322,14 @@ def toggle_gallery_feature(entry_id):
         # Toggle featured status
         entry.is_featured = not entry.is_featured
         db.session.commit()
+        tag_facets.invalidate()
         
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f'Admin {{username}} {"featured" if entry.is_featured else "unfeatured"} gallery entry "{entry.title}"',
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'success': True, 
@@ -1275,14 +1355,14 @@ def remove_gallery_entry(entry_id):
         title = entry.title
         db.session.delete(entry)
         
-        activity = UserActivity(
+        db.session.commit()
+        activity_logger.log(
             activity_type="gallery_removal",
             message=f'User {{username}} removed "{title}" from the gallery',
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
+        tag_facets.invalidate()
         
         flash('Entry successfully removed from the gallery', 'success')
         return redirect(url_for('gallery'))
@@ -1293,53 +1373,54 @@ def remove_gallery_entry(entry_id):
         return redirect(url_for('gallery'))
 
 
+GALLERY_PAGE_SIZE = 24
+GALLERY_FEATURED_LIMIT = 12
+
+
 @app.route('/gallery')
 @app.route('/gallery/tag/<tag>')
 def gallery(tag=None):
-    from models import GalleryEntry, Site, User
-    
-    # Get featured entries
-    featured_query = db.session.query(GalleryEntry, Site, User)\
-        .join(Site, GalleryEntry.site_id == Site.id)\
-        .join(User, GalleryEntry.user_id == User.id)\
-        .filter(GalleryEntry.is_featured == True)
-    
-    # Apply tag filter to featured entries if tag is provided
-    if tag:
-        featured_query = featured_query.filter(GalleryEntry.tags.like(f'%{tag}%'))
-    
-    featured_entries = featured_query.order_by(GalleryEntry.added_at.desc()).all()
-    
-    # Get all entries
-    entries_query = db.session.query(GalleryEntry, Site, User)\
-        .join(Site, GalleryEntry.site_id == Site.id)\
-        .join(User, GalleryEntry.user_id == User.id)
-    
-    # Apply tag filter to all entries if tag is provided
-    if tag:
-        entries_query = entries_query.filter(GalleryEntry.tags.like(f'%{tag}%'))
-    
-    entries = entries_query.order_by(GalleryEntry.added_at.desc()).all()
-    
-    # Get all unique tags for the filter dropdown
-    all_tags_query = db.session.query(GalleryEntry.tags).filter(GalleryEntry.tags != None, GalleryEntry.tags != '')
-    all_tags_raw = all_tags_query.all()
-    
-    # Process tags into a unique list
-    all_tags = set()
-    for tags_str in all_tags_raw:
-        if tags_str[0]:
-            tags_list = [t.strip() for t in tags_str[0].split(',')]
-            all_tags.update(tag for tag in tags_list if tag)
-    
-    all_tags = sorted(list(all_tags))
+    from models import GalleryEntry, GalleryTag, Site, User
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    tag = tag.strip().lower() if tag else None
+
+    def entries_query():
+        query = db.session.query(GalleryEntry, Site, User)\
+            .join(Site, GalleryEntry.site_id == Site.id)\
+            .join(User, GalleryEntry.user_id == User.id)
+        # Exact tag match through the (tag, entry_id) index
+        if tag:
+            query = query.join(
+                GalleryTag, db.and_(GalleryTag.entry_id == GalleryEntry.id,
+                                    GalleryTag.tag == tag))
+        return query
+
+    featured_entries = []
+    if page == 1:
+        featured_entries = entries_query()\
+            .filter(GalleryEntry.is_featured == True)\
+            .order_by(GalleryEntry.added_at.desc())\
+            .limit(GALLERY_FEATURED_LIMIT).all()
+
+    entries = entries_query()\
+        .order_by(GalleryEntry.added_at.desc(), GalleryEntry.id.desc())\
+        .limit(GALLERY_PAGE_SIZE + 1)\
+        .offset((page - 1) * GALLERY_PAGE_SIZE).all()
+    has_next = len(entries) > GALLERY_PAGE_SIZE
+    entries = entries[:GALLERY_PAGE_SIZE]
+
+    tag_counts = tag_facets.get()
     
     return render_template(
         'gallery.html', 
         featured_entries=featured_entries, 
         entries=entries,
-        all_tags=all_tags,
-        current_tag=tag
+        all_tags=[name for name, _ in tag_counts],
+        tag_counts=dict(tag_counts),
+        current_tag=tag,
+        page=page,
+        has_next=has_next
     )
 
 @app.route('/gallery/tag/<tag>')
@@ -1378,23 +1459,22 @@ def gallery_submit():
                 site_id=site_id,
                 user_id=current_user.id,
                 title=title,
-                description=description,
-                tags=tags
+                description=description
             )
+            entry.set_tags(tags)
             
             db.session.add(entry)
             db.session.commit()
+            tag_facets.invalidate()
             
             # Record activity
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="gallery_submission",
                 message=f'User {{username}} submitted "{title}" to the gallery',
                 username=current_user.username,
                 user_id=current_user.id,
                 site_id=site.id
             )
-            db.session.add(activity)
-            db.session.commit()
             
             flash('Your site has been successfully submitted to the gallery!', 'success')
             return redirect(url_for('gallery'))
@@ -1475,6 +1555,7 @@ def admin_panel():
                                sites=sites,
                                clubs=clubs,
                                version=version,
+                               settings=system_settings.get_all(),
                                Club=Club)
     except Exception as e:
         app.logger.error(f'Error loading admin panel: {str(e)}')
@@ -1486,65 +1567,39 @@ def admin_panel():
 @login_required
 @admin_required
 def delete_user(user_id):
-    from models import ClubPost, ClubPostLike, ClubChatChannel, ClubChatMessage, ClubResource, ClubAssignment
-    
     if user_id == current_user.id:
         return jsonify({'message': 'Cannot delete yourself'}), 400
 
     user = User.query.get_or_404(user_id)
 
     try:
-        # Delete user activities
-        UserActivity.query.filter_by(user_id=user.id).delete()
-        
-        # If the user is a club leader, we need to handle club relationships
-        clubs_led = Club.query.filter_by(leader_id=user.id).all()
-        for club in clubs_led:
-            # Delete club memberships
-            ClubMembership.query.filter_by(club_id=club.id).delete()
-            # Delete club posts
-            ClubPost.query.filter_by(club_id=club.id).delete()
-            # Delete club assignments
-            ClubAssignment.query.filter_by(club_id=club.id).delete()
-            # Delete club resources
-            ClubResource.query.filter_by(club_id=club.id).delete()
-            # Delete club chat channels and messages
-            channels = ClubChatChannel.query.filter_by(club_id=club.id).all()
-            for channel in channels:
-                ClubChatMessage.query.filter_by(channel_id=channel.id).delete()
-            ClubChatChannel.query.filter_by(club_id=club.id).delete()
-            # Finally delete the club
-            db.session.delete(club)
-        
-        # Delete user's club memberships elsewhere
-        ClubMembership.query.filter_by(user_id=user.id).delete()
-        
-        # Delete user's sites and related pages
-        sites = Site.query.filter_by(user_id=user.id).all()
-        for site in sites:
-            SitePage.query.filter_by(site_id=site.id).delete()
-            db.session.delete(site)
-        
-        # Finally delete the user
-        db.session.delete(user)
+        # The user and the clubs they lead disappear now; their rows are
+        # removed in batches by the purge worker
+        job = soft_delete_user(user, requested_by=current_user.id)
         db.session.commit()
-        
-        # Log this admin action
-        activity = UserActivity(
+        identity_cache.invalidate_all()
+        purge_worker.wake()
+
+        activity_logger.log(
             activity_type="admin_action",
             message=f'Admin deleted user "{user.username}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
-        
-        return jsonify({'message': 'User deleted successfully'})
+
+        return jsonify({'message': 'User deleted', 'job_id': job.id}), 202
     except Exception as e:
         db.session.rollback()
         app.logger.error(f'Error deleting user {user_id}: {str(e)}')
         return jsonify({'message': f'Failed to delete user: {str(e)}'}), 500
 
 
+@app.route('/api/admin/purge-jobs/<int:job_id>')
+@login_required
+@admin_required
+def get_purge_job(job_id):
+    return jsonify(PurgeJob.query.get_or_404(job_id).to_dict())
+
+
 @app.route('/api/admin/sites/<int:site_id>', methods=['DELETE'])
 @login_required
 @admin_required
@@ -1552,22 +1607,16 @@ def delete_site_admin(site_id):
     site = Site.query.get_or_404(site_id)
 
     try:
-        with db.engine.connect() as conn:
-            conn.execute(
-                db.text("DELETE FROM site_page WHERE site_id = :site_id"),
-                {"site_id": site_id})
-            conn.commit()
-
-        db.session.delete(site)
+        delete_sites([site.id])
+        # Gone from the database; keep the loaded attributes for the log
+        db.session.expunge(site)
         db.session.commit()
 
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f'Admin {{username}} deleted site "{site.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({'message': 'Site deleted successfully'})
     except Exception as e:
@@ -1594,6 +1643,7 @@ def toggle_suspension(user_id):
 
     try:
         db.session.commit()
+        identity_cache.invalidate(user.id)
         return jsonify(
             {'message': 'User suspension status updated successfully'})
     except Exception as e:
@@ -1620,11 +1670,12 @@ def edit_user(user_id):
     new_password = data.get('password')
 
     if new_username and new_username != user.username and User.query.filter_by(
-            username=new_username).first():
+            username=new_username).execution_options(
+                include_deleted=True).first():
         return jsonify({'message': 'Username already taken'}), 400
 
     if new_email and new_email != user.email and User.query.filter_by(
-            email=new_email).first():
+            email=new_email).execution_options(include_deleted=True).first():
         return jsonify({'message': 'Email already registered'}), 400
 
     try:
@@ -1637,14 +1688,13 @@ def edit_user(user_id):
             user.set_password(new_password)
 
         db.session.commit()
+        identity_cache.invalidate(user.id)
 
-        activity = UserActivity(activity_type="admin_action",
-                                message="Admin {username} edited user " +
-                                user.username,
-                                username=current_user.username,
-                                user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        activity_logger.log(activity_type="admin_action",
+                            message="Admin {username} edited user " +
+                            user.username,
+                            username=current_user.username,
+                            user_id=current_user.id)
 
         return jsonify({'message': 'User details updated successfully'})
     except Exception as e:
@@ -1686,16 +1736,15 @@ def toggle_club_leader(user_id):
                         leader_id=user.id)
             db.session.add(club)
 
+            db.session.commit()
             # Record the activity
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="admin_action",
                 message=
                 f"Admin {{username}} made {user.username} a club leader",
                 username=current_user.username,
                 user_id=current_user.id)
-            db.session.add(activity)
-
-            db.session.commit()
+            identity_cache.invalidate(user.id)
             app.logger.info(f"Successfully made {user.username} a club leader")
             return jsonify({
                 'message': f"Made {user.username} a club leader",
@@ -1703,22 +1752,19 @@ def toggle_club_leader(user_id):
             })
 
         elif not make_leader and existing_club:
-            # First delete all club memberships
-            ClubMembership.query.filter_by(club_id=existing_club.id).delete()
-
-            # Then delete the club itself
-            db.session.delete(existing_club)
+            # The club and everything in it go through the purge queue
+            soft_delete_club(existing_club, requested_by=current_user.id)
 
+            db.session.commit()
             # Record the activity
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="admin_action",
                 message=
                 f"Admin {{username}} removed {user.username} as a club leader",
                 username=current_user.username,
                 user_id=current_user.id)
-            db.session.add(activity)
-
-            db.session.commit()
+            identity_cache.invalidate_all()
+            purge_worker.wake()
             app.logger.info(
                 f"Successfully removed {user.username} as a club leader")
             return jsonify({
@@ -1873,55 +1919,160 @@ def get_system_status():
         return jsonify({'error': 'Failed to retrieve system status'}), 500
 
 
-@app.route('/api/admin/analytics')
+@app.route('/api/admin/slow-queries')
 @login_required
 @admin_required
-def get_analytics_data():
+def get_slow_queries():
+    """Slowest statement fingerprints with latency stats and captured plans."""
     try:
-        period = request.args.get('period', 'day')
+        limit = request.args.get('limit', 25, type=int)
+        sort_by = request.args.get('sort', 'total')
+        return jsonify({
+            'queries': slow_query_log.top(limit=limit, sort_by=sort_by),
+            'threshold_ms': slow_query_log.threshold_ms
+        })
+    except Exception as e:
+        app.logger.error(f'Error retrieving slow queries: {str(e)}')
+        return jsonify({'error': 'Failed to retrieve slow queries'}), 500
 
-        from datetime import datetime, timedelta
 
-        if period == 'day':
-            start_date = datetime.utcnow() - timedelta(days=1)
-        elif period == 'week':
-            start_date = datetime.utcnow() - timedelta(weeks=1)
-        elif period == 'month':
-            start_date = datetime.utcnow() - timedelta(days=30)
-        elif period == 'year':
-            start_date = datetime.utcnow() - timedelta(days=365)
-        else:
-            start_date = datetime.utcnow() - timedelta(days=7)
-
-        from sqlalchemy import func
-
-        if period == 'day':
-            labels = [f"{i}:00" for i in range(24)]
-            date_format = '%H'
-        elif period == 'week':
-            days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            today_idx = datetime.utcnow().weekday()
-            labels = days[today_idx:] + days[:today_idx]
-            date_format = '%a'
-        elif period == 'month':
-            today = datetime.utcnow().day
-            days_in_month = 30
-            labels = [(datetime.utcnow() - timedelta(days=i)).strftime('%d')
-                      for i in range(days_in_month - 1, -1, -1)]
-            date_format = '%d'
-        else:
-            months = [
-                'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
-                'Oct', 'Nov', 'Dec'
-            ]
-            current_month = datetime.utcnow().month - 1
-            labels = months[current_month:] + months[:current_month]
-            date_format = '%b'
+@app.route('/api/admin/slow-queries/reset', methods=['POST'])
+@login_required
+@admin_required
+def reset_slow_queries():
+    slow_query_log.reset()
+    return jsonify({'message': 'Slow query log reset successfully'})
 
-        user_registrations = {'labels': labels, 'values': []}
 
-        import random
-        user_registrations['values'] = [random.randint(1, 20) for _ in labels]
+@app.route('/api/admin/query-stats')
+@login_required
+@admin_required
+def get_query_stats():
+    """Rolling per-endpoint query counts, DB time and suspected N+1 queries."""
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        sort_by = request.args.get('sort', 'db_ms')
+        return jsonify({
+            'endpoints': query_metrics.worst_endpoints(limit=limit,
+                                                       sort_by=sort_by),
+            'n_plus_one_threshold': query_metrics.n_plus_one_threshold
+        })
+    except Exception as e:
+        app.logger.error(f'Error retrieving query stats: {str(e)}')
+        return jsonify({'error': 'Failed to retrieve query stats'}), 500
+
+
+@app.route('/api/admin/query-stats/reset', methods=['POST'])
+@login_required
+@admin_required
+def reset_query_stats():
+    query_metrics.reset()
+    return jsonify({'message': 'Query stats reset successfully'})
+
+
+@app.route('/api/admin/activity-log-stats')
+@login_required
+@admin_required
+def get_activity_log_stats():
+    """Depth of the activity write-behind queue and records written/dropped."""
+    return jsonify(activity_logger.stats())
+
+
+@app.route('/api/admin/template-stats')
+@login_required
+@admin_required
+def get_template_stats():
+    """Slowest templates by render time."""
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        sort_by = request.args.get('sort', 'p95')
+        return jsonify({
+            'templates': template_profiler.slowest(limit=limit,
+                                                   sort_by=sort_by),
+            'production': app.config['SPACES_ENV'] == 'production',
+            'bytecode_cache': app.jinja_env.bytecode_cache is not None
+        })
+    except Exception as e:
+        app.logger.error(f'Error retrieving template stats: {str(e)}')
+        return jsonify({'error': 'Failed to retrieve template stats'}), 500
+
+
+@app.route('/api/admin/template-stats/reset', methods=['POST'])
+@login_required
+@admin_required
+def reset_template_stats():
+    template_profiler.reset()
+    return jsonify({'message': 'Template stats reset successfully'})
+
+
+def activity_series(period, activity_type=None):
+    """``(labels, counts)`` of activity per bucket for the admin charts.
+
+    Whole days come from activity_daily_rollup. Only today's rows, and
+    the last 24 hours for the hourly 'day' view, are counted from
+    user_activity itself, which ix_user_activity_timestamp and partition
+    pruning keep to a short range scan.
+    """
+    now = datetime.utcnow()
+    raw_filter, rollup_filter = [], []
+    if activity_type:
+        raw_filter = [UserActivity.activity_type == activity_type]
+        rollup_filter = [ActivityDailyRollup.activity_type == activity_type]
+
+    if period == 'day':
+        first = now.replace(minute=0, second=0,
+                            microsecond=0) - timedelta(hours=23)
+        hour = db.func.date_trunc('hour', UserActivity.timestamp)
+        counts = dict(
+            db.session.query(hour, db.func.count(UserActivity.id)).filter(
+                UserActivity.timestamp >= first,
+                *raw_filter).group_by(hour).all())
+        hours = [first + timedelta(hours=i) for i in range(24)]
+        return [f'{h.hour}:00' for h in hours], [counts.get(h, 0) for h in hours]
+
+    today = now.date()
+    if period == 'year':
+        month = today.year * 12 + today.month - 1
+        months = [((month - i) // 12, (month - i) % 12 + 1)
+                  for i in range(11, -1, -1)]
+        first = datetime(*months[0], 1).date()
+    else:
+        days = 30 if period == 'month' else 7
+        first = today - timedelta(days=days - 1)
+
+    counts = {
+        day: int(count)
+        for day, count in db.session.query(
+            ActivityDailyRollup.day,
+            db.func.sum(ActivityDailyRollup.activity_count)).filter(
+                ActivityDailyRollup.day >= first, ActivityDailyRollup.day <
+                today, *rollup_filter).group_by(ActivityDailyRollup.day)
+    }
+    counts[today] = db.session.query(db.func.count(UserActivity.id)).filter(
+        UserActivity.timestamp >= datetime(today.year, today.month,
+                                           today.day), *raw_filter).scalar()
+
+    if period == 'year':
+        totals = dict.fromkeys(months, 0)
+        for day, count in counts.items():
+            totals[(day.year, day.month)] += count
+        return ([datetime(*m, 1).strftime('%b') for m in months],
+                list(totals.values()))
+
+    days = [first + timedelta(days=i) for i in range((today - first).days + 1)]
+    label = '%d' if period == 'month' else '%a'
+    return [d.strftime(label) for d in days], [counts.get(d, 0) for d in days]
+
+
+@app.route('/api/admin/analytics')
+@login_required
+@admin_required
+def get_analytics_data():
+    try:
+        period = request.args.get('period', 'day')
+
+        labels, registrations = activity_series(period, 'user_registration')
+        user_registrations = {'labels': labels, 'values': registrations}
 
         web_sites = Site.query.filter_by(site_type='web').count()
         python_sites = Site.query.filter_by(site_type='python').count()
@@ -1938,10 +2089,8 @@ def get_analytics_data():
 
         traffic_sources = {'Direct': 65, 'Search': 25, 'Social': 10}
 
-        platform_usage = {
-            'labels': labels,
-            'values': [random.randint(10, 100) for _ in labels]
-        }
+        labels, usage = activity_series(period)
+        platform_usage = {'labels': labels, 'values': usage}
 
         return jsonify({
             'user_registrations': user_registrations,
@@ -1968,43 +2117,21 @@ def export_analytics():
         return jsonify({'error': 'Failed to export analytics data'}), 500
 
 
-def get_max_sites_per_user():
-    try:
-        with db.engine.connect() as conn:
-            result = conn.execute(
-                db.text(
-                    "SELECT value FROM system_settings WHERE key = 'max_sites_per_user'"
-                ))
-            row = result.fetchone()
-            if row:
-                return int(row[0])
-            return 10
-    except Exception as e:
-        app.logger.error(f'Error retrieving max sites setting: {str(e)}')
-        return 10
-
-
 @app.route('/api/admin/settings/max-sites', methods=['POST'])
 @login_required
 @admin_required
 def update_max_sites():
     try:
         data = request.get_json()
-        max_sites = data.get('maxSites', 10)
-
-        if max_sites < 1:
-            return jsonify({'error': 'Max sites must be at least 1'}), 400
-
-        with db.engine.connect() as conn:
-            conn.execute(
-                db.text(
-                    "INSERT INTO system_settings (key, value) VALUES ('max_sites_per_user', :value) ON CONFLICT (key) DO UPDATE SET value = :value"
-                ), {"value": str(max_sites)})
-            conn.commit()
+        max_sites = system_settings.set('max_sites_per_user',
+                                        data.get('maxSites', 10))
 
         return jsonify(
             {'message': f'Maximum sites per user updated to {max_sites}'})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         app.logger.error(f'Error updating max sites: {str(e)}')
         return jsonify({'error': 'Failed to update max sites setting'}), 500
 
@@ -2021,16 +2148,17 @@ def search_users():
 
         users = User.query.with_entities(
             User.id, User.username, User.email, User.created_at,
-            User.is_suspended, User.is_admin).filter(
-                db.or_(User.username.ilike(f'%{search_term}%'),
-                       User.email.ilike(f'%{search_term}%'))).limit(50).all()
+            User.is_suspended, User.is_admin, User.is_staff).filter(
+                text_search.match_filter(
+                    search_term, User.username, User.email)).order_by(
+                        text_search.rank(search_term, User.username,
+                                         User.email)).limit(50).all()
+
+        # One query for every result instead of one per user
+        roles = club_roles_for([user.id for user in users])
 
         result = []
         for user in users:
-            # Check explicitly if the user is a club leader
-            is_club_leader = Club.query.filter_by(
-                leader_id=user.id).first() is not None
-
             result.append({
                 'id':
                 user.id,
@@ -2045,9 +2173,9 @@ def search_users():
                 'is_admin':
                 user.is_admin,
                 'is_staff':
-                getattr(user, 'is_staff', False),
+                user.is_staff,
                 'is_club_leader':
-                is_club_leader
+                bool(roles[user.id].leader_of)
             })
 
         return jsonify({'users': result})
@@ -2069,10 +2197,10 @@ def search_sites():
         sites = db.session.query(
             Site.id, Site.name, Site.slug, Site.site_type, Site.created_at,
             Site.updated_at, Site.user_id, User.username).join(User).filter(
-                db.or_(
-                    Site.name.ilike(f'%{search_term}%'),
-                    Site.slug.ilike(f'%{search_term}%'),
-                    User.username.ilike(f'%{search_term}%'))).limit(50).all()
+                text_search.match_filter(search_term, Site.name, Site.slug,
+                                         User.username)).order_by(
+                    text_search.rank(search_term, Site.name, Site.slug,
+                                     User.username)).limit(50).all()
 
         result = []
         for site in sites:
@@ -2116,17 +2244,25 @@ def search_clubs():
             Club.join_code, Club.created_at, Club.leader_id,
             User.username.label('leader_username')).join(
                 User, Club.leader_id == User.id).filter(
-                    db.or_(Club.name.ilike(f'%{search_term}%'),
-                           Club.description.ilike(f'%{search_term}%'),
-                           User.username.ilike(f'%{search_term}%'))).limit(
-                               50).all()
+                    text_search.match_filter(search_term, Club.name,
+                                             Club.description,
+                                             User.username)).order_by(
+                        text_search.rank(search_term, Club.name,
+                                         Club.description,
+                                         User.username)).limit(50).all()
+
+        # One grouped count instead of one COUNT per club
+        member_counts = {}
+        if clubs:
+            member_counts = dict(
+                db.session.query(ClubMembership.club_id,
+                                 db.func.count()).filter(
+                    ClubMembership.club_id.in_([club.id for club in clubs
+                                                ])).group_by(
+                        ClubMembership.club_id))
 
         result = []
         for club in clubs:
-            # Count club members
-            member_count = ClubMembership.query.filter_by(
-                club_id=club.id).count()
-
             result.append({
                 'id': club.id,
                 'name': club.name,
@@ -2136,7 +2272,7 @@ def search_clubs():
                 'created_at': club.created_at.strftime('%Y-%m-%d'),
                 'leader_id': club.leader_id,
                 'leader_username': club.leader_username,
-                'member_count': member_count
+                'member_count': member_counts.get(club.id, 0)
             })
 
         return jsonify({'clubs': result})
@@ -2201,22 +2337,19 @@ def delete_club(club_id):
     try:
         club = Club.query.get_or_404(club_id)
 
-        # Delete all memberships first
-        ClubMembership.query.filter_by(club_id=club_id).delete()
-
-        # Delete the club itself
-        db.session.delete(club)
+        job = soft_delete_club(club, requested_by=current_user.id)
 
+        db.session.commit()
         # Record the activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f'Admin {{username}} deleted club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate_all()
+        purge_worker.wake()
 
-        return jsonify({'message': 'Club deleted successfully'})
+        return jsonify({'message': 'Club deleted', 'job_id': job.id}), 202
 
     except Exception as e:
         db.session.rollback()
@@ -2234,15 +2367,14 @@ def admin_reset_join_code(club_id):
         # Generate new join code
         club.generate_join_code()
 
+        db.session.commit()
         # Record the activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=
             f'Admin {{username}} reset join code for club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Join code reset successfully',
@@ -2279,15 +2411,15 @@ def admin_change_member_role(membership_id):
         old_role = membership.role
         membership.role = new_role
 
+        db.session.commit()
         # Record the activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=
             f'Admin {{username}} changed {user.username}\'s role from "{old_role}" to "{new_role}" in club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(user.id)
 
         return jsonify({'message': f'Role updated to {new_role}'})
 
@@ -2315,15 +2447,15 @@ def admin_remove_club_member(membership_id):
         # Delete the membership
         db.session.delete(membership)
 
+        db.session.commit()
         # Record the activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=
             f'Admin {{username}} removed {user.username} from club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(user.id)
 
         return jsonify(
             {'message': f'Successfully removed {user.username} from the club'})
@@ -2334,49 +2466,138 @@ def admin_remove_club_member(membership_id):
         return jsonify({'error': 'Failed to remove club member'}), 500
 
 
+def club_projects_query(club_id, leader_id=None, featured_only=False,
+                        search=None):
+    """Sites owned by a club's members, with owner and featured flag.
+
+    One query for the whole listing: owners are matched with a subquery
+    on club_membership and the featured flag is an EXISTS, so the cost
+    doesn't grow with the number of members or sites. Only listing
+    columns are selected; never the html/python content.
+    """
+    member_ids = db.session.query(ClubMembership.user_id).filter(
+        ClubMembership.club_id == club_id)
+    owner_filter = Site.user_id.in_(member_ids)
+    if leader_id is not None:
+        owner_filter = db.or_(owner_filter, Site.user_id == leader_id)
+
+    featured = db.exists().where(ClubFeaturedProject.club_id == club_id,
+                                 ClubFeaturedProject.site_id == Site.id)
+
+    query = db.session.query(
+        Site.id, Site.name, Site.slug, Site.site_type, Site.created_at,
+        Site.updated_at, User.id.label('owner_id'),
+        User.username.label('owner_username'),
+        featured.label('featured'),
+        db.func.count().over().label('total')).join(
+            User, User.id == Site.user_id).filter(owner_filter)
+
+    if featured_only:
+        query = query.filter(featured)
+    if search:
+        query = query.filter(
+            Site.name.ilike(f'%{text_search.escape_like(search)}%',
+                            escape='\\'))
+    return query.order_by(Site.updated_at.desc(), Site.id.desc())
+
+
+def paginate_rows(query):
+    """Apply ?page=&per_page= to a club_projects_query and count pages.
+
+    The total comes from the count(*) OVER () column, so a page costs a
+    single query; only a page past the end needs a separate count.
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 100)
+    rows = query.limit(per_page).offset((page - 1) * per_page).all()
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        total = query.order_by(None).count()
+    else:
+        total = 0
+    return rows, {
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'current_page': page,
+        'per_page': per_page
+    }
+
+
+def encode_cursor(timestamp, row_id):
+    """Keyset cursor for lists ordered by ``(timestamp, id)``."""
+    return f'{timestamp.isoformat()}_{row_id}'
+
+
+def decode_cursor(value):
+    """Parse an encode_cursor() value; raises ValueError if malformed."""
+    timestamp, row_id = value.rsplit('_', 1)
+    return datetime.fromisoformat(timestamp), int(row_id)
+
+
+# Exact counts are cached briefly per (table, search) so paging through
+# a filtered admin list doesn't rerun COUNT(*) on every page
+COUNT_CACHE_TTL = 60
+_count_cache = {}
+
+
+def estimated_total(query, table, search=None):
+    """Row count for an admin list without a COUNT(*) per page.
+
+    Unfiltered lists use the planner's pg_class.reltuples estimate, which
+    autovacuum keeps close. Small or never-analyzed tables (reltuples is
+    -1 before the first ANALYZE) and filtered lists fall back to an exact
+    count cached for COUNT_CACHE_TTL seconds.
+    """
+    if not search:
+        estimate = db.session.execute(
+            db.text('SELECT reltuples::bigint FROM pg_class '
+                    'WHERE relname = :table'), {'table': table}).scalar()
+        if estimate is not None and estimate >= 10000:
+            return estimate
+
+    key = (table, search or '')
+    cached = _count_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[1] < COUNT_CACHE_TTL:
+        return cached[0]
+    total = query.order_by(None).count()
+    if len(_count_cache) > 1000:
+        _count_cache.clear()
+    _count_cache[key] = (total, now)
+    return total
+
+
 @app.route('/api/clubs/<int:club_id>/projects', methods=['GET'])
 @login_required
+@club_access()
 def get_club_projects(club_id):
     """Get all projects for a club."""
     try:
-        club = Club.query.get_or_404(club_id)
-        
-        # Check if user is a member of the club
-        is_member = ClubMembership.query.filter_by(club_id=club_id, user_id=current_user.id).first()
-        if not is_member and club.leader_id != current_user.id:
-            return jsonify({'error': 'You are not a member of this club'}), 403
-            
-        # Get all sites from club members
-        members = ClubMembership.query.filter_by(club_id=club_id).all()
-        member_ids = [m.user_id for m in members]
-        member_ids.append(club.leader_id)  # Include the leader
-        
-        # Get projects (sites) by these members
-        sites = Site.query.filter(Site.user_id.in_(member_ids)).all()
-        
-        # Get featured projects
-        featured_projects = ClubFeaturedProject.query.filter_by(club_id=club_id).all()
-        featured_site_ids = [p.site_id for p in featured_projects]
-        
-        # Format response
-        projects = []
-        for site in sites:
-            user = User.query.get(site.user_id)
-            projects.append({
-                'id': site.id,
-                'name': site.name,
-                'slug': site.slug,
-                'description': '',  # Sites don't have descriptions in current schema
-                'owner': {
-                    'id': user.id,
-                    'username': user.username
-                },
-                'featured': site.id in featured_site_ids,
-                'updated_at': site.updated_at.isoformat(),
-                'created_at': site.created_at.isoformat()
-            })
-            
-        return jsonify({'projects': projects})
+        club = current_club(club_id)
+
+        query = club_projects_query(
+            club_id,
+            leader_id=club.leader_id,
+            featured_only=request.args.get('featured') == 'true',
+            search=request.args.get('search', '').strip())
+        rows, pagination = paginate_rows(query)
+
+        projects = [{
+            'id': row.id,
+            'name': row.name,
+            'slug': row.slug,
+            'description': '',  # Sites don't have descriptions in current schema
+            'owner': {
+                'id': row.owner_id,
+                'username': row.owner_username
+            },
+            'featured': row.featured,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            'created_at': row.created_at.isoformat() if row.created_at else None
+        } for row in rows]
+
+        return jsonify({'projects': projects, **pagination})
         
     except Exception as e:
         app.logger.error(f'Error getting club projects: {str(e)}')
@@ -2384,16 +2605,10 @@ def get_club_projects(club_id):
 
 @app.route('/api/clubs/<int:club_id>/projects/<int:project_id>/feature', methods=['POST'])
 @login_required
+@club_access('co-leader', 'Only club leaders can feature projects')
 def toggle_project_featured(club_id, project_id):
     """Toggle a project's featured status in a club."""
     try:
-        club = Club.query.get_or_404(club_id)
-        
-        # Only club leader and co-leaders can feature projects
-        membership = ClubMembership.query.filter_by(club_id=club_id, user_id=current_user.id).first()
-        if club.leader_id != current_user.id and (not membership or membership.role != 'co-leader'):
-            return jsonify({'error': 'Only club leaders can feature projects'}), 403
-            
         site = Site.query.get_or_404(project_id)
         
         # Check if project is already featured
@@ -2429,15 +2644,11 @@ def toggle_project_featured(club_id, project_id):
 
 @app.route('/api/clubs/<int:club_id>/stats', methods=['GET'])
 @login_required
+@club_access()
 def get_club_stats(club_id):
     """Get statistics for a club dashboard."""
     try:
-        club = Club.query.get_or_404(club_id)
-        
-        # Check if user is a member of the club
-        is_member = ClubMembership.query.filter_by(club_id=club_id, user_id=current_user.id).first()
-        if not is_member and club.leader_id != current_user.id:
-            return jsonify({'error': 'You are not a member of this club'}), 403
+        club = current_club(club_id)
             
         # Get member count
         member_count = ClubMembership.query.filter_by(club_id=club_id).count() + 1  # +1 for the leader
@@ -2689,14 +2900,12 @@ def update_user_profile_admin(user_id):
         db.session.commit()
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f"Admin {{username}} updated {user.username}'s profile",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2737,14 +2946,12 @@ def admin_reset_password(user_id):
         db.session.commit()
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f"Admin {{username}} reset password for {user.username}",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2777,16 +2984,15 @@ def toggle_admin_status(user_id):
         
         user.is_admin = make_admin
         db.session.commit()
+        identity_cache.invalidate(user.id)
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f"Admin {{username}} {'made' if make_admin else 'removed'} {user.username} {'as an' if make_admin else 'from being an'} admin",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2818,14 +3024,12 @@ def impersonate_user(user_id):
         session['admin_impersonator_id'] = current_user.id
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_impersonation",
             message=f"Admin {{username}} started impersonating {user.username}",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         # Login as the target user
         logout_user()
@@ -2866,14 +3070,12 @@ def stop_impersonation():
             }), 404
         
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_impersonation",
             message=f"Admin {admin.username} stopped impersonating {impersonated_username}",
             username=admin.username,
             user_id=admin.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         # Login as the admin again
         logout_user()
@@ -2910,16 +3112,15 @@ def toggle_staff_status(user_id):
         
         user.is_staff = make_staff
         db.session.commit()
+        identity_cache.invalidate(user.id)
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_action",
             message=f"Admin {{username}} {'made' if make_staff else 'removed'} {user.username} {'as' if make_staff else 'from being'} HQ staff",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2965,14 +3166,15 @@ def export_users():
             'Sites Count', 'Public Profile', 'Has Avatar', 'Has Bio'
         ])
         
+        # One grouped query each instead of two per row
+        roles = club_roles_for([user.id for user in users])
+        site_counts = dict(
+            db.session.query(Site.user_id, db.func.count(Site.id)).filter(
+                Site.user_id.in_([user.id for user in users])).group_by(
+                    Site.user_id))
+
         # Write data rows
         for user in users:
-            # Get sites count
-            sites_count = Site.query.filter_by(user_id=user.id).count()
-            
-            # Check if user is a club leader
-            is_club_leader = Club.query.filter_by(leader_id=user.id).first() is not None
-            
             writer.writerow([
                 user.id,
                 user.username,
@@ -2982,22 +3184,20 @@ def export_users():
                 user.is_active,
                 user.is_suspended,
                 user.is_admin,
-                is_club_leader,
-                sites_count,
+                bool(roles[user.id].leader_of),
+                site_counts.get(user.id, 0),
                 user.is_profile_public,
                 bool(user.avatar),
                 bool(user.bio)
             ])
         
         # Record admin activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="admin_export",
             message=f"Admin {{username}} exported {len(users)} users' data",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         # Prepare response
         output.seek(0)
@@ -3052,14 +3252,12 @@ def site_files(site_id):
             db.session.add(new_page)
             db.session.commit()
 
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type='file_creation',
                 message=f'Created new file "{filename}" for site "{site.name}"',
                 username=current_user.username,
                 user_id=current_user.id,
                 site_id=site.id)
-            db.session.add(activity)
-            db.session.commit()
 
             return jsonify({
                 'success': True,
@@ -3112,13 +3310,11 @@ def save_site_content(site_id):
 
     db.session.commit()
 
-    activity = UserActivity(activity_type='site_update',
-                            message=f'Updated site "{site.name}"',
-                            username=current_user.username,
-                            user_id=current_user.id,
-                            site_id=site.id)
-    db.session.add(activity)
-    db.session.commit()
+    activity_logger.log(activity_type='site_update',
+                        message=f'Updated site "{site.name}"',
+                        username=current_user.username,
+                        user_id=current_user.id,
+                        site_id=site.id)
 
     return jsonify({'success': True, 'message': 'Content saved successfully'})
 
@@ -3128,26 +3324,44 @@ def save_site_content(site_id):
 @admin_required
 def get_admin_users_list():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
         search = request.args.get('search', '')
 
         query = User.query
 
         if search:
+            pattern = f'%{text_search.escape_like(search)}%'
             query = query.filter(
-                db.or_(User.username.ilike(f'%{search}%'),
-                       User.email.ilike(f'%{search}%')))
+                db.or_(User.username.ilike(pattern, escape='\\'),
+                       User.email.ilike(pattern, escape='\\')))
 
-        total = query.count()
-        users = query.order_by(User.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False)
+        total = estimated_total(query, 'user', search)
 
-        users_list = []
-        for user in users.items:
-            is_club_leader = Club.query.filter_by(
-                leader_id=user.id).first() is not None
+        # Keyset pagination on (created_at, id): ?after=<next_cursor>
+        after = request.args.get('after')
+        if after:
+            try:
+                cursor = decode_cursor(after)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(db.tuple_(User.created_at, User.id) < cursor)
+
+        users = query.order_by(User.created_at.desc(),
+                               User.id.desc()).limit(per_page + 1).all()
+        has_more = len(users) > per_page
+        users = users[:per_page]
+
+        # One grouped query each instead of two per row
+        user_ids = [user.id for user in users]
+        roles = club_roles_for(user_ids)
+        site_counts = {}
+        if user_ids:
+            site_counts = dict(
+                db.session.query(Site.user_id, db.func.count(Site.id)).filter(
+                    Site.user_id.in_(user_ids)).group_by(Site.user_id))
 
+        users_list = []
+        for user in users:
             users_list.append({
                 'id':
                 user.id,
@@ -3162,16 +3376,16 @@ def get_admin_users_list():
                 'is_suspended':
                 user.is_suspended,
                 'is_club_leader':
-                is_club_leader,
+                bool(roles[user.id].leader_of),
                 'sites_count':
-                Site.query.filter_by(user_id=user.id).count()
+                site_counts.get(user.id, 0)
             })
 
         return jsonify({
             'users': users_list,
             'total': total,
-            'pages': users.pages,
-            'current_page': users.page
+            'next_cursor': encode_cursor(users[-1].created_at, users[-1].id)
+            if has_more else None
         })
     except Exception as e:
         app.logger.error(f'Error getting admin users list: {str(e)}')
@@ -3183,22 +3397,38 @@ def get_admin_users_list():
 @admin_required
 def get_admin_sites_list():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
         search = request.args.get('search', '')
 
-        query = Site.query
+        query = db.session.query(
+            Site.id, Site.name, Site.slug, Site.site_type, Site.created_at,
+            Site.updated_at, User.id.label('owner_id'),
+            User.username.label('owner_username')).outerjoin(
+                User, User.id == Site.user_id)
 
         if search:
-            query = query.filter(Site.name.ilike(f'%{search}%'))
+            query = query.filter(
+                Site.name.ilike(f'%{text_search.escape_like(search)}%',
+                                escape='\\'))
 
-        total = query.count()
-        sites = query.order_by(Site.updated_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False)
+        total = estimated_total(query, 'site', search)
+
+        # Keyset pagination on (updated_at, id): ?after=<next_cursor>
+        after = request.args.get('after')
+        if after:
+            try:
+                cursor = decode_cursor(after)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(db.tuple_(Site.updated_at, Site.id) < cursor)
+
+        sites = query.order_by(Site.updated_at.desc(),
+                               Site.id.desc()).limit(per_page + 1).all()
+        has_more = len(sites) > per_page
+        sites = sites[:per_page]
 
         sites_list = []
-        for site in sites.items:
-            user = User.query.get(site.user_id)
+        for site in sites:
             sites_list.append({
                 'id': site.id,
                 'name': site.name,
@@ -3207,16 +3437,16 @@ def get_admin_sites_list():
                 'created_at': site.created_at.isoformat(),
                 'updated_at': site.updated_at.isoformat(),
                 'owner': {
-                    'id': user.id if user else None,
-                    'username': user.username if user else 'Unknown'
+                    'id': site.owner_id,
+                    'username': site.owner_username or 'Unknown'
                 }
             })
 
         return jsonify({
             'sites': sites_list,
             'total': total,
-            'pages': sites.pages,
-            'current_page': sites.page
+            'next_cursor': encode_cursor(sites[-1].updated_at, sites[-1].id)
+            if has_more else None
         })
     except Exception as e:
         app.logger.error(f'Error getting admin sites list: {str(e)}')
@@ -3229,13 +3459,11 @@ def get_admin_sites_list():
 
     db.session.commit()
 
-    activity = UserActivity(activity_type='site_update',
-                            message=f'Updated site "{site.name}"',
-                            username=current_user.username,
-                            user_id=current_user.id,
-                            site_id=site.id)
-    db.session.add(activity)
-    db.session.commit()
+    activity_logger.log(activity_type='site_update',
+                        message=f'Updated site "{site.name}"',
+                        username=current_user.username,
+                        user_id=current_user.id,
+                        site_id=site.id)
 
     return jsonify({'success': True, 'message': 'Content saved successfully'})
 
@@ -3248,15 +3476,14 @@ def get_site_pages(site_id):
     if site.user_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
 
-    with db.engine.connect() as conn:
-        result = conn.execute(
-            db.text("SELECT * FROM site_page WHERE site_id = :site_id"),
-            {"site_id": site_id})
-        pages = [{
-            "filename": row[2],
-            "content": row[3],
-            "file_type": row[4]
-        } for row in result]
+    pages = [{
+        "filename": filename,
+        "content": content,
+        "file_type": file_type,
+        "content_hash": content_hash or content_digest(content)
+    } for filename, content, file_type, content_hash in db.session.query(
+        SitePage.filename, SitePage.content, SitePage.file_type,
+        SitePage.content_hash).filter(SitePage.site_id == site_id)]
 
     if not pages and site.site_type == 'web':
         default_html = site.html_content or '<h1>Welcome to my site!</h1>'
@@ -3276,22 +3503,11 @@ def get_site_pages(site_id):
             "content": default_js,
             "file_type": "js"
         }]
-
         for page in pages:
-            with db.engine.connect() as conn:
-                conn.execute(
-                    db.text("""
-                        INSERT INTO site_page (site_id, filename, content, file_type)
-                        VALUES (:site_id, :filename, :content, :file_type)
-                        ON CONFLICT (site_id, filename) DO UPDATE
-                        SET content = :content, file_type = :file_type
-                    """), {
-                        "site_id": site_id,
-                        "filename": page["filename"],
-                        "content": page["content"],
-                        "file_type": page["file_type"]
-                    })
-                conn.commit()
+            page["content_hash"] = content_digest(page["content"])
+
+        upsert_site_pages(site_id, pages)
+        db.session.commit()
 
     return jsonify({'success': True, 'pages': pages})
 
@@ -3335,6 +3551,68 @@ def get_site_files(site_id):
         return jsonify({'error': 'Failed to get site files'}), 500
 
 
+def upsert_site_pages(site_id, pages, user_id=None, autosave=False):
+    """Insert or update ``pages`` of a site in the current transaction.
+
+    All changed pages go out as one multi-row INSERT ... ON CONFLICT DO
+    UPDATE. Pages whose content hash and type match what is stored are
+    left out of it, and the conflict WHERE skips them as well if another
+    save got there first. Written pages get a revision in the site's
+    history. Returns the filenames that were written.
+    """
+    # Last one wins if a filename is sent twice; ON CONFLICT can't touch
+    # the same row twice in one statement
+    pages = {page['filename']: page for page in pages}
+    stored = dict(
+        db.session.query(
+            SitePage.filename,
+            db.func.concat(SitePage.file_type, ':',
+                           SitePage.content_hash)).filter(
+                               SitePage.site_id == site_id,
+                               SitePage.filename.in_(list(pages))))
+
+    now = datetime.utcnow()
+    rows = []
+    for filename, page in pages.items():
+        content_hash = content_digest(page['content'])
+        if stored.get(filename) == f"{page['file_type']}:{content_hash}":
+            continue
+        rows.append({
+            'site_id': site_id,
+            'filename': filename,
+            'content': page['content'],
+            'file_type': page['file_type'],
+            'content_hash': content_hash,
+            'created_at': now,
+            'updated_at': now
+        })
+    if not rows:
+        return []
+
+    insert = pg_insert(SitePage.__table__).values(rows)
+    table = SitePage.__table__
+    upsert = insert.on_conflict_do_update(
+        constraint='uix_site_page',
+        set_={
+            'content': insert.excluded.content,
+            'file_type': insert.excluded.file_type,
+            'content_hash': insert.excluded.content_hash,
+            'updated_at': insert.excluded.updated_at
+        },
+        where=db.or_(
+            table.c.content_hash.is_distinct_from(
+                insert.excluded.content_hash),
+            table.c.file_type.is_distinct_from(insert.excluded.file_type))
+    ).returning(table.c.filename)
+    written = list(db.session.execute(upsert).scalars())
+    site_revisions.record(site_id,
+                          {filename: pages[filename]['content']
+                           for filename in written},
+                          user_id=user_id,
+                          autosave=autosave)
+    return written
+
+
 @app.route('/api/site/<int:site_id>/save_pages', methods=['POST'])
 @login_required
 def save_site_pages(site_id):
@@ -3356,37 +3634,237 @@ def save_site_pages(site_id):
     if not index_html:
         return jsonify({'error': 'index.html is required'}), 400
 
-    site.html_content = index_html
-    db.session.commit()
+    try:
+        if site.html_content != index_html:
+            site.html_content = index_html
+        written = upsert_site_pages(site_id,
+                                    pages,
+                                    user_id=current_user.id,
+                                    autosave=bool(data.get('autosave')))
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.error(f'Error saving pages for site {site_id}: {str(e)}')
+        return jsonify({'error': 'Failed to save pages'}), 500
 
-    for page in pages:
-        with db.engine.connect() as conn:
-            conn.execute(
-                db.text("""
-                    INSERT INTO site_page (site_id, filename, content, file_type)
-                    VALUES (:site_id, :filename, :content, :file_type)
-                    ON CONFLICT (site_id, filename) DO UPDATE
-                    SET content = :content, file_type = :file_type
-                """), {
-                    "site_id": site_id,
-                    "filename": page["filename"],
-                    "content": page["content"],
-                    "file_type": page["file_type"]
-                })
-            conn.commit()
+    if written:
+        activity_logger.log(
+            activity_type='site_update',
+            message=f'Updated {len(written)} pages for site "{site.name}"',
+            username=current_user.username,
+            user_id=current_user.id,
+            site_id=site.id)
+
+    return jsonify({
+        'success': True,
+        'message': 'All pages saved successfully',
+        'written': written
+    })
+
+
+@app.route('/api/site/<int:site_id>/patch_pages', methods=['POST'])
+@login_required
+def patch_site_pages(site_id):
+    """Save pages as patches against the versions the editor last saw.
+
+    Each page is either ``{filename, file_type, content}`` or
+    ``{filename, file_type, base_hash, ops, hash?}``, where ``ops`` is a
+    text_patch op list against the stored content with hash
+    ``base_hash`` and ``hash`` optionally checks the patched result.
+    Patches whose base is stale, or that don't apply, are not saved and
+    are listed under ``conflicts`` for the editor to send in full.
+    """
+    site = Site.query.get_or_404(site_id)
+
+    if site.user_id != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    data = request.get_json() or {}
+    pages = data.get('pages', [])
+    if not pages:
+        return jsonify({'error': 'No pages provided'}), 400
+
+    try:
+        deltas = [page for page in pages if 'content' not in page]
+        # Locked so a concurrent save can't slip in between the base
+        # check and the write
+        stored = {
+            page.filename: page
+            for page in SitePage.query.filter(
+                SitePage.site_id == site_id,
+                SitePage.filename.in_(
+                    [page['filename'] for page in deltas])).with_for_update()
+        } if deltas else {}
+
+        resolved, conflicts = [], []
+        for page in pages:
+            if 'content' in page:
+                resolved.append(page)
+                continue
+            base = stored.get(page['filename'])
+            if base is None or (base.content_hash or content_digest(
+                    base.content)) != page.get('base_hash'):
+                conflicts.append(page['filename'])
+                continue
+            try:
+                content = text_patch.apply_ops(base.content,
+                                               page.get('ops') or [])
+            except ValueError:
+                conflicts.append(page['filename'])
+                continue
+            if page.get('hash') and content_digest(content) != page['hash']:
+                conflicts.append(page['filename'])
+                continue
+            resolved.append({
+                'filename': page['filename'],
+                'file_type': page['file_type'],
+                'content': content
+            })
+
+        index_html = next((page['content'] for page in resolved
+                           if page['filename'] == 'index.html'), None)
+        if index_html is not None:
+            if not index_html.strip():
+                db.session.rollback()
+                return jsonify({'error': 'index.html cannot be empty'}), 400
+            if site.html_content != index_html:
+                site.html_content = index_html
+
+        written = upsert_site_pages(site_id,
+                                    resolved,
+                                    user_id=current_user.id,
+                                    autosave=bool(data.get('autosave')))
+        db.session.commit()
+    except (KeyError, TypeError):
+        db.session.rollback()
+        return jsonify({'error': 'Malformed page'}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.error(f'Error patching pages for site {site_id}: {str(e)}')
+        return jsonify({'error': 'Failed to save pages'}), 500
 
-    activity = UserActivity(
+    if written:
+        activity_logger.log(
+            activity_type='site_update',
+            message=f'Updated {len(written)} pages for site "{site.name}"',
+            username=current_user.username,
+            user_id=current_user.id,
+            site_id=site.id)
+
+    return jsonify({
+        'success': True,
+        'written': written,
+        'conflicts': conflicts,
+        'hashes': {
+            page['filename']: content_digest(page['content'])
+            for page in resolved
+        }
+    })
+
+
+def revision_json(revision):
+    return {
+        'id': revision.id,
+        'filename': revision.filename,
+        'revision': revision.revision,
+        'created_at': revision.created_at.isoformat(),
+        'autosave': revision.autosave,
+        'size': revision.size,
+        'content_hash': revision.content_hash
+    }
+
+
+@app.route('/api/site/<int:site_id>/revisions')
+@login_required
+def get_site_revisions(site_id):
+    """Newest first; ``?filename=`` narrows to one page, ``?before=<id>``
+    pages back."""
+    site = Site.query.get_or_404(site_id)
+
+    if site.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    query = SiteRevision.query.filter(SiteRevision.site_id == site_id)
+    if request.args.get('filename'):
+        query = query.filter(
+            SiteRevision.filename == request.args['filename'])
+    before = request.args.get('before', type=int)
+    if before:
+        query = query.filter(SiteRevision.id < before)
+    # Leave the stored data out; a listing only needs the metadata
+    revisions = query.options(db.defer(SiteRevision.data)).order_by(
+        SiteRevision.id.desc()).limit(limit + 1).all()
+
+    return jsonify({
+        'revisions': [revision_json(r) for r in revisions[:limit]],
+        'next_cursor': revisions[limit - 1].id
+        if len(revisions) > limit else None
+    })
+
+
+@app.route('/api/site/<int:site_id>/revisions/<int:revision_id>')
+@login_required
+def get_site_revision(site_id, revision_id):
+    site = Site.query.get_or_404(site_id)
+
+    if site.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    revision = SiteRevision.query.filter_by(id=revision_id,
+                                            site_id=site_id).first_or_404()
+    return jsonify(
+        dict(revision_json(revision),
+             content=site_revisions.content_of(revision)))
+
+
+@app.route('/api/site/<int:site_id>/revisions/<int:revision_id>/restore',
+           methods=['POST'])
+@login_required
+def restore_site_revision(site_id, revision_id):
+    """Make a past revision the current page content (as a new revision)."""
+    site = Site.query.get_or_404(site_id)
+
+    if site.user_id != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    revision = SiteRevision.query.filter_by(id=revision_id,
+                                            site_id=site_id).first_or_404()
+    try:
+        content = site_revisions.content_of(revision)
+        page = SitePage.query.filter_by(site_id=site_id,
+                                        filename=revision.filename).first()
+        file_type = page.file_type if page else revision.filename.split(
+            '.')[-1].lower()
+        if revision.filename == 'index.html':
+            site.html_content = content
+        upsert_site_pages(site_id, [{
+            'filename': revision.filename,
+            'file_type': file_type,
+            'content': content
+        }],
+                          user_id=current_user.id)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.error(
+            f'Error restoring revision {revision_id} of site {site_id}: '
+            f'{str(e)}')
+        return jsonify({'error': 'Failed to restore revision'}), 500
+
+    activity_logger.log(
         activity_type='site_update',
-        message=f'Updated {len(pages)} pages for site "{site.name}"',
+        message=f'Restored "{revision.filename}" of site "{site.name}" to '
+        f'revision {revision.revision}',
         username=current_user.username,
         user_id=current_user.id,
         site_id=site.id)
-    db.session.add(activity)
-    db.session.commit()
 
     return jsonify({
         'success': True,
-        'message': 'All pages saved successfully'
+        'filename': revision.filename,
+        'content': content,
+        'content_hash': content_digest(content)
     })
 
 
@@ -3411,14 +3889,12 @@ def delete_site_page(site_id, filename):
             })
         conn.commit()
 
-    activity = UserActivity(
+    activity_logger.log(
         activity_type='site_update',
         message=f'Deleted page "{filename}" from site "{site.name}"',
         username=current_user.username,
         user_id=current_user.id,
         site_id=site.id)
-    db.session.add(activity)
-    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -3591,13 +4067,11 @@ def hackatime_connect():
             conn.commit()
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="hackatime_connected",
             message="User {username} connected Hackatime account",
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'success': True,
@@ -3627,13 +4101,11 @@ def hackatime_disconnect():
             conn.commit()
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="hackatime_disconnected",
             message="User {username} disconnected Hackatime account",
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'success': True,
@@ -3751,13 +4223,11 @@ def groq_connect():
             conn.commit()
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="groq_connected",
             message="User {username} connected Groq account",
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'success': True,
@@ -3787,13 +4257,11 @@ def groq_disconnect():
             conn.commit()
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="groq_disconnected",
             message="User {username} disconnected Groq account",
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'success': True,
@@ -3951,14 +4419,14 @@ def hackatime_heartbeat():
             < day_end).first()
 
         if not heartbeat_today:
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="hackatime_heartbeat",
                 message=
                 "User {username} sent first Hackatime heartbeat of the day",
                 username=current_user.username,
-                user_id=current_user.id)
-            db.session.add(activity)
-            db.session.commit()
+                user_id=current_user.id,
+                # The next heartbeat checks for this row
+                mode='sync')
 
         # Try to parse the response content
         try:
@@ -4002,13 +4470,15 @@ def settings():
             email = request.form.get('email')
 
             if username != user.username and User.query.filter_by(
-                    username=username).first():
+                    username=username).execution_options(
+                        include_deleted=True).first():
                 return jsonify({
                     'status': 'error',
                     'message': 'Username already taken'
                 })
             if email != user.email and User.query.filter_by(
-                    email=email).first():
+                    email=email).execution_options(
+                        include_deleted=True).first():
                 return jsonify({
                     'status': 'error',
                     'message': 'Email already registered'
@@ -4017,6 +4487,7 @@ def settings():
             user.username = username
             user.email = email
             db.session.commit()
+            identity_cache.invalidate(user.id)
             return jsonify({
                 'status': 'success',
                 'message': 'Profile updated successfully'
@@ -4259,18 +4730,12 @@ def club_dashboard(club_id=None):
                                       memberships=club_memberships)
     else:
         # Club ID was provided, show that specific club
-        club = Club.query.get_or_404(club_id)
-        
+        club = current_club(club_id)
+
         # Verify user is a member or leader of this club
-        if club.leader_id != current_user.id:
-            membership = ClubMembership.query.filter_by(
-                user_id=current_user.id,
-                club_id=club_id
-            ).first()
-            
-            if not membership:
-                flash('You are not a member of this club.', 'error')
-                return redirect(url_for('welcome'))
+        if not has_club_role(club_id):
+            flash('You are not a member of this club.', 'error')
+            return redirect(url_for('welcome'))
     
     # Get all memberships for the club
     memberships = []
@@ -4296,16 +4761,8 @@ def club_dashboard(club_id=None):
     
     # Check if user is a leader or co-leader
     is_leader = (club and club.leader_id == current_user.id)
-    is_co_leader = False
-    
-    if club and not is_leader:
-        membership = ClubMembership.query.filter_by(
-            user_id=current_user.id,
-            club_id=club.id,
-            role='co-leader'
-        ).first()
-        
-        is_co_leader = (membership is not None)
+    is_co_leader = bool(club and not is_leader
+                        and has_club_role(club.id, 'co-leader'))
     
     return render_template('club_dashboard.html',
                            club=club,
@@ -4373,13 +4830,12 @@ def create_club():
         
         db.session.commit()
 
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="club_creation",
             message=f'Club "{club.name}" created by {{username}}',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(current_user.id)
 
         return jsonify({'message': 'Club created successfully'}), 201
     except Exception as e:
@@ -4436,49 +4892,21 @@ def manage_current_club():
 
     elif request.method == 'DELETE':
         try:
-            # First delete all related ClubAssignment records
-            from models import ClubAssignment
-            ClubAssignment.query.filter_by(club_id=club.id).delete()
-            
-            # Delete all club memberships
-            ClubMembership.query.filter_by(club_id=club.id).delete()
-            
-            # Delete club chat channels and messages
-            from models import ClubChatChannel, ClubChatMessage
-            
-            # Get all channel IDs for this club
-            channels = ClubChatChannel.query.filter_by(club_id=club.id).all()
-            for channel in channels:
-                # Delete messages in each channel
-                ClubChatMessage.query.filter_by(channel_id=channel.id).delete()
-            
-            # Delete all channels
-            ClubChatChannel.query.filter_by(club_id=club.id).delete()
-            
-            # Delete club resources
-            from models import ClubResource
-            ClubResource.query.filter_by(club_id=club.id).delete()
-            
-            # Delete club posts and likes
-            from models import ClubPost, ClubPostLike
-            posts = ClubPost.query.filter_by(club_id=club.id).all()
-            for post in posts:
-                ClubPostLike.query.filter_by(post_id=post.id).delete()
-            ClubPost.query.filter_by(club_id=club.id).delete()
-
-            # Finally delete the club itself
-            db.session.delete(club)
+            job = soft_delete_club(club, requested_by=current_user.id)
             db.session.commit()
+            identity_cache.invalidate_all()
+            purge_worker.wake()
 
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="club_deletion",
                 message=f'Club "{club.name}" deleted by {{username}}',
                 username=current_user.username,
                 user_id=current_user.id)
-            db.session.add(activity)
-            db.session.commit()
 
-            return jsonify({'message': 'Club deleted successfully'})
+            return jsonify({
+                'message': 'Club deleted successfully',
+                'job_id': job.id
+            }), 202
         except Exception as e:
             db.session.rollback()
             app.logger.error(f'Error deleting club: {str(e)}')
@@ -4490,17 +4918,10 @@ def manage_current_club():
 def generate_club_join_code(club_id):
     """Generate a new join code for a club."""
     try:
-        club = Club.query.get_or_404(club_id)
-        
+        club = current_club(club_id)
+
         # Check if user is club leader or co-leader
-        is_leader = club.leader_id == current_user.id
-        is_co_leader = ClubMembership.query.filter_by(
-            club_id=club_id, 
-            user_id=current_user.id, 
-            role='co-leader'
-        ).first() is not None
-        
-        if not (is_leader or is_co_leader or current_user.is_admin):
+        if not (has_club_role(club_id, 'co-leader') or current_user.is_admin):
             return jsonify({
                 'error': 'Only club leaders and co-leaders can generate join codes'
             }), 403
@@ -4512,14 +4933,12 @@ def generate_club_join_code(club_id):
         db.session.commit()
         
         # Record the activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="club_action",
             message=f"{{username}} generated a new join code for club '{club.name}'",
             username=current_user.username,
             user_id=current_user.id
         )
-        db.session.add(activity)
-        db.session.commit()
         
         return jsonify({
             'join_code': join_code,
@@ -4586,13 +5005,13 @@ def join_club():
                                     role='member')
         db.session.add(membership)
 
-        activity = UserActivity(
+        db.session.commit()
+        activity_logger.log(
             activity_type="club_join",
             message=f'{{username}} joined club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(current_user.id)
 
         return jsonify({'message': f'Successfully joined {club.name}'})
     except Exception as e:
@@ -4626,14 +5045,14 @@ def leave_club(membership_id):
         # Delete the membership
         db.session.delete(membership)
 
+        db.session.commit()
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="club_leave",
             message=f'{{username}} left club "{club_name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(current_user.id)
 
         return jsonify({'message': f'Successfully left {club_name}'})
     except Exception as e:
@@ -4667,6 +5086,7 @@ def change_member_role(membership_id):
 
         membership.role = new_role
         db.session.commit()
+        identity_cache.invalidate(membership.user_id)
 
         return jsonify({'message': f'Role updated to {new_role}'})
     except Exception as e:
@@ -4694,19 +5114,20 @@ def remove_member(membership_id):
                 {'error': 'You cannot remove yourself from the club'}), 400
 
         member_name = membership.user.username
+        member_id = membership.user_id
 
         # Delete the membership
         db.session.delete(membership)
 
+        db.session.commit()
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="club_member_removal",
             message=
             f'{{username}} removed {member_name} from club "{club.name}"',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
+        identity_cache.invalidate(member_id)
 
         return jsonify(
             {'message': f'Successfully removed {member_name} from the club'})
@@ -4719,46 +5140,74 @@ def remove_member(membership_id):
 # Club Dashboard API Endpoints
 @app.route('/api/clubs/<int:club_id>/posts', methods=['GET', 'POST'])
 @login_required
+@club_access()
 def club_posts(club_id):
     """Get all posts for a club or create a new post."""
     from models import ClubPost
     
-    # Verify user is a member of the club
-    club = Club.query.get_or_404(club_id)
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
+    club = current_club(club_id)
         
     if request.method == 'GET':
-        posts = db.session.query(ClubPost, User).join(User, ClubPost.user_id == User.id) \
-                .filter(ClubPost.club_id == club_id) \
-                .order_by(ClubPost.created_at.desc()).all()
-                
+        from models import ClubPostLike
+
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        query = db.session.query(
+            ClubPost, User,
+            db.exists().where(
+                ClubPostLike.post_id == ClubPost.id,
+                ClubPostLike.user_id == current_user.id).label('user_liked')
+        ).join(User, ClubPost.user_id == User.id) \
+            .filter(ClubPost.club_id == club_id)
+
+        # Keyset pagination: ?before=<next_cursor of the previous page>
+        before = request.args.get('before')
+        if before:
+            try:
+                cursor = decode_cursor(before)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(
+                db.tuple_(ClubPost.created_at, ClubPost.id) < cursor)
+
+        posts = query.order_by(ClubPost.created_at.desc(),
+                               ClubPost.id.desc()).limit(limit + 1).all()
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        post_ids = [post.id for post, _, _ in posts]
+
+        # Full liker lists are only sent when asked for
+        liked_by = None
+        if post_ids and request.args.get('include') == 'liked_by':
+            liked_by = {post_id: [] for post_id in post_ids}
+            for post_id, user_id in db.session.query(
+                    ClubPostLike.post_id, ClubPostLike.user_id).filter(
+                        ClubPostLike.post_id.in_(post_ids)):
+                liked_by[post_id].append(user_id)
+
         result = []
-        for post, user in posts:
-            # Get likes information
-            from models import ClubPostLike
-            post_likes = ClubPostLike.query.filter_by(post_id=post.id).all()
-            liked_by = [like.user_id for like in post_likes]
-            
-            # Check if current user liked this post
-            user_liked = current_user.id in liked_by
-            
-            result.append({
+        for post, user, user_liked in posts:
+            post_data = {
                 'id': post.id,
                 'content': post.content,
                 'created_at': post.created_at.isoformat(),
                 'updated_at': post.updated_at.isoformat(),
-                'likes': post.likes or len(post_likes),  # Use stored count or calculate
-                'liked_by': liked_by,
+                'likes': post.likes or 0,
                 'user_liked': user_liked,
                 'user': {
                     'id': user.id,
                     'username': user.username
                 }
-            })
-            
-        return jsonify({'posts': result})
+            }
+            if liked_by is not None:
+                post_data['liked_by'] = liked_by[post.id]
+            result.append(post_data)
+
+        next_cursor = None
+        if has_more:
+            last = posts[-1][0]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return jsonify({'posts': result, 'next_cursor': next_cursor})
         
     elif request.method == 'POST':
         data = request.get_json()
@@ -4802,15 +5251,9 @@ def manage_club_post(club_id, post_id):
         return jsonify({'error': 'Post not found in this club'}), 404
         
     # Check if user is authorized (post creator or club leader)
-    if post.user_id != current_user.id and post.club.leader_id != current_user.id:
-        membership = ClubMembership.query.filter_by(
-            user_id=current_user.id, 
-            club_id=club_id, 
-            role='co-leader'
-        ).first()
-        
-        if not membership:
-            return jsonify({'error': 'You are not authorized to manage this post'}), 403
+    if not (post.user_id == current_user.id
+            or has_club_role(club_id, 'co-leader')):
+        return jsonify({'error': 'You are not authorized to manage this post'}), 403
     
     if request.method == 'PUT':
         data = request.get_json()
@@ -4853,38 +5296,51 @@ def manage_club_post(club_id, post_id):
 
 @app.route('/api/clubs/<int:club_id>/posts/<int:post_id>/like', methods=['POST'])
 @login_required
+@club_access()
 def toggle_post_like(club_id, post_id):
     """Toggle like on a club post."""
-    from models import ClubPost, ClubPostLike
+    from models import ClubPost
     
     post = ClubPost.query.get_or_404(post_id)
     
     # Check if post belongs to the correct club
     if post.club_id != club_id:
         return jsonify({'error': 'Post not found in this club'}), 404
-        
-    # Check if user is a club member
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and post.club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
-    
-    # Check if user already liked this post
-    existing_like = ClubPostLike.query.filter_by(post_id=post_id, user_id=current_user.id).first()
-    
-    if existing_like:
-        # Unlike
-        db.session.delete(existing_like)
-        liked = False
-    else:
-        # Like
-        new_like = ClubPostLike(post_id=post_id, user_id=current_user.id)
-        db.session.add(new_like)
-        liked = True
-    
-    # Update likes count
-    like_count = ClubPostLike.query.filter_by(post_id=post_id).count()
-    post.likes = like_count
-    
+
+    # Each branch changes the like row and the counter in one statement;
+    # the unique (post_id, user_id) constraint makes a double like a no-op
+    params = {'post_id': post_id, 'user_id': current_user.id}
+    like_count = db.session.execute(db.text("""
+        WITH removed AS (
+            DELETE FROM club_post_like
+            WHERE post_id = :post_id AND user_id = :user_id
+            RETURNING post_id
+        )
+        UPDATE club_post SET likes = GREATEST(COALESCE(likes, 0) - 1, 0)
+        WHERE id IN (SELECT post_id FROM removed)
+        RETURNING likes
+    """), params).scalar()
+    liked = like_count is None
+
+    if liked:
+        like_count = db.session.execute(db.text("""
+            WITH added AS (
+                INSERT INTO club_post_like (post_id, user_id, created_at)
+                VALUES (:post_id, :user_id, now() AT TIME ZONE 'utc')
+                ON CONFLICT ON CONSTRAINT unique_post_like DO NOTHING
+                RETURNING post_id
+            )
+            UPDATE club_post SET likes = COALESCE(likes, 0) + 1
+            WHERE id IN (SELECT post_id FROM added)
+            RETURNING likes
+        """), params).scalar()
+
+    if like_count is None:
+        # A concurrent request liked it first; nothing changed here
+        like_count = db.session.execute(
+            db.text("SELECT COALESCE(likes, 0) FROM club_post WHERE id = :post_id"),
+            params).scalar()
+
     db.session.commit()
     
     return jsonify({
@@ -4895,15 +5351,12 @@ def toggle_post_like(club_id, post_id):
 
 @app.route('/api/clubs/<int:club_id>/assignments', methods=['GET', 'POST'])
 @login_required
+@club_access()
 def club_assignments(club_id):
     """Get all assignments for a club or create a new assignment."""
     from models import ClubAssignment
     
-    # Verify user is a member of the club
-    club = Club.query.get_or_404(club_id)
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
+    club = current_club(club_id)
         
     if request.method == 'GET':
         assignments = db.session.query(ClubAssignment, User) \
@@ -4930,15 +5383,8 @@ def club_assignments(club_id):
         
     elif request.method == 'POST':
         # Only leaders and co-leaders can create assignments
-        if club.leader_id != current_user.id:
-            membership = ClubMembership.query.filter_by(
-                user_id=current_user.id, 
-                club_id=club_id, 
-                role='co-leader'
-            ).first()
-            
-            if not membership:
-                return jsonify({'error': 'Only club leaders can create assignments'}), 403
+        if not has_club_role(club_id, 'co-leader'):
+            return jsonify({'error': 'Only club leaders can create assignments'}), 403
                 
         data = request.get_json()
         title = data.get('title')
@@ -4980,6 +5426,7 @@ def club_assignments(club_id):
 
 @app.route('/api/clubs/<int:club_id>/assignments/<int:assignment_id>', methods=['GET', 'PUT', 'DELETE'])
 @login_required
+@club_access()
 def manage_club_assignment(club_id, assignment_id):
     """Get, update, or delete a club assignment."""
     from models import ClubAssignment
@@ -4990,11 +5437,6 @@ def manage_club_assignment(club_id, assignment_id):
     if assignment.club_id != club_id:
         return jsonify({'error': 'Assignment not found in this club'}), 404
         
-    # Check if user is a member of the club
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and assignment.club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
-    
     if request.method == 'GET':
         # Get user info for creator
         creator = User.query.get(assignment.created_by)
@@ -5016,20 +5458,8 @@ def manage_club_assignment(club_id, assignment_id):
         })
     
     # For PUT and DELETE methods, check for additional authorization
-    is_authorized = False
-    if assignment.created_by == current_user.id or assignment.club.leader_id == current_user.id:
-        is_authorized = True
-    else:
-        co_leader_membership = ClubMembership.query.filter_by(
-            user_id=current_user.id, 
-            club_id=club_id, 
-            role='co-leader'
-        ).first()
-        
-        if co_leader_membership:
-            is_authorized = True
-    
-    if not is_authorized:
+    if not (assignment.created_by == current_user.id
+            or has_club_role(club_id, 'co-leader')):
         return jsonify({'error': 'You are not authorized to manage this assignment'}), 403
     
     if request.method == 'PUT':
@@ -5070,15 +5500,12 @@ def manage_club_assignment(club_id, assignment_id):
 
 @app.route('/api/clubs/<int:club_id>/resources', methods=['GET', 'POST'])
 @login_required
+@club_access()
 def club_resources(club_id):
     """Get all resources for a club or create a new resource."""
     from models import ClubResource
     
-    # Verify user is a member of the club
-    club = Club.query.get_or_404(club_id)
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
+    club = current_club(club_id)
         
     if request.method == 'GET':
         resources = db.session.query(ClubResource, User) \
@@ -5139,6 +5566,7 @@ def club_resources(club_id):
 
 @app.route('/api/clubs/<int:club_id>/resources/<int:resource_id>', methods=['GET', 'PUT', 'DELETE'])
 @login_required
+@club_access()
 def manage_club_resource(club_id, resource_id):
     """Get, update, or delete a club resource."""
     from models import ClubResource
@@ -5149,11 +5577,6 @@ def manage_club_resource(club_id, resource_id):
     if resource.club_id != club_id:
         return jsonify({'error': 'Resource not found in this club'}), 404
         
-    # Check if user is a member of the club
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and resource.club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
-    
     if request.method == 'GET':
         # Get user info for creator
         creator = User.query.get(resource.created_by)
@@ -5174,20 +5597,8 @@ def manage_club_resource(club_id, resource_id):
         })
     
     # For PUT and DELETE methods, check for additional authorization
-    is_authorized = False
-    if resource.created_by == current_user.id or resource.club.leader_id == current_user.id:
-        is_authorized = True
-    else:
-        co_leader_membership = ClubMembership.query.filter_by(
-            user_id=current_user.id, 
-            club_id=club_id, 
-            role='co-leader'
-        ).first()
-        
-        if co_leader_membership:
-            is_authorized = True
-    
-    if not is_authorized:
+    if not (resource.created_by == current_user.id
+            or has_club_role(club_id, 'co-leader')):
         return jsonify({'error': 'You are not authorized to manage this resource'}), 403
     
     if request.method == 'PUT':
@@ -5229,15 +5640,12 @@ def manage_club_resource(club_id, resource_id):
 
 @app.route('/api/clubs/<int:club_id>/meetings', methods=['GET', 'POST'])
 @login_required
+@club_access()
 def club_meetings(club_id):
     """Get all meetings for a club or create a new meeting."""
     from models import ClubMeeting
     
-    # Verify user is a member of the club
-    club = Club.query.get_or_404(club_id)
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
+    club = current_club(club_id)
         
     if request.method == 'GET':
         meetings = db.session.query(ClubMeeting, User) \
@@ -5267,15 +5675,8 @@ def club_meetings(club_id):
         
     elif request.method == 'POST':
         # Only leaders and co-leaders can create meetings
-        if club.leader_id != current_user.id:
-            membership = ClubMembership.query.filter_by(
-                user_id=current_user.id, 
-                club_id=club_id, 
-                role='co-leader'
-            ).first()
-            
-            if not membership:
-                return jsonify({'error': 'Only club leaders can create meetings'}), 403
+        if not has_club_role(club_id, 'co-leader'):
+            return jsonify({'error': 'Only club leaders can create meetings'}), 403
                 
         data = request.get_json()
         title = data.get('title')
@@ -5328,6 +5729,7 @@ def club_meetings(club_id):
 
 @app.route('/api/clubs/<int:club_id>/meetings/<int:meeting_id>', methods=['GET', 'PUT', 'DELETE'])
 @login_required
+@club_access()
 def manage_club_meeting(club_id, meeting_id):
     """Get, update, or delete a club meeting."""
     from models import ClubMeeting
@@ -5338,11 +5740,6 @@ def manage_club_meeting(club_id, meeting_id):
     if meeting.club_id != club_id:
         return jsonify({'error': 'Meeting not found in this club'}), 404
         
-    # Check if user is a member of the club
-    membership = ClubMembership.query.filter_by(user_id=current_user.id, club_id=club_id).first()
-    if not membership and meeting.club.leader_id != current_user.id:
-        return jsonify({'error': 'You are not a member of this club'}), 403
-    
     if request.method == 'GET':
         # Get user info for creator
         creator = User.query.get(meeting.created_by)
@@ -5367,20 +5764,8 @@ def manage_club_meeting(club_id, meeting_id):
         })
     
     # For PUT and DELETE methods, check for additional authorization
-    is_authorized = False
-    if meeting.created_by == current_user.id or meeting.club.leader_id == current_user.id:
-        is_authorized = True
-    else:
-        co_leader_membership = ClubMembership.query.filter_by(
-            user_id=current_user.id, 
-            club_id=club_id, 
-            role='co-leader'
-        ).first()
-        
-        if co_leader_membership:
-            is_authorized = True
-    
-    if not is_authorized:
+    if not (meeting.created_by == current_user.id
+            or has_club_role(club_id, 'co-leader')):
         return jsonify({'error': 'You are not authorized to manage this meeting'}), 403
     
     if request.method == 'PUT':
@@ -5440,104 +5825,52 @@ def get_member_sites():
     """Get all sites from members of the current user's club."""
     try:
         # Check if the user is a club leader, co-leader, or member
-        club_id = request.args.get('club_id')
+        club_id = request.args.get('club_id', type=int)
         if club_id:
             # If club_id is provided, check if user is a member of that club
-            membership = ClubMembership.query.filter_by(
-                user_id=current_user.id, club_id=club_id).first()
-            if not membership:
+            if not has_club_role(club_id):
                 return jsonify({'error': 'Not a member of this club'}), 403
-            club = Club.query.get(club_id)
         else:
-            # Otherwise get user's club (if leader)
-            club = Club.query.filter_by(leader_id=current_user.id).first()
-            if not club:
-                # Check if they are a co-leader
-                membership = ClubMembership.query.filter_by(
-                    user_id=current_user.id, role='co-leader').first()
-                if not membership:
-                    # Check if they are a member
-                    membership = ClubMembership.query.filter_by(
-                        user_id=current_user.id).first()
-                    if not membership:
-                        return jsonify({'error': 'No club membership found'}), 404
-                club = membership.club
-
-        app.logger.info(f"Getting sites for club {club.id} ({club.name})")
-
-        # Get all members of the club
-        memberships = ClubMembership.query.filter_by(club_id=club.id).all()
-        member_ids = [m.user_id for m in memberships]
-
-        # Log member details for debugging
-        for membership in memberships:
-            app.logger.info(
-                f"Club member: {membership.user.username} (ID: {membership.user_id})"
-            )
-
-        app.logger.info(f"Found {len(member_ids)} club members")
-
-        # If no members, return empty list immediately
-        if not member_ids:
-            app.logger.warning(
-                "No club members found, returning empty sites list")
-            return jsonify({'sites': []})
-
-        # Get all sites from these members
-        sites = []
-        try:
-            # Use a direct query to get sites
-            sites = db.session.query(Site).filter(
-                Site.user_id.in_(member_ids)).all()
-            app.logger.info(f"Found {len(sites)} member sites")
-
-            # Additional debug logging - list all sites found
-            for site in sites:
-                app.logger.info(
-                    f"Site found: {site.id} - {site.name} (Owner: {site.user_id})"
-                )
-                
-            # Get all featured projects for this club
-            featured_projects = ClubFeaturedProject.query.filter_by(
-                club_id=club.id).all()
-            featured_site_ids = [fp.site_id for fp in featured_projects]
-            app.logger.info(f"Found {len(featured_site_ids)} featured projects")
-            
-        except Exception as query_error:
-            app.logger.error(f"Error querying sites: {str(query_error)}")
-            return jsonify({'error':
-                            f'Database error: {str(query_error)}'}), 500
+            # Otherwise the club they lead, co-lead or belong to, in that order
+            roles = current_user.club_roles
+            club_id = min(roles,
+                          key=lambda c: (-ROLE_RANK[roles[c]], c),
+                          default=None)
+            if club_id is None:
+                return jsonify({'error': 'No club membership found'}), 404
+        club = current_club(club_id)
+
+        query = club_projects_query(club.id)
+        if 'page' in request.args or 'per_page' in request.args:
+            rows, pagination = paginate_rows(query)
+        else:
+            # Callers that don't page still get every member site
+            rows = query.all()
+            pagination = {'total': len(rows)}
+
+        result = [{
+            'id': row.id,
+            'name': row.name,
+            'type': row.site_type,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            'featured': row.featured,
+            'owner': {
+                'id': row.owner_id,
+                'username': row.owner_username
+            }
+        } for row in rows]
 
-        # Format the result with error handling
-        result = []
-        for site in sites:
-            try:
-                # Make sure user reference exists
-                user = User.query.get(site.user_id)
-                if not user:
-                    app.logger.warning(
-                        f"Site {site.id} has invalid user_id {site.user_id}")
-                    continue
-
-                site_data = {
-                    'id': site.id,
-                    'name': site.name,
-                    'type': site.site_type,
-                    'updated_at': site.updated_at.isoformat() if site.updated_at else None,
-                    'featured': site.id in featured_site_ids,
-                    'owner': {
-                        'id': user.id,
-                        'username': user.username
-                    }
-                }
-                result.append(site_data)
-            except Exception as site_error:
-                app.logger.error(
-                    f"Error processing site {site.id}: {str(site_error)}")
-                # Continue with other sites instead of failing completely
-
-        app.logger.info(f"Returning {len(result)} formatted sites")
-        return jsonify({'sites': result, 'club': {'id': club.id, 'name': club.name}})
+        app.logger.debug(
+            f"Returning {len(result)} of {pagination['total']} sites "
+            f"for club {club.id}")
+        return jsonify({
+            'sites': result,
+            'club': {
+                'id': club.id,
+                'name': club.name
+            },
+            **pagination
+        })
     except Exception as e:
         app.logger.error(f'Error getting member sites: {str(e)}')
         return jsonify({'error': f'Failed to get member sites: {str(e)}'}), 500
@@ -5545,20 +5878,10 @@ def get_member_sites():
 
 @app.route('/api/clubs/<int:club_id>/projects/<int:site_id>/feature', methods=['POST'])
 @login_required
+@club_access('co-leader', 'Only club leaders can feature projects')
 def feature_project(club_id, site_id):
     """Feature a project within a club."""
     try:
-        # Verify club exists
-        club = Club.query.get_or_404(club_id)
-        
-        # Check if user is a club leader or co-leader
-        is_leader = club.leader_id == current_user.id
-        is_coleader = ClubMembership.query.filter_by(
-            user_id=current_user.id, club_id=club_id, role='co-leader').first() is not None
-            
-        if not (is_leader or is_coleader):
-            return jsonify({'error': 'Only club leaders can feature projects'}), 403
-            
         # Verify site exists and belongs to a club member
         site = Site.query.get_or_404(site_id)
         
@@ -5600,20 +5923,10 @@ def feature_project(club_id, site_id):
 
 @app.route('/api/clubs/<int:club_id>/projects/<int:site_id>/feature', methods=['DELETE'])
 @login_required
+@club_access('co-leader', 'Only club leaders can unfeature projects')
 def unfeature_project(club_id, site_id):
     """Remove a project from featured status within a club."""
     try:
-        # Verify club exists
-        club = Club.query.get_or_404(club_id)
-        
-        # Check if user is a club leader or co-leader
-        is_leader = club.leader_id == current_user.id
-        is_coleader = ClubMembership.query.filter_by(
-            user_id=current_user.id, club_id=club_id, role='co-leader').first() is not None
-            
-        if not (is_leader or is_coleader):
-            return jsonify({'error': 'Only club leaders can unfeature projects'}), 403
-            
         # Find and delete the featured project
         featured_project = ClubFeaturedProject.query.filter_by(
             club_id=club_id, site_id=site_id).first()
@@ -5634,8 +5947,7 @@ def unfeature_project(club_id, site_id):
 
 def initialize_database():
     try:
-        with app.app_context():
-            db.create_all()
+        upgrade_database(app, db)
         return True
     except Exception as e:
         app.logger.warning(f"Database initialization skipped: {str(e)}")
@@ -5656,15 +5968,24 @@ if __name__ == '__main__':
                         datefmt='%Y-%m-%d %H:%M:%S')
     app.logger.info("Starting server directly from app.py")
 
-    try:
-        app.logger.info("Initializing database...")
-        initialize_database()
-        app.logger.info("Database initialization complete")
-    except Exception as e:
-        app.logger.warning(f"Database initialization error: {e}")
+    # Migrations are kept off the boot path; run `flask db upgrade` instead
+    if os.environ.get('SPACES_CREATE_SCHEMA', '').lower() in ('1', 'true',
+                                                              'yes'):
+        try:
+            app.logger.info("Initializing database...")
+            initialize_database()
+            app.logger.info("Database initialization complete")
+        except Exception as e:
+            app.logger.warning(f"Database initialization error: {e}")
+    else:
+        check_schema_version(app, db)
+
+    startup_profiler.report()
 
     app.logger.info("Server running on http://0.0.0.0:3000")
-    app.run(host='0.0.0.0', port=3000, debug=True)
+    app.run(host='0.0.0.0',
+            port=3000,
+            debug=app.config['SPACES_ENV'] != 'production')
 @app.route('/api/sites/bulk-delete', methods=['DELETE'])
 @login_required
 def bulk_delete_sites():
@@ -5675,16 +5996,10 @@ def bulk_delete_sites():
         if not site_ids:
             return jsonify({'success': False, 'message': 'No site IDs provided'}), 400
         
-        deleted_count = 0
-        for site_id in site_ids:
-            site = Site.query.filter_by(id=site_id, user_id=current_user.id).first()
-            if site:
-                # Delete related site pages
-                SitePage.query.filter_by(site_id=site.id).delete()
-                
-                # Delete the site
-                db.session.delete(site)
-                deleted_count += 1
+        if not all(isinstance(site_id, int) for site_id in site_ids):
+            return jsonify({'success': False, 'message': 'Site IDs must be integers'}), 400
+
+        deleted_count = len(delete_sites(site_ids, user_id=current_user.id))
         
         if deleted_count > 0:
             db.session.commit()
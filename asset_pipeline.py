@@ -0,0 +1,105 @@
+import os
+import json
+import mimetypes
+
+from flask import request, send_from_directory, url_for
+
+# Bundles built by build_assets.py, in the order the files must be loaded
+BUNDLES = {
+    'css/base.css': [
+        'css/unified.css', 'css/style.css', 'css/public_profile.css',
+        'css/toast.css', 'css/modals.css', 'css/github-repo-details.css'
+    ],
+    'js/base.js': ['js/toast.js', 'js/main.js'],
+}
+
+# Individually fingerprinted files (besides the bundles)
+ASSET_DIRS = ('css', 'js')
+
+# Preferred first; only used when the client accepts the encoding
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+ONE_YEAR = 365 * 24 * 3600
+
+
+class AssetPipeline:
+    """Serves fingerprinted, precompressed assets produced by build_assets.py.
+
+    ``asset_url('static', filename=...)`` is a drop-in for ``url_for`` in
+    templates: when the file is in the build manifest it returns the hashed
+    ``/assets/...`` URL, otherwise it falls back to the regular static URL.
+    Hashed files never change, so they are served with
+    ``Cache-Control: immutable``.
+    """
+
+    def __init__(self):
+        self.manifest = {}
+        self.dist_folder = None
+
+    def init_app(self, app):
+        self.dist_folder = app.config.get(
+            'ASSETS_DIST_FOLDER', os.path.join(app.static_folder, 'dist'))
+
+        # In development the sources change constantly, so only use the
+        # manifest when it was built for this deployment
+        if app.config.get('ASSETS_USE_MANIFEST',
+                          app.config.get('SPACES_ENV') == 'production'):
+            self.manifest = self.load_manifest(app)
+
+        app.add_url_rule('/assets/<path:filename>', 'assets', self.serve)
+        app.add_template_global(self.asset_url, 'asset_url')
+        app.add_template_global(self.bundle_urls, 'bundle_urls')
+
+    def load_manifest(self, app):
+        path = os.path.join(self.dist_folder, 'manifest.json')
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            app.logger.warning(
+                'Asset manifest %s not found; run build_assets.py', path)
+        except ValueError as e:
+            app.logger.error(f'Invalid asset manifest {path}: {str(e)}')
+        return {}
+
+    def asset_url(self, endpoint, **values):
+        """``url_for`` that prefers the fingerprinted copy of static files."""
+        if endpoint == 'static':
+            hashed = self.manifest.get(values.get('filename'))
+            if hashed:
+                values['filename'] = hashed
+                return url_for('assets', **values)
+        return url_for(endpoint, **values)
+
+    def bundle_urls(self, name):
+        """URLs to include for a bundle: one hashed file, or its sources."""
+        if name in self.manifest:
+            return [url_for('assets', filename=self.manifest[name])]
+        return [
+            url_for('static', filename=source) for source in BUNDLES[name]
+        ]
+
+    def serve(self, filename):
+        mimetype = mimetypes.guess_type(filename)[0]
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if (request.accept_encodings[encoding] and os.path.isfile(
+                    os.path.join(self.dist_folder, filename + suffix))):
+                response = send_from_directory(self.dist_folder,
+                                               filename + suffix,
+                                               mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+
+        if response is None:
+            response = send_from_directory(self.dist_folder,
+                                           filename,
+                                           mimetype=mimetype)
+
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = (
+            f'public, max-age={ONE_YEAR}, immutable')
+        return response
+
+
+assets = AssetPipeline()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Compare admin user search with and without trigram indexes.
+
+Builds a synthetic user table (1M rows by default) in a scratch schema of
+the database in DATABASE_URL, then times the search query from
+text_search before and after adding the gin_trgm_ops indexes::
+
+    DATABASE_URL=postgresql://... python benchmarks/admin_search.py --rows 1000000
+
+The scratch schema is dropped afterwards unless ``--keep`` is given.
+"""
+import os
+import sys
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+SCHEMA = 'search_bench'
+
+TERMS = ('alice', 'user12345', 'example.org', 'xq', 'zzzzzz')
+
+# Mirrors text_search.match_filter/rank for User.username and User.email
+SEARCH = text(f"""
+    SELECT id, username, email FROM {SCHEMA}.users
+    WHERE username ILIKE :pattern OR email ILIKE :pattern
+       OR username % :term OR email % :term
+    ORDER BY greatest(similarity(username, :term), similarity(email, :term)) DESC
+    LIMIT 50
+""")
+
+# Names are drawn from a small vocabulary plus a numeric suffix so terms
+# match a realistic fraction of rows
+POPULATE = text(f"""
+    INSERT INTO {SCHEMA}.users (username, email)
+    SELECT name || i, name || i || '@' || domain
+    FROM generate_series(1, :rows) AS i,
+    LATERAL (SELECT (ARRAY['alice', 'bob', 'carol', 'dave', 'erin', 'frank',
+                           'grace', 'heidi', 'ivan', 'judy', 'user'])
+                    [1 + (i * 7919) % 11] AS name,
+                    (ARRAY['example.org', 'hackclub.com', 'mail.test'])
+                    [1 + i % 3] AS domain) AS parts
+""")
+
+
+def time_queries(conn, runs):
+    results = {}
+    for term in TERMS:
+        params = {'term': term, 'pattern': f'%{term}%'}
+        conn.execute(SEARCH, params).all()  # warm the cache
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            conn.execute(SEARCH, params).all()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[term] = statistics.median(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--keep', action='store_true',
+                        help='leave the scratch schema in place')
+    args = parser.parse_args()
+
+    url = os.environ.get('DATABASE_URL')
+    if not url:
+        raise SystemExit('Set DATABASE_URL to a scratch Postgres database')
+
+    engine = create_engine(url, isolation_level='AUTOCOMMIT')
+    with engine.connect() as conn:
+        conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        conn.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+        conn.execute(text(f'CREATE TABLE {SCHEMA}.users ('
+                          'id serial PRIMARY KEY, username varchar(80), '
+                          'email varchar(120))'))
+
+        start = time.perf_counter()
+        conn.execute(POPULATE, {'rows': args.rows})
+        conn.execute(text(f'ANALYZE {SCHEMA}.users'))
+        print(f'Populated {args.rows} users in '
+              f'{time.perf_counter() - start:.1f} s')
+
+        before = time_queries(conn, args.runs)
+
+        start = time.perf_counter()
+        for column in ('username', 'email'):
+            conn.execute(text(f'CREATE INDEX ON {SCHEMA}.users '
+                              f'USING gin ({column} gin_trgm_ops)'))
+        conn.execute(text(f'ANALYZE {SCHEMA}.users'))
+        print(f'Built trigram indexes in {time.perf_counter() - start:.1f} s')
+
+        after = time_queries(conn, args.runs)
+
+        print(f'\n{"term":15} {"seq scan ms":>12} {"trigram ms":>12} '
+              f'{"speedup":>8}')
+        for term in TERMS:
+            print(f'{term:15} {before[term]:12.1f} {after[term]:12.1f} '
+                  f'{before[term] / after[term]:7.1f}x')
+
+        if not args.keep:
+            conn.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
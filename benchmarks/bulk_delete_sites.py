@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Compare deleting 1,000 sites one by one with the set-based delete.
+
+Builds the site table and everything that references it in a scratch
+schema of the database in DATABASE_URL, then times, inside transactions
+that are rolled back so every run sees the same data:
+
+* the old per-site loop, replayed as the statements the ORM sent
+  (lookup, page delete, lazy loads of gallery entries, activities and
+  the GitHub link, activity detach, site delete);
+* the single statement from purge.delete_sites.
+
+    DATABASE_URL=postgresql://... python benchmarks/bulk_delete_sites.py --sites 1000
+
+Pass ``--no-fk-indexes`` to leave out the site_id indexes from migration
+0009. The scratch schema is dropped afterwards unless ``--keep`` is given.
+"""
+import os
+import sys
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+SCHEMA = 'delete_bench'
+
+OWNER = 1
+
+SCHEMA_DDL = """
+    CREATE TABLE site (id serial PRIMARY KEY, user_id integer NOT NULL,
+                       name varchar(80) NOT NULL);
+    CREATE TABLE site_page (
+        id serial PRIMARY KEY,
+        site_id integer NOT NULL REFERENCES site (id) ON DELETE CASCADE,
+        filename varchar(255) NOT NULL, content text NOT NULL,
+        UNIQUE (site_id, filename));
+    CREATE TABLE gallery_entry (
+        id serial PRIMARY KEY,
+        site_id integer NOT NULL REFERENCES site (id) ON DELETE CASCADE,
+        title varchar(100) NOT NULL);
+    CREATE TABLE github_repo (
+        id serial PRIMARY KEY,
+        site_id integer NOT NULL REFERENCES site (id),
+        repo_name varchar(100) NOT NULL);
+    CREATE TABLE club_featured_project (
+        id serial PRIMARY KEY, club_id integer NOT NULL,
+        site_id integer NOT NULL REFERENCES site (id) ON DELETE CASCADE);
+    CREATE TABLE user_activity (
+        id serial PRIMARY KEY, message text NOT NULL,
+        site_id integer REFERENCES site (id));
+"""
+
+FK_INDEXES = """
+    CREATE INDEX ON gallery_entry (site_id);
+    CREATE INDEX ON github_repo (site_id);
+    CREATE INDEX ON club_featured_project (site_id);
+    CREATE INDEX ON user_activity (site_id);
+"""
+
+# The first --sites sites belong to OWNER and are the ones deleted
+POPULATE = """
+    INSERT INTO site (user_id, name)
+    SELECT CASE WHEN i <= :sites THEN 1 ELSE 2 + i % 1000 END, 'site ' || i
+    FROM generate_series(1, :sites + :background) AS i;
+    INSERT INTO site_page (site_id, filename, content)
+    SELECT id, f, repeat('<p>hello</p>', 50)
+    FROM site, unnest(ARRAY['index.html', 'styles.css', 'script.js']) AS f;
+    INSERT INTO gallery_entry (site_id, title)
+    SELECT id, name FROM site WHERE id % 10 = 0;
+    INSERT INTO github_repo (site_id, repo_name)
+    SELECT id, name FROM site WHERE id % 5 = 0;
+    INSERT INTO club_featured_project (club_id, site_id)
+    SELECT id % 50, id FROM site WHERE id % 20 = 0;
+    INSERT INTO user_activity (message, site_id)
+    SELECT 'Updated site', id FROM site, generate_series(1, 20);
+"""
+
+# Mirrors purge._DELETE_SITES
+DELETE_SITES = text("""
+    WITH doomed AS (
+        SELECT id FROM site
+        WHERE (CAST(:ids AS integer[]) IS NULL OR id = ANY(:ids))
+          AND (CAST(:user_id AS integer) IS NULL OR user_id = :user_id)
+        FOR UPDATE
+    ), repos AS (
+        DELETE FROM github_repo WHERE site_id IN (SELECT id FROM doomed)
+    ), activities AS (
+        UPDATE user_activity SET site_id = NULL
+        WHERE site_id IN (SELECT id FROM doomed)
+    )
+    DELETE FROM site WHERE id IN (SELECT id FROM doomed)
+    RETURNING id, name
+""")
+
+
+def delete_loop(conn, ids):
+    for site_id in ids:
+        site = conn.execute(
+            text('SELECT id FROM site WHERE id = :id AND user_id = :owner'),
+            {'id': site_id, 'owner': OWNER}).scalar()
+        if site is None:
+            continue
+        conn.execute(text('DELETE FROM site_page WHERE site_id = :id'),
+                     {'id': site_id})
+        conn.execute(text('SELECT * FROM gallery_entry WHERE site_id = :id'),
+                     {'id': site_id}).all()
+        activities = conn.execute(
+            text('SELECT id FROM user_activity WHERE site_id = :id'),
+            {'id': site_id}).scalars().all()
+        if activities:
+            conn.execute(
+                text('UPDATE user_activity SET site_id = NULL '
+                     'WHERE id = ANY(:ids)'), {'ids': activities})
+        conn.execute(text('SELECT * FROM github_repo WHERE site_id = :id'),
+                     {'id': site_id}).all()
+        conn.execute(text('DELETE FROM github_repo WHERE site_id = :id'),
+                     {'id': site_id})
+        conn.execute(text('DELETE FROM gallery_entry WHERE site_id = :id'),
+                     {'id': site_id})
+        conn.execute(text('DELETE FROM site WHERE id = :id'), {'id': site_id})
+
+
+def delete_set(conn, ids):
+    conn.execute(DELETE_SITES, {'ids': ids, 'user_id': OWNER}).all()
+
+
+def time_strategy(engine, strategy, ids, runs):
+    samples = []
+    for _ in range(runs):
+        with engine.connect() as conn:
+            conn.execute(text(f'SET search_path TO {SCHEMA}'))
+            transaction = conn.begin()
+            start = time.perf_counter()
+            strategy(conn, ids)
+            samples.append((time.perf_counter() - start) * 1000)
+            transaction.rollback()
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sites', type=int, default=1000,
+                        help='sites to delete')
+    parser.add_argument('--background', type=int, default=50_000,
+                        help='other sites left in the tables')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--no-fk-indexes', action='store_true')
+    parser.add_argument('--keep', action='store_true',
+                        help='leave the scratch schema in place')
+    args = parser.parse_args()
+
+    url = os.environ.get('DATABASE_URL')
+    if not url:
+        raise SystemExit('Set DATABASE_URL to a scratch Postgres database')
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+        conn.execute(text(f'SET LOCAL search_path TO {SCHEMA}'))
+        conn.execute(text(SCHEMA_DDL))
+        if not args.no_fk_indexes:
+            conn.execute(text(FK_INDEXES))
+        start = time.perf_counter()
+        for statement in POPULATE.split(';'):
+            if statement.strip():
+                conn.execute(text(statement), {
+                    'sites': args.sites,
+                    'background': args.background
+                })
+        print(f'Populated {args.sites + args.background} sites in '
+              f'{time.perf_counter() - start:.1f} s')
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level='AUTOCOMMIT').execute(
+            text(f'ANALYZE {SCHEMA}.site, {SCHEMA}.site_page, '
+                 f'{SCHEMA}.gallery_entry, {SCHEMA}.github_repo, '
+                 f'{SCHEMA}.club_featured_project, {SCHEMA}.user_activity'))
+
+    ids = list(range(1, args.sites + 1))
+    loop = time_strategy(engine, delete_loop, ids, args.runs)
+    set_based = time_strategy(engine, delete_set, ids, args.runs)
+
+    print(f'\nDeleting {args.sites} sites '
+          f'({"without" if args.no_fk_indexes else "with"} FK indexes):')
+    print(f'{"per-site loop":15} {loop:10.1f} ms')
+    print(f'{"set-based":15} {set_based:10.1f} ms')
+    print(f'{"speedup":15} {loop / set_based:9.1f}x')
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Bundle, minify, fingerprint and precompress static CSS/JS.
+
+Writes hashed copies of every file in static/css and static/js (plus the
+bundles defined in asset_pipeline.BUNDLES) to static/dist, each with .gz
+and, when the brotli package is installed, .br siblings. The manifest
+maps logical names to hashed files and is read by asset_pipeline at boot.
+
+Minification uses rjsmin/rcssmin when installed; without them CSS gets a
+conservative comment/whitespace strip and JS is left as is.
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+
+from asset_pipeline import ASSET_DIRS, BUNDLES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC = os.path.join(ROOT, 'static')
+DIST = os.path.join(STATIC, 'dist')
+
+_CSS_TOKENS = re.compile(r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|/\*.*?\*/)',
+                         re.S)
+_CSS_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+
+
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    # Strings are kept verbatim; comments dropped; everything else squeezed
+    parts = []
+    for i, part in enumerate(_CSS_TOKENS.split(text)):
+        if i % 2:
+            if not part.startswith('/*'):
+                parts.append(part)
+        else:
+            part = _CSS_WHITESPACE.sub(' ', part)
+            parts.append(_CSS_PUNCTUATION.sub(r'\1', part))
+    return ''.join(parts).strip()
+
+
+def minify_js(text):
+    if rjsmin is not None:
+        return rjsmin.jsmin(text)
+    return text
+
+
+def read_source(name):
+    with open(os.path.join(STATIC, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def minify(name, text):
+    if name.endswith('.css'):
+        return minify_css(text)
+    if name.endswith('.js') and not name.endswith('.min.js'):
+        return minify_js(text)
+    return text
+
+
+def write_asset(name, text):
+    """Write ``name`` under a content-hashed filename plus compressed copies."""
+    data = text.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem, ext = os.path.splitext(name)
+    hashed = f'{stem}.{digest}{ext}'
+
+    path = os.path.join(DIST, hashed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(compressed)
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+    return hashed, f'{len(data):>8} ({len(compressed)} gz)'
+
+
+def build():
+    if os.path.isdir(DIST):
+        shutil.rmtree(DIST)
+    os.makedirs(DIST)
+
+    manifest = {}
+    sources = sorted(
+        os.path.join(directory, filename) for directory in ASSET_DIRS
+        for filename in os.listdir(os.path.join(STATIC, directory))
+        if filename.endswith(('.css', '.js')))
+
+    for name in sources:
+        original = read_source(name)
+        manifest[name], size = write_asset(name, minify(name, original))
+        print(f'{name:40} {len(original.encode()):>8} -> {size}')
+
+    for name, parts in BUNDLES.items():
+        # A lone ';' keeps concatenated scripts from running into each other
+        separator = '\n' if name.endswith('.css') else '\n;\n'
+        text = separator.join(
+            minify(part, read_source(part)) for part in parts)
+        manifest[name], size = write_asset(name, text)
+        print(f'{name:40} {"bundle":>8} -> {size}')
+
+    with open(os.path.join(DIST, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f'Wrote {len(manifest)} assets to {os.path.relpath(DIST, ROOT)}'
+          f' (brotli: {"yes" if brotli else "no"})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(build())
@@ -0,0 +1,73 @@
+from functools import wraps
+
+from flask import abort, g, jsonify
+from flask_login import current_user
+
+from models import db, Club, club_roles_for
+
+# A leader can do anything a co-leader can, and so on down
+ROLE_RANK = {'member': 1, 'co-leader': 2, 'leader': 3}
+
+DENIED = {
+    'member': 'You are not a member of this club',
+    'co-leader': 'Only club leaders can do this',
+    'leader': 'Only the club leader can do this',
+}
+
+
+def club_role(club_id):
+    """The current user's role in a club, or None.
+
+    Read from the cached principal's ``club_roles``, so it costs no query
+    once the principal is loaded (at most once per IDENTITY_CACHE_TTL).
+    """
+    return current_user.club_role(club_id)
+
+
+def has_club_role(club_id, role='member'):
+    """True if the current user holds ``role`` or a higher one in the club."""
+    held = club_role(club_id)
+    return held is not None and ROLE_RANK[held] >= ROLE_RANK[role]
+
+
+def shares_club(user_id, role='member'):
+    """True if ``user_id`` belongs to a club where the current user holds ``role``."""
+    mine = {
+        club_id
+        for club_id, held in current_user.club_roles.items()
+        if ROLE_RANK[held] >= ROLE_RANK[role]
+    }
+    return bool(mine and mine & club_roles_for([user_id])[user_id].club_ids)
+
+
+def current_club(club_id):
+    """The ``Club`` row, loaded at most once per request; 404 if it's gone."""
+    clubs = g.setdefault('_clubs', {})
+    if club_id not in clubs:
+        clubs[club_id] = db.session.get(Club, club_id)
+    if clubs[club_id] is None:
+        abort(404)
+    return clubs[club_id]
+
+
+def club_access(role='member', message=None):
+    """Only run the view if the current user holds ``role`` in ``club_id``.
+
+    For routes with a ``<int:club_id>`` argument, after ``login_required``.
+    Members pass without a query; for everyone else the club is looked up
+    so that a missing club is a 404 and a foreign one a 403.
+    """
+
+    def decorator(f):
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            club_id = kwargs['club_id']
+            if not has_club_role(club_id, role):
+                current_club(club_id)
+                return jsonify({'error': message or DENIED[role]}), 403
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
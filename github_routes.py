@@ -1,12 +1,16 @@
 from flask import Blueprint, jsonify, request, redirect, url_for, session, flash
 from flask_login import current_user, login_required, login_user
-from github import Github, GithubException
 from dotenv import load_dotenv
-from models import db, GitHubRepo, Site, User, SitePage, UserActivity
+from models import db, GitHubRepo, Site, User, SitePage
+from activity_logger import activity_logger
+from lazy_imports import lazy_module
 import os
-import requests
 import time
 
+# PyGithub pulls in requests, jwt and cryptography; defer until first use
+github = lazy_module('github')
+requests = lazy_module('requests')
+
 load_dotenv()
 
 github_bp = Blueprint('github', __name__)
@@ -33,7 +37,7 @@ def github_status():
         return jsonify({'connected': False, 'repo_connected': False})
 
     try:
-        g = Github(access_token)
+        g = github.Github(access_token)
         user = g.get_user()
 
         site_id = request.args.get('site_id') or session.get('current_site_id')
@@ -73,7 +77,7 @@ def github_status():
                         repo.created_at.isoformat()
                         if repo.created_at else None
                     })
-                except GithubException as e:
+                except github.GithubException as e:
                     if e.status == 404:
                         # Repository no longer exists on GitHub
                         db.session.delete(repo)
@@ -103,7 +107,7 @@ def github_status():
             'repo_connected': False,
             'username': user.login
         })
-    except GithubException as e:
+    except github.GithubException as e:
         if e.status == 401:
             if current_user.github_token:
                 current_user.github_token = None
@@ -166,7 +170,7 @@ def github_callback():
         access_token = data['access_token']
         session['github_token'] = access_token
 
-        g = Github(access_token)
+        g = github.Github(access_token)
         gh_user = g.get_user()
 
         user = None
@@ -176,14 +180,12 @@ def github_callback():
             user.github_username = gh_user.login
             db.session.commit()
 
-            activity = UserActivity(
+            activity_logger.log(
                 activity_type="github_connected",
                 message=
                 f'User {user.username} connected GitHub account @{gh_user.login}',
                 username=user.username,
                 user_id=user.id)
-            db.session.add(activity)
-            db.session.commit()
         else:
             try:
                 primary_email = gh_user.email
@@ -205,7 +207,12 @@ def github_callback():
                 return redirect(url_for('login'))
 
             if primary_email:
-                user = User.query.filter_by(email=primary_email).first()
+                user = User.query.filter_by(
+                    email=primary_email).execution_options(
+                        include_deleted=True).first()
+                if user and user.deleted_at:
+                    flash('This account has been deleted', 'error')
+                    return redirect(url_for('login'))
                 if user:
                     user.github_token = access_token
                     user.github_username = gh_user.login
@@ -213,14 +220,12 @@ def github_callback():
                     login_user(user)
 
                     # Record activity
-                    activity = UserActivity(
+                    activity_logger.log(
                         activity_type="github_connected",
                         message=
                         f'User {user.username} connected GitHub account @{gh_user.login}',
                         username=user.username,
                         user_id=user.id)
-                    db.session.add(activity)
-                    db.session.commit()
                 else:
                     user = User(username=gh_user.login,
                                 email=primary_email,
@@ -235,14 +240,12 @@ def github_callback():
                     login_user(user)
 
                     # Record activity
-                    activity = UserActivity(
+                    activity_logger.log(
                         activity_type="github_connected",
                         message=
                         f'User {user.username} connected GitHub account @{gh_user.login}',
                         username=user.username,
                         user_id=user.id)
-                    db.session.add(activity)
-                    db.session.commit()
 
         next_url = session.pop('next_url', None)
         return redirect(next_url or url_for('welcome'))
@@ -304,7 +307,7 @@ def create_repo():
         has_projects = data.get('has_projects', True)
         has_wiki = data.get('has_wiki', True)
 
-        g = Github(access_token)
+        g = github.Github(access_token)
         user = g.get_user()
 
         # Check if repo with this name already exists
@@ -314,7 +317,7 @@ def create_repo():
                 return jsonify(
                     {'error':
                      f'You already have a repository named "{name}"'}), 400
-        except GithubException:
+        except github.GithubException:
             pass  # Repo doesn't exist, which is what we want
 
         # Create the repo
@@ -342,16 +345,15 @@ def create_repo():
 
         db.session.add(github_repo)
 
+        db.session.commit()
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_repo_creation",
             message=
             f'User {current_user.username} created GitHub repository "{repo.full_name}"',
             username=current_user.username,
             user_id=current_user.id,
             site_id=site_id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Repository created successfully',
@@ -360,7 +362,7 @@ def create_repo():
             'is_private': private
         })
 
-    except GithubException as e:
+    except github.GithubException as e:
         error_message = f"GitHub Error: {e.data.get('message', str(e))}"
         return jsonify({'error': error_message}), e.status
     except Exception as e:
@@ -402,7 +404,7 @@ def repo_info():
             }), 401
 
         try:
-            g = Github(access_token)
+            g = github.Github(access_token)
             repo = g.get_repo(github_repo.repo_name)
 
             # Update repo URL if it changed
@@ -456,7 +458,7 @@ def repo_info():
                 repo.default_branch
             })
 
-        except GithubException as e:
+        except github.GithubException as e:
             if e.status == 404:
                 db.session.delete(github_repo)
                 db.session.commit()
@@ -515,7 +517,7 @@ def push_changes():
         data = request.json
         commit_message = data.get('message', 'Update from Hack Club Spaces')
 
-        g = Github(access_token)
+        g = github.Github(access_token)
         repo = g.get_repo(github_repo.repo_name)
 
         # Get all site files
@@ -564,7 +566,7 @@ def push_changes():
                     repo.update_file(file_path, commit_message, content,
                                      file.sha)
                     results['updated'].append(file_path)
-                except GithubException as e:
+                except github.GithubException as e:
                     if e.status == 404:
                         repo.create_file(file_path, commit_message, content)
                         results['created'].append(file_path)
@@ -581,15 +583,13 @@ def push_changes():
                 })
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_push",
             message=
             f'User {current_user.username} pushed {len(results["updated"])} updates and {len(results["created"])} new files to "{github_repo.repo_name}"',
             username=current_user.username,
             user_id=current_user.id,
             site_id=site_id)
-        db.session.add(activity)
-        db.session.commit()
 
         # Generate a summary
         if not results['errors']:
@@ -612,7 +612,7 @@ def push_changes():
             'timestamp': time.time()
         })
 
-    except GithubException as e:
+    except github.GithubException as e:
         print(f'GitHub error: {str(e)}')
         error_message = f"GitHub Error: {e.data.get('message', str(e))}"
         return jsonify({'error': error_message}), e.status
@@ -659,34 +659,33 @@ def delete_repo():
                 'Please type "delete" to confirm repository deletion'
             }), 400
 
-        g = Github(access_token)
+        g = github.Github(access_token)
         try:
             repo = g.get_repo(github_repo.repo_name)
             repo.delete()
-        except GithubException as e:
+        except github.GithubException as e:
             if e.status != 404:  # If it's not a 404 (already deleted), re-raise
                 raise
 
         # Always remove from our database regardless of GitHub status
         db.session.delete(github_repo)
 
+        db.session.commit()
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_repo_deletion",
             message=
             f'User {current_user.username} deleted GitHub repository "{repo_name}"',
             username=current_user.username,
             user_id=current_user.id,
             site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Repository deleted successfully',
             'repo_name': repo_name
         })
 
-    except GithubException as e:
+    except github.GithubException as e:
         print(f'GitHub error: {str(e)}')
         error_message = f"GitHub Error: {e.data.get('message', str(e))}"
         return jsonify({'error': error_message}), e.status
@@ -721,16 +720,15 @@ def disconnect_repo():
 
         db.session.delete(github_repo)
 
+        db.session.commit()
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_repo_disconnect",
             message=
             f'User {current_user.username} disconnected GitHub repository "{repo_name}"',
             username=current_user.username,
             user_id=current_user.id,
             site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Repository disconnected successfully',
@@ -762,13 +760,11 @@ def disconnect_account():
         db.session.commit()
 
         # Record activity
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_disconnected",
             message=f'User {current_user.username} disconnected GitHub account',
             username=current_user.username,
             user_id=current_user.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({'message': 'GitHub account disconnected successfully'})
 
@@ -807,7 +803,7 @@ def pull_changes():
         if not github_repo:
             return jsonify({'error': 'No repository connected to this site'}), 404
 
-        g = Github(access_token)
+        g = github.Github(access_token)
         repo = g.get_repo(github_repo.repo_name)
 
         # Get all site files from GitHub
@@ -890,14 +886,12 @@ def pull_changes():
 
         # Record activity
         total_files = len(files_pulled) + len(files_updated)
-        activity = UserActivity(
+        activity_logger.log(
             activity_type="github_pull",
             message=f'User {current_user.username} pulled {len(files_pulled)} new files and updated {len(files_updated)} existing files from "{github_repo.repo_name}"',
             username=current_user.username,
             user_id=current_user.id,
             site_id=site.id)
-        db.session.add(activity)
-        db.session.commit()
 
         return jsonify({
             'message': 'Changes pulled successfully',
@@ -0,0 +1,256 @@
+import time
+import threading
+from collections import deque
+
+from flask import g, has_request_context
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import db, User, UserClubRoles, PRINCIPAL_FIELDS
+
+_LATEST_VERSION = db.text(
+    'SELECT coalesce(max(principal_version), 0) FROM "user"')
+
+_CHANGED_SINCE = db.text(
+    'SELECT id, principal_version FROM "user" WHERE principal_version > :floor')
+
+
+class CachedPrincipal(UserMixin):
+    """Lightweight stand-in for ``User`` used as ``current_user``.
+
+    Holds the columns needed on nearly every request plus a ``club_roles``
+    map of ``{club_id: 'leader' | 'co-leader' | 'member'}``. Any other
+    attribute (tokens, bio, relationships, methods) is read from the full
+    ``User`` row, which is loaded at most once per request and only when
+    something asks for it. Attribute writes go to that row as well, so
+    ``current_user.github_token = ...; db.session.commit()`` still works.
+    """
+
+    def __init__(self, data):
+        object.__setattr__(self, '_data', data)
+
+    @property
+    def id(self):
+        return self._data['id']
+
+    @property
+    def username(self):
+        return self._data['username']
+
+    @property
+    def is_active(self):
+        return self._data['is_active'] is not False
+
+    @property
+    def is_admin(self):
+        return bool(self._data['is_admin'])
+
+    @property
+    def is_staff(self):
+        return bool(self._data['is_staff'])
+
+    @property
+    def is_suspended(self):
+        return bool(self._data['is_suspended'])
+
+    @property
+    def is_club_leader_role(self):
+        return bool(self._data['is_club_leader_role'])
+
+    @property
+    def preview_code_verified(self):
+        return bool(self._data['preview_code_verified'])
+
+    @property
+    def club_roles(self):
+        return self._data['club_roles']
+
+    @property
+    def is_club_leader(self):
+        return self.is_club_leader_role or any(
+            role in ('leader', 'co-leader')
+            for role in self._data['club_roles'].values())
+
+    def club_role(self, club_id):
+        """Return this user's role in a club, or None if not a member."""
+        return self._data['club_roles'].get(club_id)
+
+    def load(self):
+        """Return the full ``User`` row, loading it once per request."""
+        if not has_request_context():
+            return db.session.get(User, self.id)
+        users = g.setdefault('_identity_users', {})
+        if self.id not in users:
+            users[self.id] = db.session.get(User, self.id)
+        return users[self.id]
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        user = self.load()
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
+        if name in PRINCIPAL_FIELDS:
+            data = dict(self._data)
+            data[name] = value
+            object.__setattr__(self, '_data', data)
+            identity_cache.invalidate(self.id)
+
+    def __repr__(self):
+        return f'<CachedPrincipal {self.username}>'
+
+
+class IdentityCache:
+    """TTL cache of compact principals keyed by user id.
+
+    Each user has a version number that is bumped whenever their flags or
+    club roles change; a cached principal built for an older version is
+    rebuilt on next access. Changes made by other processes are noticed
+    through ``User.principal_version``, which the same transaction bumps:
+    at most every ``IDENTITY_CACHE_CHECK_INTERVAL`` seconds (default 1)
+    each process lists the users whose version moved and drops their
+    principals. The scan starts from the highest version seen one TTL
+    ago, so a change that commits after a newer one is still picked up.
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        self.app = None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.check_interval = 1.0
+        self._entries = {}
+        self._versions = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._checked_at = 0.0
+        self._floor = None
+        self._seen = None
+        self._marks = deque()
+
+    def init_app(self, app):
+        self.app = app
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self.check_interval = app.config.get('IDENTITY_CACHE_CHECK_INTERVAL',
+                                             self.check_interval)
+
+    def _version(self, user_id):
+        return (self._generation, self._versions.get(user_id, 0))
+
+    def get(self, user_id):
+        """Return a ``CachedPrincipal`` for ``user_id`` or None if missing."""
+        self._sync()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            version = self._version(user_id)
+            if entry and entry[0] > now and entry[1] == version:
+                return CachedPrincipal(entry[2])
+
+        data = self._build(user_id)
+        if data is None:
+            return None
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict_expired(now)
+            if len(self._entries) < self.max_entries:
+                self._entries[user_id] = (now + self.ttl, version, data)
+        return CachedPrincipal(data)
+
+    def _sync(self):
+        """Drop principals whose ``principal_version`` moved elsewhere."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            # Own connection, so a failure can't abort the request's transaction
+            try:
+                with db.engine.connect() as conn:
+                    if self._floor is None:
+                        self._floor = self._seen = conn.execute(
+                            _LATEST_VERSION).scalar()
+                    changed = conn.execute(_CHANGED_SINCE, {
+                        'floor': self._floor
+                    }).all()
+            except SQLAlchemyError as e:
+                self.app.logger.error(
+                    f'Error checking principal versions: {str(e)}')
+                return
+            finally:
+                # Retry a failed check on the next interval, not every call
+                self._checked_at = time.monotonic()
+
+            with self._lock:
+                for user_id, version in changed:
+                    entry = self._entries.get(user_id)
+                    if entry and entry[2]['principal_version'] < version:
+                        del self._entries[user_id]
+            self._seen = max([self._seen, *(v for _, v in changed)])
+            self._marks.append((now, self._seen))
+            while self._marks and self._marks[0][0] <= now - self.ttl:
+                self._floor = self._marks.popleft()[1]
+        finally:
+            self._sync_lock.release()
+
+    def _evict_expired(self, now):
+        expired = [uid for uid, entry in self._entries.items()
+                   if entry[0] <= now]
+        for uid in expired:
+            del self._entries[uid]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def _build(self, user_id):
+        row = db.session.query(
+            *[getattr(User, f) for f in PRINCIPAL_FIELDS],
+            User.principal_version, UserClubRoles.leader_of, UserClubRoles.co_leader_of,
+            UserClubRoles.member_of).outerjoin(
+                UserClubRoles, UserClubRoles.user_id == User.id).filter(
+                    User.id == user_id).first()
+        if row is None:
+            return None
+
+        fields = len(PRINCIPAL_FIELDS)
+        data = dict(zip(PRINCIPAL_FIELDS, row[:fields]))
+        data['principal_version'], leader_of, co_leader_of, member_of = row[fields:]
+        data['club_roles'] = {
+            **{club_id: 'member' for club_id in member_of or ()},
+            **{club_id: 'co-leader' for club_id in co_leader_of or ()},
+            **{club_id: 'leader' for club_id in leader_of or ()}
+        }
+        return data
+
+    def invalidate(self, *user_ids):
+        """Drop this process's cached principals after a change to flags or club roles."""
+        with self._lock:
+            for user_id in user_ids:
+                if user_id is None:
+                    continue
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+                self._entries.pop(user_id, None)
+
+    def invalidate_all(self):
+        """Drop every cached principal, e.g. after a club is deleted."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_roles(session):
+    """Drop principals whose club roles a committed flush changed."""
+    changed = session.info.pop('club_roles_changed', None)
+    if changed:
+        identity_cache.invalidate(*changed)
@@ -0,0 +1,25 @@
+import sys
+import importlib.util
+
+
+def lazy_module(name):
+    """Return ``name`` as a module that is only executed on first attribute access.
+
+    Used for heavy SDKs (Groq, PyGithub, requests) that most requests never
+    touch, so they don't add to cold start time. If the module is already
+    imported it is returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f'No module named {name!r}', name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
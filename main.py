@@ -1,3 +1,7 @@
+import startup_profiler
+
+startup_profiler.install()
+
 import os
 import logging
 import subprocess
@@ -5,6 +9,7 @@ import signal
 import atexit
 from flask import render_template
 from app import app, db
+from schema_version import check_schema_version, upgrade_database
 
 # Configure logging - reduced verbosity
 logging.basicConfig(
@@ -27,11 +32,10 @@ app.logger.setLevel(logging.WARNING)
 hackatime_process = None
 
 def initialize_database():
-    """Initialize the database and create all tables."""
+    """Initialize the database by applying pending migrations."""
     try:
         app.logger.info("Initializing database...")
-        with app.app_context():
-            db.create_all()
+        upgrade_database(app, db)
         app.logger.info("Database initialized successfully.")
         return True
     except Exception as e:
@@ -72,24 +76,41 @@ def stop_hackatime_service():
 def support():
     return render_template('support.html')
 
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
 if __name__ == '__main__':
     app.logger.info("Starting Hack Club Spaces application")
 
-    # Initialize database
-    try:
-        initialize_database()
-    except Exception as e:
-        app.logger.warning(f"Database initialization error: {e}")
+    # Migrations are applied with `flask db upgrade`, so boot only checks
+    # the recorded schema version. SPACES_CREATE_SCHEMA=1 applies pending
+    # migrations on start for local development.
+    if env_flag('SPACES_CREATE_SCHEMA'):
+        try:
+            with startup_profiler.phase('initialize_database'):
+                initialize_database()
+        except Exception as e:
+            app.logger.warning(f"Database initialization error: {e}")
+    else:
+        with startup_profiler.phase('check_schema_version'):
+            schema_ok = check_schema_version(app, db)
+        if not schema_ok and env_flag('SPACES_REQUIRE_SCHEMA_VERSION'):
+            raise SystemExit('Database schema is out of date')
+
+    # The standalone Hackatime service is not used by the main app, so only
+    # start it when asked to
+    if env_flag('START_HACKATIME_SERVICE'):
+        with startup_profiler.phase('start_hackatime_service'):
+            start_hackatime_service()
 
-    # Start Hackatime service
-    start_hackatime_service()
+        # Register the cleanup function to stop Hackatime service on exit
+        atexit.register(stop_hackatime_service)
 
-    # Register the cleanup function to stop Hackatime service on exit
-    atexit.register(stop_hackatime_service)
+    startup_profiler.report()
 
     # Start the main Flask application
     port = int(os.environ.get('PORT', 3000))
     app.logger.info(f"Server running on http://0.0.0.0:{port}")
-    app.run(host='0.0.0.0', port=port, debug=True)
-
-
+    app.run(host='0.0.0.0',
+            port=port,
+            debug=app.config['SPACES_ENV'] != 'production')
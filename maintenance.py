@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Periodic database maintenance jobs.
+
+Run from cron or a scheduled deployment, e.g.::
+
+    python maintenance.py reconcile-likes
+    python maintenance.py rollup-activity              # hourly
+    python maintenance.py create-activity-partitions   # monthly
+    python maintenance.py prune-activity               # monthly
+    python maintenance.py compact-revisions            # daily
+    python maintenance.py purge                        # with PURGE_WORKER=off
+"""
+import os
+import re
+import sys
+import argparse
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import text
+
+import site_revisions
+from purge import purge_worker
+from models import db, SiteRevision
+
+# Recount likes for one range of post ids; only rows that drifted are written
+_RECONCILE_LIKES = text("""
+    UPDATE club_post SET likes = counts.likes
+    FROM (
+        SELECT p.id, COUNT(l.id) AS likes
+        FROM club_post p
+        LEFT JOIN club_post_like l ON l.post_id = p.id
+        WHERE p.id > :after AND p.id <= :upto
+        GROUP BY p.id
+    ) AS counts
+    WHERE club_post.id = counts.id
+      AND club_post.likes IS DISTINCT FROM counts.likes
+""")
+
+
+def reconcile_post_like_counts(batch_size=1000):
+    """Fix ClubPost.likes wherever it disagrees with club_post_like.
+
+    The like endpoint keeps the counter in step atomically, so this only
+    catches drift from older code, manual edits or deleted users. Posts
+    are walked in id order and each batch commits on its own, so locks
+    are short and a rerun picks up where it stopped.
+    """
+    after, fixed = 0, 0
+    while True:
+        upto = db.session.execute(
+            text('SELECT MAX(id) FROM (SELECT id FROM club_post WHERE id > '
+                 ':after ORDER BY id LIMIT :limit) AS batch'),
+            {'after': after, 'limit': batch_size}).scalar()
+        if upto is None:
+            break
+        fixed += db.session.execute(_RECONCILE_LIKES, {
+            'after': after,
+            'upto': upto
+        }).rowcount
+        db.session.commit()
+        after = upto
+    return fixed
+
+
+ACTIVITY_PARTITION = re.compile(r'^user_activity_p(\d{4})(\d{2})$')
+
+_ROLLUP_ACTIVITY = text("""
+    INSERT INTO activity_daily_rollup
+        (day, activity_type, activity_count, user_count)
+    SELECT timestamp::date, activity_type, count(*), count(DISTINCT user_id)
+    FROM user_activity
+    WHERE timestamp >= :start AND timestamp < :end
+    GROUP BY 1, 2
+    ON CONFLICT (day, activity_type) DO UPDATE
+    SET activity_count = excluded.activity_count,
+        user_count = excluded.user_count
+""")
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_activity_partitions(months_ahead=3):
+    """Create the monthly user_activity partitions up to ``months_ahead``.
+
+    Rows for a month without a partition land in user_activity_default,
+    and Postgres refuses to create a partition for a range the default
+    partition already holds rows of, so this has to stay ahead.
+    """
+    month = date.today().replace(day=1)
+    created = []
+    for _ in range(months_ahead + 1):
+        name = f'user_activity_p{month:%Y%m}'
+        if db.session.execute(text('SELECT to_regclass(:name)'),
+                              {'name': name}).scalar() is None:
+            db.session.execute(
+                text(f"CREATE TABLE {name} PARTITION OF user_activity "
+                     f"FOR VALUES FROM ('{month}') "
+                     f"TO ('{_add_months(month, 1)}')"))
+            created.append(name)
+        month = _add_months(month, 1)
+    db.session.commit()
+    return created
+
+
+def rollup_activity(start=None, end=None):
+    """Recount activity_daily_rollup for the days in [start, end).
+
+    Defaults to yesterday and today, so running it hourly keeps the
+    rollups current and makes yesterday's final.
+    """
+    end = end or date.today() + timedelta(days=1)
+    start = start or end - timedelta(days=2)
+    rows = db.session.execute(_ROLLUP_ACTIVITY, {
+        'start': start,
+        'end': end
+    }).rowcount
+    db.session.commit()
+    return rows
+
+
+def prune_activity(retain_months=None, archive=None):
+    """Drop user_activity partitions older than the retention period.
+
+    A monthly partition goes once all of it is more than
+    ACTIVITY_RETENTION_MONTHS (default 12) old, which is a catalog change
+    rather than a DELETE. Its days are rolled up first so the analytics
+    keep them. With ACTIVITY_ARCHIVE set, partitions are detached and
+    renamed user_activity_archive_YYYYMM instead, to be dumped and
+    dropped by hand. Old rows that fell into the default partition are
+    deleted.
+    """
+    config = current_app.config
+    if retain_months is None:
+        retain_months = int(
+            config.get('ACTIVITY_RETENTION_MONTHS',
+                       os.getenv('ACTIVITY_RETENTION_MONTHS', 12)))
+    if archive is None:
+        archive = config.get('ACTIVITY_ARCHIVE',
+                             os.getenv('ACTIVITY_ARCHIVE') == '1')
+    cutoff = _add_months(date.today().replace(day=1), -retain_months)
+
+    partitions = db.session.execute(
+        text("SELECT c.relname FROM pg_inherits i "
+             "JOIN pg_class c ON c.oid = i.inhrelid "
+             "WHERE i.inhparent = 'user_activity'::regclass")).scalars()
+    pruned = []
+    for name in sorted(partitions):
+        match = ACTIVITY_PARTITION.match(name)
+        if not match:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if _add_months(month, 1) > cutoff:
+            continue
+
+        rollup_activity(month, _add_months(month, 1))
+        if archive:
+            db.session.execute(
+                text(f'ALTER TABLE user_activity DETACH PARTITION {name}'))
+            db.session.execute(
+                text(f'ALTER TABLE {name} '
+                     f'RENAME TO user_activity_archive_{month:%Y%m}'))
+        else:
+            db.session.execute(text(f'DROP TABLE {name}'))
+        db.session.commit()
+        pruned.append(name)
+
+    oldest = db.session.execute(
+        text('SELECT min(timestamp) FROM user_activity_default')).scalar()
+    if oldest is not None and oldest.date() < cutoff:
+        rollup_activity(oldest.date(), cutoff)
+        db.session.execute(
+            text('DELETE FROM user_activity_default WHERE timestamp < :cutoff'),
+            {'cutoff': cutoff})
+        db.session.commit()
+    return pruned
+
+
+def compact_site_revisions(keep_days=None):
+    """Thin out old autosave revisions of site pages.
+
+    Autosaves older than SITE_REVISION_KEEP_DAYS (default 7) are reduced
+    to the last one of each day; see site_revisions.compact. Each page
+    commits on its own.
+    """
+    if keep_days is None:
+        keep_days = int(
+            current_app.config.get('SITE_REVISION_KEEP_DAYS',
+                                   os.getenv('SITE_REVISION_KEEP_DAYS', 7)))
+    cutoff = datetime.utcnow() - timedelta(days=keep_days)
+
+    # Pages with more than one old autosave on some day
+    day = db.func.date(SiteRevision.created_at)
+    pages = db.session.query(
+        SiteRevision.site_id, SiteRevision.filename).filter(
+            SiteRevision.autosave, SiteRevision.created_at < cutoff).group_by(
+                SiteRevision.site_id, SiteRevision.filename,
+                day).having(db.func.count() > 1).distinct().all()
+
+    removed = 0
+    for site_id, filename in pages:
+        removed += site_revisions.compact(site_id, filename, cutoff)
+        db.session.commit()
+    return removed
+
+
+def run_purge_jobs():
+    """Finish queued (or abandoned) deletions of users and clubs."""
+    return purge_worker.run_pending()
+
+
+JOBS = {
+    'reconcile-likes': reconcile_post_like_counts,
+    'create-activity-partitions': create_activity_partitions,
+    'rollup-activity': rollup_activity,
+    'prune-activity': prune_activity,
+    'compact-revisions': compact_site_revisions,
+    'purge': run_purge_jobs,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('job', choices=sorted(JOBS))
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        result = JOBS[args.job]()
+    print(f'{args.job}: {result}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
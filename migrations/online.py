@@ -0,0 +1,153 @@
+"""Helpers for changing large tables without long locks.
+
+Plain ALTER TABLE / CREATE INDEX hold locks that block every write to the
+table for the whole rewrite or build. These helpers split each change
+into steps that only need brief locks:
+
+* columns are added nullable (a catalog-only change), backfilled in
+  small committed batches, and made NOT NULL through a NOT VALID check
+  constraint that is validated without blocking writes;
+* indexes are built CONCURRENTLY;
+* foreign keys are added NOT VALID and validated separately.
+
+Each step commits as soon as it is done, through Alembic's autocommit
+block, so a brief lock isn't held on to until the end of the migration
+and a validation scan never runs under the lock of the ALTER before it.
+Call these from a migration's upgrade()/downgrade() like any other op;
+anything else pending in the migration's transaction is committed first.
+"""
+from contextlib import contextmanager
+
+from alembic import op
+from sqlalchemy import text
+
+# Give up quickly instead of queueing every other query behind our lock
+LOCK_TIMEOUT = '5s'
+
+
+@contextmanager
+def own_transactions(timeout=LOCK_TIMEOUT):
+    """Run each statement in the block as its own, immediately committed
+    transaction, waiting at most ``timeout`` for locks.
+
+    The timeout is a session setting here (SET LOCAL has no transaction to
+    live in), so it is reset on the way out and doesn't carry over into
+    later steps, such as CONCURRENTLY builds, on the same connection.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(f"SET lock_timeout = '{timeout}'")
+        try:
+            yield
+        finally:
+            op.execute('RESET lock_timeout')
+
+
+def add_column(table, column, backfill=None, not_null=False,
+               batch_size=5000):
+    """Add ``column`` to ``table``, optionally backfilling it.
+
+    ``backfill`` is an SQL expression for existing rows; it runs in
+    batches of ``batch_size`` that each commit on their own. A constant
+    server_default on the column is fine as is (Postgres 11+ stores it
+    without rewriting the table); a volatile one is not.
+    """
+    column.nullable = True
+    with own_transactions():
+        op.add_column(table, column)
+
+    if backfill is not None:
+        backfill_column(table, column.name, backfill, batch_size)
+    if not_null:
+        set_not_null(table, column.name)
+
+
+def backfill_column(table, column, expression, batch_size=5000):
+    """``UPDATE table SET column = expression`` in committed batches."""
+    update = text(f'UPDATE "{table}" SET "{column}" = {expression} '
+                  f'WHERE id IN (SELECT id FROM "{table}" '
+                  f'WHERE "{column}" IS NULL LIMIT {int(batch_size)})')
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(update).rowcount:
+            pass
+
+
+def set_not_null(table, column):
+    """SET NOT NULL without a write-blocking full table scan.
+
+    Validating a CHECK constraint only takes a SHARE UPDATE EXCLUSIVE
+    lock, and Postgres 12+ skips the scan in SET NOT NULL when such a
+    constraint already proves the column has no nulls.
+    """
+    constraint = f'ck_{table}_{column}_not_null'
+    with own_transactions():
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT {constraint} '
+                   f'CHECK ("{column}" IS NOT NULL) NOT VALID')
+        op.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {constraint}')
+        op.execute(
+            f'ALTER TABLE "{table}" ALTER COLUMN "{column}" SET NOT NULL')
+        op.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT {constraint}')
+
+
+def add_foreign_key(name, table, column, referent, referent_column='id'):
+    """Add a foreign key, checking existing rows without blocking writes."""
+    with own_transactions():
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT {name} '
+                   f'FOREIGN KEY ("{column}") '
+                   f'REFERENCES "{referent}" ("{referent_column}") NOT VALID')
+        op.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {name}')
+
+
+def create_index(name, table, columns, unique=False, where=None,
+                 using=None):
+    """CREATE INDEX CONCURRENTLY, safe to rerun after a failed build.
+
+    An interrupted concurrent build leaves an INVALID index behind that
+    IF NOT EXISTS would happily keep, so such a leftover is dropped first.
+    """
+    column_list = ', '.join(
+        column if '(' in column or ' ' in column else f'"{column}"'
+        for column in columns)
+    sql = (f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY '
+           f'IF NOT EXISTS {name} ON "{table}"'
+           f'{f" USING {using}" if using else ""} ({column_list})'
+           f'{f" WHERE {where}" if where else ""}')
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        invalid = bind.execute(
+            text('SELECT 1 FROM pg_index i JOIN pg_class c '
+                 'ON c.oid = i.indexrelid '
+                 'WHERE c.relname = :name AND NOT i.indisvalid'),
+            {'name': name}).scalar()
+        if invalid:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+        op.execute(sql)
+
+
+def create_partitioned_index(name, table, columns):
+    """Index a partitioned table without blocking writes to it.
+
+    CONCURRENTLY isn't supported on a partitioned table, so the parent
+    index is created ON ONLY the parent (invalid, and instant), each
+    partition is indexed concurrently, and attaching the last one makes
+    the parent index valid. Partitions created later get it by default.
+    """
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    op.execute(f'CREATE INDEX IF NOT EXISTS {name} '
+               f'ON ONLY "{table}" ({column_list})')
+    partitions = op.get_bind().execute(
+        text('SELECT c.relname FROM pg_inherits i '
+             'JOIN pg_class c ON c.oid = i.inhrelid '
+             'WHERE i.inhparent = CAST(:table AS regclass)'),
+        {'table': table}).scalars().all()
+    for partition in partitions:
+        create_index(f'{partition}_{"_".join(columns)}_idx', partition,
+                     columns)
+        op.execute(f'ALTER INDEX {name} ATTACH PARTITION '
+                   f'{partition}_{"_".join(columns)}_idx')
+
+
+def drop_index(name):
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
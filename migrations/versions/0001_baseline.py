@@ -0,0 +1,271 @@
+"""Baseline schema
+
+Creates the tables as they existed before versioned migrations. Databases
+that were set up with setup_db.py / db.create_all() already have them and
+should be marked as being at this revision with ``flask db stamp 0001``
+before running ``flask db upgrade``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-03-01 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(80), nullable=False, unique=True),
+        sa.Column('email', sa.String(120), nullable=False, unique=True),
+        sa.Column('password_hash', sa.String(200), nullable=False),
+        sa.Column('is_active', sa.Boolean()),
+        sa.Column('preview_code_verified', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('last_login', sa.DateTime()),
+        sa.Column('github_token', sa.Text()),
+        sa.Column('github_username', sa.String(100)),
+        sa.Column('slack_id', sa.String(50)),
+        sa.Column('wakatime_api_key', sa.String(100)),
+        sa.Column('groq_api_key', sa.String(100)),
+        sa.Column('is_suspended', sa.Boolean()),
+        sa.Column('is_admin', sa.Boolean()),
+        sa.Column('is_club_leader_role', sa.Boolean()),
+        sa.Column('social_links', sa.JSON()),
+        sa.Column('bio', sa.Text()),
+        sa.Column('avatar', sa.String(500)),
+        sa.Column('profile_banner', sa.String(500)),
+        sa.Column('is_profile_public', sa.Boolean()),
+        sa.Column('is_staff', sa.Boolean()),
+    )
+
+    op.create_table(
+        'site',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(80), nullable=False),
+        sa.Column('slug', sa.String(100), nullable=False, unique=True),
+        sa.Column('site_type', sa.String(20), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('python_content', sa.Text(), nullable=False),
+        sa.Column('is_public', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('view_count', sa.Integer()),
+        sa.Column('analytics_enabled', sa.Boolean()),
+    )
+
+    op.create_table(
+        'club',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('location', sa.String(200)),
+        sa.Column('join_code', sa.String(16), unique=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('leader_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+    )
+
+    op.create_table(
+        'user_activity',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('activity_type', sa.String(50), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('username', sa.String(80)),
+        sa.Column('timestamp', sa.DateTime()),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id')),
+        sa.Column('site_id', sa.Integer(), sa.ForeignKey('site.id')),
+    )
+
+    op.create_table(
+        'club_membership',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('club_id', sa.Integer(), sa.ForeignKey('club.id'),
+                  nullable=False),
+        sa.Column('role', sa.String(50), nullable=False),
+        sa.Column('joined_at', sa.DateTime()),
+        sa.UniqueConstraint('user_id', 'club_id', name='uix_user_club'),
+    )
+
+    op.create_table(
+        'club_post',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(), sa.ForeignKey('club.id'),
+                  nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('likes', sa.Integer()),
+    )
+
+    op.create_table(
+        'club_post_like',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('club_post.id'),
+                  nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.UniqueConstraint('post_id', 'user_id', name='unique_post_like'),
+    )
+
+    op.create_table(
+        'club_assignment',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(), sa.ForeignKey('club.id'),
+                  nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('due_date', sa.DateTime()),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('is_active', sa.Boolean()),
+    )
+
+    op.create_table(
+        'club_resource',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(), sa.ForeignKey('club.id'),
+                  nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('url', sa.String(500), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('icon', sa.String(50)),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+    )
+
+    op.create_table(
+        'club_chat_channel',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(), sa.ForeignKey('club.id'),
+                  nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.UniqueConstraint('club_id', 'name', name='uix_club_channel'),
+    )
+
+    op.create_table(
+        'club_chat_message',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('channel_id', sa.Integer(),
+                  sa.ForeignKey('club_chat_channel.id'), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+    )
+
+    op.create_table(
+        'club_meeting',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(),
+                  sa.ForeignKey('club.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('meeting_date', sa.Date(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=False),
+        sa.Column('end_time', sa.Time()),
+        sa.Column('location', sa.String(200)),
+        sa.Column('meeting_link', sa.String(500)),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+    op.create_table(
+        'gallery_entry',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('site_id', sa.Integer(),
+                  sa.ForeignKey('site.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.Column('title', sa.String(100), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('thumbnail_url', sa.String(500)),
+        sa.Column('tags', sa.String(200)),
+        sa.Column('added_at', sa.DateTime()),
+        sa.Column('is_featured', sa.Boolean()),
+    )
+
+    op.create_table(
+        'github_repo',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('repo_name', sa.String(100), nullable=False),
+        sa.Column('repo_url', sa.String(200), nullable=False),
+        sa.Column('is_private', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('site_id', sa.Integer(), sa.ForeignKey('site.id'),
+                  nullable=False),
+    )
+
+    op.create_table(
+        'site_page',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('site_id', sa.Integer(),
+                  sa.ForeignKey('site.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('file_type', sa.String(20), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('site_id', 'filename', name='uix_site_page'),
+    )
+
+    op.create_table(
+        'club_featured_project',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('club_id', sa.Integer(),
+                  sa.ForeignKey('club.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('site_id', sa.Integer(),
+                  sa.ForeignKey('site.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('featured_at', sa.DateTime()),
+        sa.Column('featured_by', sa.Integer(), sa.ForeignKey('user.id'),
+                  nullable=False),
+        sa.UniqueConstraint('club_id', 'site_id',
+                            name='uix_club_site_featured'),
+    )
+
+    # Used by the max-sites admin setting; never had a model
+    op.create_table(
+        'system_settings',
+        sa.Column('key', sa.String(100), primary_key=True),
+        sa.Column('value', sa.Text()),
+    )
+
+
+def downgrade():
+    for table in ('system_settings', 'club_featured_project', 'site_page',
+                  'github_repo', 'gallery_entry', 'club_meeting',
+                  'club_chat_message', 'club_chat_channel', 'club_resource',
+                  'club_assignment', 'club_post_like', 'club_post',
+                  'club_membership', 'user_activity', 'club', 'site', 'user'):
+        op.drop_table(table)
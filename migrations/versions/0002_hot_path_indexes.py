@@ -0,0 +1,45 @@
+"""Indexes for hot lookup paths
+
+Built with CREATE INDEX CONCURRENTLY so writes to these tables are not
+blocked while the index builds (see migrations/online.py).
+
+site_page lookups by site_id are already served by the uix_site_page
+unique constraint on (site_id, filename), so it gets no extra index.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-03-01 00:00:01
+
+"""
+from migrations.online import create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_site_user_id_updated_at', 'site', ('user_id', 'updated_at')),
+    ('ix_user_activity_user_type_timestamp', 'user_activity',
+     ('user_id', 'activity_type', 'timestamp')),
+    ('ix_club_membership_club_id', 'club_membership', ('club_id',)),
+    ('ix_gallery_entry_user_id', 'gallery_entry', ('user_id',)),
+    ('ix_gallery_entry_is_featured_added_at', 'gallery_entry',
+     ('is_featured', 'added_at')),
+    ('ix_gallery_entry_added_at', 'gallery_entry', ('added_at',)),
+    ('ix_club_post_club_id_created_at', 'club_post',
+     ('club_id', 'created_at')),
+    ('ix_club_chat_message_channel_id_created_at', 'club_chat_message',
+     ('channel_id', 'created_at')),
+)
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        drop_index(name)
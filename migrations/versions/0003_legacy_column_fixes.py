@@ -0,0 +1,63 @@
+"""Legacy column fixes from fix_database.py
+
+Older databases have club_post.author_id and club_resource.creator_id
+instead of user_id/created_by, and club_assignment predates its
+created_by and is_active columns. fix_database.py used to patch these on
+every run; this revision does it once. Databases created from the
+baseline already match, so nothing happens there.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-03-01 00:00:02
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import add_column, add_foreign_key
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+RENAMES = (
+    ('club_post', 'author_id', 'user_id'),
+    ('club_resource', 'creator_id', 'created_by'),
+)
+
+
+def columns(table):
+    return {
+        column['name']
+        for column in sa.inspect(op.get_bind()).get_columns(table)
+    }
+
+
+def add_user_reference(table, column):
+    add_column(table, sa.Column(column, sa.Integer()))
+    add_foreign_key(f'{table}_{column}_fkey', table, column, 'user')
+
+
+def upgrade():
+    for table, old, new in RENAMES:
+        existing = columns(table)
+        if old in existing and new not in existing:
+            op.alter_column(table, old, new_column_name=new)
+        elif new not in existing:
+            add_user_reference(table, new)
+
+    existing = columns('club_assignment')
+    if 'created_by' not in existing:
+        add_user_reference('club_assignment', 'created_by')
+    if 'is_active' not in existing:
+        # A constant default is stored in the catalog, no table rewrite
+        add_column('club_assignment',
+                   sa.Column('is_active', sa.Boolean(),
+                             server_default=sa.true()))
+
+
+def downgrade():
+    # Only repairs drift in old databases; there is nothing to undo
+    pass
@@ -0,0 +1,41 @@
+"""Trigram indexes for admin search
+
+GIN gin_trgm_ops indexes let ILIKE '%term%' and similarity matches on
+these columns use an index instead of scanning the table. Creating the
+extension needs a role allowed to do so (the database owner on Postgres
+13+, since pg_trgm is a trusted extension).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-03-01 00:00:03
+
+"""
+from alembic import op
+
+from migrations.online import create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_user_username_trgm', 'user', 'username'),
+    ('ix_user_email_trgm', 'user', 'email'),
+    ('ix_site_name_trgm', 'site', 'name'),
+    ('ix_site_slug_trgm', 'site', 'slug'),
+    ('ix_club_name_trgm', 'club', 'name'),
+    ('ix_club_description_trgm', 'club', 'description'),
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in INDEXES:
+        create_index(name, table, [f'"{column}" gin_trgm_ops'], using='gin')
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        drop_index(name)
@@ -0,0 +1,43 @@
+"""Normalized gallery tags
+
+Adds gallery_tag with one row per (entry, tag) and fills it from the
+comma-separated gallery_entry.tags, normalized the same way as
+models.normalize_tags (trimmed, lowercased, at most 50 characters).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-03-01 00:00:04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'gallery_tag',
+        sa.Column('entry_id', sa.Integer(),
+                  sa.ForeignKey('gallery_entry.id', ondelete='CASCADE'),
+                  primary_key=True),
+        sa.Column('tag', sa.String(50), primary_key=True),
+    )
+    op.create_index('ix_gallery_tag_tag_entry_id', 'gallery_tag',
+                    ['tag', 'entry_id'])
+
+    op.execute("""
+        INSERT INTO gallery_tag (entry_id, tag)
+        SELECT DISTINCT id, left(lower(trim(tag)), 50)
+        FROM gallery_entry, unnest(string_to_array(tags, ',')) AS tag
+        WHERE trim(tag) <> ''
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade():
+    op.drop_table('gallery_tag')
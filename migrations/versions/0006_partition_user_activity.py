@@ -0,0 +1,132 @@
+"""Monthly partitions for user_activity, plus daily rollups
+
+Recreates user_activity as a table range-partitioned by month on
+timestamp (partitions user_activity_pYYYYMM, and user_activity_default
+for anything outside them), so old months can be dropped or detached
+whole instead of DELETEd row by row. The partition key has to be part
+of the primary key, which becomes (id, timestamp); rows with no
+timestamp get the time of the migration.
+
+The existing rows are copied once under a lock that blocks writes but
+not reads. Activity written in the meantime fails and is only logged
+by activity_logger.
+
+Adds activity_daily_rollup with per-day, per-type counts for the admin
+analytics and fills it from the copied rows. Partitions for coming
+months and the rollups are kept up by maintenance.py.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-03-01 00:00:05
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    op.execute('LOCK TABLE user_activity IN EXCLUSIVE MODE')
+
+    op.execute("""
+        CREATE TABLE user_activity_partitioned (
+            id integer NOT NULL DEFAULT nextval('user_activity_id_seq'),
+            activity_type varchar(50) NOT NULL,
+            message text NOT NULL,
+            username varchar(80),
+            timestamp timestamp without time zone NOT NULL,
+            user_id integer REFERENCES "user" (id),
+            site_id integer REFERENCES site (id)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+
+    oldest = bind.execute(
+        text('SELECT min(timestamp) FROM user_activity')).scalar()
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = date.today().replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = next_month(last)
+    while month <= last:
+        op.execute(f"CREATE TABLE user_activity_p{month:%Y%m} "
+                   f"PARTITION OF user_activity_partitioned "
+                   f"FOR VALUES FROM ('{month}') TO ('{next_month(month)}')")
+        month = next_month(month)
+    op.execute('CREATE TABLE user_activity_default '
+               'PARTITION OF user_activity_partitioned DEFAULT')
+
+    op.execute("""
+        INSERT INTO user_activity_partitioned
+            (id, activity_type, message, username, timestamp, user_id,
+             site_id)
+        SELECT id, activity_type, message, username,
+               coalesce(timestamp, now() at time zone 'utc'), user_id,
+               site_id
+        FROM user_activity
+    """)
+    op.execute('ALTER SEQUENCE user_activity_id_seq '
+               'OWNED BY user_activity_partitioned.id')
+    op.execute('DROP TABLE user_activity')
+    op.execute('ALTER TABLE user_activity_partitioned RENAME TO user_activity')
+    op.execute('ALTER TABLE user_activity '
+               'ADD CONSTRAINT user_activity_pkey PRIMARY KEY (id, timestamp)')
+    op.create_index('ix_user_activity_user_type_timestamp', 'user_activity',
+                    ['user_id', 'activity_type', 'timestamp'])
+    op.create_index('ix_user_activity_timestamp', 'user_activity',
+                    ['timestamp'])
+
+    op.create_table(
+        'activity_daily_rollup',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('activity_type', sa.String(50), primary_key=True),
+        sa.Column('activity_count', sa.Integer(), nullable=False),
+        sa.Column('user_count', sa.Integer(), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO activity_daily_rollup
+            (day, activity_type, activity_count, user_count)
+        SELECT timestamp::date, activity_type, count(*),
+               count(DISTINCT user_id)
+        FROM user_activity
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade():
+    op.drop_table('activity_daily_rollup')
+
+    op.execute('LOCK TABLE user_activity IN EXCLUSIVE MODE')
+    op.execute("""
+        CREATE TABLE user_activity_plain (
+            id integer NOT NULL DEFAULT nextval('user_activity_id_seq'),
+            activity_type varchar(50) NOT NULL,
+            message text NOT NULL,
+            username varchar(80),
+            timestamp timestamp without time zone,
+            user_id integer REFERENCES "user" (id),
+            site_id integer REFERENCES site (id)
+        )
+    """)
+    op.execute('INSERT INTO user_activity_plain SELECT * FROM user_activity')
+    op.execute('ALTER SEQUENCE user_activity_id_seq '
+               'OWNED BY user_activity_plain.id')
+    op.execute('DROP TABLE user_activity')
+    op.execute('ALTER TABLE user_activity_plain RENAME TO user_activity')
+    op.execute('ALTER TABLE user_activity '
+               'ADD CONSTRAINT user_activity_pkey PRIMARY KEY (id)')
+    op.create_index('ix_user_activity_user_type_timestamp', 'user_activity',
+                    ['user_id', 'activity_type', 'timestamp'])
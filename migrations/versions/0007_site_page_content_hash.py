@@ -0,0 +1,31 @@
+"""Content hash for site pages
+
+Adds site_page.content_hash (hex sha256 of content, as computed by
+models.content_digest) so page saves can skip files whose content didn't
+change. Existing rows are hashed in committed batches.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-03-01 00:00:06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import add_column
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column('site_page',
+               sa.Column('content_hash', sa.String(64)),
+               backfill="encode(sha256(convert_to(content, 'UTF8')), 'hex')")
+
+
+def downgrade():
+    op.drop_column('site_page', 'content_hash')
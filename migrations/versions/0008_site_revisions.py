@@ -0,0 +1,48 @@
+"""Site page revision history
+
+Adds site_revision, which keeps past versions of site pages as periodic
+full snapshots plus compressed deltas (see site_revisions.py).
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-03-01 00:00:07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'site_revision',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('site_id', sa.Integer(),
+                  sa.ForeignKey('site.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('snapshot_revision', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('autosave', sa.Boolean(), nullable=False,
+                  server_default=sa.false()),
+        sa.Column('user_id', sa.Integer(),
+                  sa.ForeignKey('user.id', ondelete='SET NULL')),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('site_id', 'filename', 'revision',
+                            name='uix_site_revision'),
+    )
+    op.create_index('ix_site_revision_site_id_id', 'site_revision',
+                    ['site_id', 'id'])
+
+
+def downgrade():
+    op.drop_table('site_revision')
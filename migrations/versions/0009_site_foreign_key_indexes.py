@@ -0,0 +1,43 @@
+"""Indexes on the foreign keys that reference site
+
+Deleting a site makes Postgres look up referencing rows in every table
+with a key to site.id; without an index each lookup is a sequential
+scan, once per deleted site. site_page and site_revision are already
+covered by indexes that lead with site_id.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-03-01 00:00:08
+
+"""
+from alembic import op
+
+from migrations.online import (create_index, create_partitioned_index,
+                               drop_index)
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_gallery_entry_site_id', 'gallery_entry', ('site_id',)),
+    ('ix_github_repo_site_id', 'github_repo', ('site_id',)),
+    ('ix_club_featured_project_site_id', 'club_featured_project',
+     ('site_id',)),
+)
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
+    create_partitioned_index('ix_user_activity_site_id', 'user_activity',
+                             ('site_id',))
+
+
+def downgrade():
+    # Partitioned indexes can't be dropped CONCURRENTLY
+    op.execute('DROP INDEX IF EXISTS ix_user_activity_site_id')
+    for name, _, _ in reversed(INDEXES):
+        drop_index(name)
@@ -0,0 +1,64 @@
+"""Soft delete for users and clubs, and the purge job queue
+
+Adds nullable deleted_at columns to user and club (a catalog-only
+change), the purge_job table that purge.py works through, and indexes
+for the per-user batches the purge deletes from the club tables.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-03-01 00:00:09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import add_column, create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_club_post_user_id', 'club_post', ('user_id',)),
+    ('ix_club_post_like_user_id', 'club_post_like', ('user_id',)),
+    ('ix_club_chat_message_user_id', 'club_chat_message', ('user_id',)),
+)
+
+
+def upgrade():
+    add_column('user', sa.Column('deleted_at', sa.DateTime()))
+    add_column('club', sa.Column('deleted_at', sa.DateTime()))
+
+    op.create_table(
+        'purge_job',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('step', sa.String(50)),
+        sa.Column('steps_done', sa.Integer(), nullable=False),
+        sa.Column('steps_total', sa.Integer()),
+        sa.Column('rows_deleted', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text()),
+        sa.Column('requested_by', sa.Integer(),
+                  sa.ForeignKey('user.id', ondelete='SET NULL')),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+    op.create_index('ix_purge_job_pending', 'purge_job', ['id'],
+                    postgresql_where=sa.text(
+                        "status IN ('queued', 'running')"))
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        drop_index(name)
+    op.drop_table('purge_job')
+    op.drop_column('club', 'deleted_at')
+    op.drop_column('user', 'deleted_at')
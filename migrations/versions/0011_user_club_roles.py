@@ -0,0 +1,69 @@
+"""Per-user club role summary
+
+Adds user_club_roles, which models.refresh_club_roles keeps in step
+with club and club_membership, fills it for every user with a club
+role, and indexes club.leader_id, which the refresh and the purge jobs
+look clubs up by.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-03-01 00:00:10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.online import create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# Same statement as models.REFRESH_CLUB_ROLES, for every user at once
+BACKFILL = """
+    INSERT INTO user_club_roles (user_id, leader_of, co_leader_of, member_of)
+    SELECT u.id,
+           ARRAY(SELECT c.id FROM club c
+                 WHERE c.leader_id = u.id AND c.deleted_at IS NULL
+                 ORDER BY c.id),
+           ARRAY(SELECT m.club_id FROM club_membership m
+                 JOIN club c ON c.id = m.club_id
+                 WHERE m.user_id = u.id AND m.role = 'co-leader'
+                   AND c.leader_id <> u.id AND c.deleted_at IS NULL
+                 ORDER BY m.club_id),
+           ARRAY(SELECT m.club_id FROM club_membership m
+                 JOIN club c ON c.id = m.club_id
+                 WHERE m.user_id = u.id AND m.role <> 'co-leader'
+                   AND c.leader_id <> u.id AND c.deleted_at IS NULL
+                 ORDER BY m.club_id)
+    FROM "user" u
+    WHERE u.id IN (SELECT leader_id FROM club
+                   UNION SELECT user_id FROM club_membership)
+    ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+def upgrade():
+    create_index('ix_club_leader_id', 'club', ('leader_id',))
+
+    op.create_table(
+        'user_club_roles',
+        sa.Column('user_id', sa.Integer(),
+                  sa.ForeignKey('user.id', ondelete='CASCADE'),
+                  primary_key=True),
+        sa.Column('leader_of', postgresql.ARRAY(sa.Integer()),
+                  nullable=False),
+        sa.Column('co_leader_of', postgresql.ARRAY(sa.Integer()),
+                  nullable=False),
+        sa.Column('member_of', postgresql.ARRAY(sa.Integer()),
+                  nullable=False),
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_table('user_club_roles')
+    drop_index('ix_club_leader_id')
@@ -0,0 +1,36 @@
+"""Shared principal versions for the identity cache
+
+Adds user.principal_version (constant default, so no table rewrite),
+the sequence it is bumped from and an index for the scans
+identity_cache runs to find users changed by other processes.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-03-01 00:00:11
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import add_column, create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE SEQUENCE IF NOT EXISTS user_principal_version_seq')
+    add_column('user',
+               sa.Column('principal_version', sa.BigInteger(),
+                         server_default='0'),
+               not_null=True)
+    create_index('ix_user_principal_version', 'user', ('principal_version',))
+
+
+def downgrade():
+    drop_index('ix_user_principal_version')
+    op.drop_column('user', 'principal_version')
+    op.execute('DROP SEQUENCE IF EXISTS user_principal_version_seq')
@@ -1,8 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import DDL, event, inspect
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, validates, with_loader_criteria
+from collections import namedtuple
 from datetime import datetime
+from itertools import chain
 from werkzeug.security import generate_password_hash, check_password_hash
 from slugify import slugify
+import hashlib
 import secrets
 import string
 
@@ -11,21 +17,53 @@ db = SQLAlchemy()
 
 class UserActivity(db.Model):
     __tablename__ = 'user_activity'
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     activity_type = db.Column(db.String(50), nullable=False)
     message = db.Column(db.Text, nullable=False)
     username = db.Column(db.String(80), nullable=True)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    # Partition key (monthly ranges, migration 0006), so part of the key
+    timestamp = db.Column(db.DateTime,
+                          primary_key=True,
+                          default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     site_id = db.Column(db.Integer, db.ForeignKey('site.id'), nullable=True)
 
     user = db.relationship('User', backref=db.backref('activities', lazy=True))
     site = db.relationship('Site', backref=db.backref('activities', lazy=True))
 
+    __table_args__ = (db.Index('ix_user_activity_user_type_timestamp',
+                               'user_id', 'activity_type', 'timestamp'),
+                      db.Index('ix_user_activity_timestamp', 'timestamp'),
+                      db.Index('ix_user_activity_site_id', 'site_id'), {
+                          'postgresql_partition_by': 'RANGE (timestamp)'
+                      })
+
     def __repr__(self):
         return f'<UserActivity {self.activity_type} by {self.username}>'
 
 
+# Without a partition every insert fails, so a schema made by create_all()
+# (tests, setup_db.py) gets the catch-all one migration 0006 creates;
+# maintenance.py adds the monthly ones
+event.listen(
+    UserActivity.__table__, 'after_create',
+    DDL('CREATE TABLE user_activity_default '
+        'PARTITION OF user_activity DEFAULT').execute_if(dialect='postgresql'))
+
+
+class ActivityDailyRollup(db.Model):
+    """Per-day activity counts by type, kept by maintenance.py.
+
+    The admin analytics read these instead of counting user_activity, and
+    they outlive the partitions that retention drops.
+    """
+    __tablename__ = 'activity_daily_rollup'
+    day = db.Column(db.Date, primary_key=True)
+    activity_type = db.Column(db.String(50), primary_key=True)
+    activity_count = db.Column(db.Integer, nullable=False)
+    user_count = db.Column(db.Integer, nullable=False)
+
+
 class Club(db.Model):
     __tablename__ = 'club'
     id = db.Column(db.Integer, primary_key=True)
@@ -36,9 +74,19 @@ class Club(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Set when an admin deletes the club; purge.py removes it for good
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
     # The club leader (owner) is the user who created the club
     leader_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     leader = db.relationship('User', backref=db.backref('club', uselist=False), foreign_keys=[leader_id])
+
+    # Trigram indexes for admin search (migration 0004, needs pg_trgm)
+    __table_args__ = (db.Index('ix_club_name_trgm', 'name', postgresql_using='gin',
+                               postgresql_ops={'name': 'gin_trgm_ops'}),
+                      db.Index('ix_club_description_trgm', 'description', postgresql_using='gin',
+                               postgresql_ops={'description': 'gin_trgm_ops'}),
+                      db.Index('ix_club_leader_id', 'leader_id'))
     
     def generate_join_code(self):
         alphabet = string.ascii_letters + string.digits
@@ -65,7 +113,8 @@ class ClubMembership(db.Model):
     user = db.relationship('User', backref=db.backref('club_memberships', lazy=True))
     club = db.relationship('Club', backref=db.backref('members', lazy=True))
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'club_id', name='uix_user_club'),)
+    __table_args__ = (db.UniqueConstraint('user_id', 'club_id', name='uix_user_club'),
+                      db.Index('ix_club_membership_club_id', 'club_id'))
     
     def __repr__(self):
         return f'<ClubMembership {self.user.username} in {self.club.name} as {self.role}>'
@@ -83,6 +132,9 @@ class ClubPost(db.Model):
     
     club = db.relationship('Club', backref=db.backref('posts', lazy=True, order_by='desc(ClubPost.created_at)'))
     user = db.relationship('User', backref=db.backref('club_posts', lazy=True))
+
+    __table_args__ = (db.Index('ix_club_post_club_id_created_at', 'club_id', 'created_at'),
+                      db.Index('ix_club_post_user_id', 'user_id'))
     
     def __repr__(self):
         return f'<ClubPost {self.id} by {self.user.username} in {self.club.name}>'
@@ -98,7 +150,8 @@ class ClubPostLike(db.Model):
     user = db.relationship('User', backref=db.backref('club_post_likes', lazy=True))
     
     # Make post_id and user_id combination unique
-    __table_args__ = (db.UniqueConstraint('post_id', 'user_id', name='unique_post_like'),)
+    __table_args__ = (db.UniqueConstraint('post_id', 'user_id', name='unique_post_like'),
+                      db.Index('ix_club_post_like_user_id', 'user_id'))
     
     def __repr__(self):
         return f'<ClubPostLike post_id={self.post_id} by user_id={self.user_id}>'
@@ -169,6 +222,10 @@ class ClubChatMessage(db.Model):
     
     channel = db.relationship('ClubChatChannel', backref=db.backref('messages', lazy=True, order_by='ClubChatMessage.created_at'))
     user = db.relationship('User', backref=db.backref('chat_messages', lazy=True))
+
+    __table_args__ = (db.Index('ix_club_chat_message_channel_id_created_at',
+                               'channel_id', 'created_at'),
+                      db.Index('ix_club_chat_message_user_id', 'user_id'))
     
     def __repr__(self):
         return f'<ClubChatMessage by {self.user.username} in {self.channel.name}>'
@@ -210,11 +267,55 @@ class GalleryEntry(db.Model):
     
     site = db.relationship('Site', backref=db.backref('gallery_entries', lazy=True, cascade='all, delete-orphan'))
     user = db.relationship('User', backref=db.backref('gallery_entries', lazy=True))
+
+    __table_args__ = (db.Index('ix_gallery_entry_user_id', 'user_id'),
+                      db.Index('ix_gallery_entry_is_featured_added_at',
+                               'is_featured', 'added_at'),
+                      db.Index('ix_gallery_entry_added_at', 'added_at'),
+                      db.Index('ix_gallery_entry_site_id', 'site_id'))
+
+    def set_tags(self, tags):
+        """Store the comma-separated ``tags`` and their normalized rows."""
+        self.tags = tags
+        self.tag_rows = [GalleryTag(tag=tag) for tag in normalize_tags(tags)]
     
     def __repr__(self):
         return f'<GalleryEntry {self.title} for site {self.site_id}>'
 
 
+def normalize_tags(tags):
+    """Unique, lowercased, trimmed tags from a comma-separated string."""
+    seen = []
+    for tag in (tags or '').split(','):
+        tag = tag.strip().lower()[:50]
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+class GalleryTag(db.Model):
+    """One row per (entry, tag); the indexed side of GalleryEntry.tags."""
+    __tablename__ = 'gallery_tag'
+    entry_id = db.Column(db.Integer, db.ForeignKey('gallery_entry.id', ondelete='CASCADE'), primary_key=True)
+    tag = db.Column(db.String(50), primary_key=True)
+
+    entry = db.relationship('GalleryEntry', backref=db.backref('tag_rows', lazy=True, cascade='all, delete-orphan'))
+
+    __table_args__ = (db.Index('ix_gallery_tag_tag_entry_id', 'tag', 'entry_id'),)
+
+    def __repr__(self):
+        return f'<GalleryTag {self.tag} on entry {self.entry_id}>'
+
+
+# Columns identity_cache keeps in a user's cached principal
+PRINCIPAL_FIELDS = ('id', 'username', 'is_active', 'is_admin', 'is_staff',
+                    'is_suspended', 'is_club_leader_role',
+                    'preview_code_verified')
+
+# Shared across users so a process can ask for every change since a value
+PRINCIPAL_VERSION = db.Sequence('user_principal_version_seq', metadata=db.metadata)
+
+
 class User(UserMixin, db.Model):
     __tablename__ = 'user'
     id = db.Column(db.Integer, primary_key=True)
@@ -225,6 +326,8 @@ class User(UserMixin, db.Model):
     preview_code_verified = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime, default=datetime.utcnow)
+    # Set when an admin deletes the user; purge.py removes it for good
+    deleted_at = db.Column(db.DateTime, nullable=True)
     github_token = db.Column(db.Text, nullable=True)
     github_username = db.Column(db.String(100), nullable=True)
     slack_id = db.Column(db.String(50), nullable=True)
@@ -239,13 +342,20 @@ class User(UserMixin, db.Model):
     profile_banner = db.Column(db.String(500), nullable=True)
     is_profile_public = db.Column(db.Boolean, default=False)
     is_staff = db.Column(db.Boolean, default=False)
+    # Bumped from PRINCIPAL_VERSION whenever the cached principal would change
+    principal_version = db.Column(db.BigInteger, nullable=False, server_default='0')
+
+    # Trigram indexes for admin search (migration 0004, needs pg_trgm)
+    __table_args__ = (db.Index('ix_user_username_trgm', 'username', postgresql_using='gin',
+                               postgresql_ops={'username': 'gin_trgm_ops'}),
+                      db.Index('ix_user_email_trgm', 'email', postgresql_using='gin',
+                               postgresql_ops={'email': 'gin_trgm_ops'}),
+                      db.Index('ix_user_principal_version', 'principal_version'))
     
     @property
     def is_club_leader(self):
         """Return True if the user has club leader role or is a club leader/co-leader."""
-        return self.is_club_leader_role or \
-               Club.query.filter_by(leader_id=self.id).first() is not None or \
-               ClubMembership.query.filter_by(user_id=self.id, role='co-leader').first() is not None
+        return self.is_club_leader_role or club_roles_for([self.id])[self.id].leads_any
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -272,6 +382,8 @@ class GitHubRepo(db.Model):
     site = db.relationship('Site',
                            backref=db.backref('github_repo', uselist=False))
 
+    __table_args__ = (db.Index('ix_github_repo_site_id', 'site_id'),)
+
     def __repr__(self):
         return f'<GitHubRepo {self.repo_name}>'
         
@@ -299,6 +411,12 @@ class Site(db.Model):
     user = db.relationship('User', backref=db.backref('sites', lazy=True))
     view_count = db.Column(db.Integer, default=0)
     analytics_enabled = db.Column(db.Boolean, default=False)
+
+    __table_args__ = (db.Index('ix_site_user_id_updated_at', 'user_id', 'updated_at'),
+                      db.Index('ix_site_name_trgm', 'name', postgresql_using='gin',
+                               postgresql_ops={'name': 'gin_trgm_ops'}),
+                      db.Index('ix_site_slug_trgm', 'slug', postgresql_using='gin',
+                               postgresql_ops={'slug': 'gin_trgm_ops'}))
     
     def __init__(self, *args, **kwargs):
         if 'slug' not in kwargs and 'name' in kwargs:
@@ -333,14 +451,280 @@ class SitePage(db.Model):
     file_type = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # sha256 of content, so saves can skip files that didn't change
+    content_hash = db.Column(db.String(64), nullable=True)
     site = db.relationship('Site', backref=db.backref('pages', lazy=True, cascade='all, delete-orphan'))
 
     __table_args__ = (db.UniqueConstraint('site_id', 'filename', name='uix_site_page'),)
 
+    @validates('content')
+    def _hash_content(self, key, content):
+        self.content_hash = content_digest(content)
+        return content
+
     def __repr__(self):
         return f'<SitePage {self.filename} for Site {self.site_id}>'
 
 
+class SiteRevision(db.Model):
+    """One saved version of a site page; see site_revisions.py.
+
+    Every ``SNAPSHOT_INTERVAL``-th revision of a page holds its full
+    content (``position`` 0); the others hold a delta against an earlier
+    revision in the same run, so ``data`` is only meaningful together with
+    ``snapshot_revision`` and ``position``.
+    """
+    __tablename__ = 'site_revision'
+    id = db.Column(db.Integer, primary_key=True)
+    site_id = db.Column(db.Integer, db.ForeignKey('site.id', ondelete='CASCADE'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    revision = db.Column(db.Integer, nullable=False)
+    snapshot_revision = db.Column(db.Integer, nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    autosave = db.Column(db.Boolean, default=False, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('site_id', 'filename', 'revision', name='uix_site_revision'),
+                      db.Index('ix_site_revision_site_id_id', 'site_id', 'id'))
+
+    def __repr__(self):
+        return f'<SiteRevision {self.filename}@{self.revision} for Site {self.site_id}>'
+
+
+class PurgeJob(db.Model):
+    """Background removal of a soft-deleted user or club; see purge.py."""
+    __tablename__ = 'purge_job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'user' or 'club'
+    target_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    step = db.Column(db.String(50), nullable=True)
+    steps_done = db.Column(db.Integer, nullable=False, default=0)
+    steps_total = db.Column(db.Integer, nullable=True)
+    rows_deleted = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.Index('ix_purge_job_pending', 'id',
+                               postgresql_where=db.text("status IN ('queued', 'running')")),)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'target_id': self.target_id,
+            'status': self.status,
+            'step': self.step,
+            'steps_done': self.steps_done,
+            'steps_total': self.steps_total,
+            'rows_deleted': self.rows_deleted,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<PurgeJob {self.kind} {self.target_id} {self.status}>'
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _hide_deleted(state):
+    """Keep soft-deleted users and clubs out of ORM queries.
+
+    Covers every SELECT that names User or Club, including joins and
+    column queries; already-loaded relationships aren't filtered. Pass
+    ``execution_options(include_deleted=True)`` to see them anyway.
+    """
+    if (state.is_select and not state.is_column_load
+            and not state.is_relationship_load
+            and not state.execution_options.get('include_deleted', False)):
+        state.statement = state.statement.options(
+            with_loader_criteria(User,
+                                 lambda cls: cls.deleted_at.is_(None),
+                                 include_aliases=True),
+            with_loader_criteria(Club,
+                                 lambda cls: cls.deleted_at.is_(None),
+                                 include_aliases=True))
+
+
+class UserClubRoles(db.Model):
+    """Which live clubs a user leads, co-leads and is a plain member of.
+
+    Maintained from club and club_membership by ``refresh_club_roles``;
+    read it through ``club_roles_for``. Users with no row have no roles.
+    """
+    __tablename__ = 'user_club_roles'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    leader_of = db.Column(ARRAY(db.Integer), nullable=False, default=list)
+    co_leader_of = db.Column(ARRAY(db.Integer), nullable=False, default=list)
+    member_of = db.Column(ARRAY(db.Integer), nullable=False, default=list)
+
+    def __repr__(self):
+        return f'<UserClubRoles for User {self.user_id}>'
+
+
+class ClubRoles(namedtuple('ClubRoles', ['leader_of', 'co_leader_of', 'member_of'])):
+    """Frozen sets of club ids; a club appears in at most one of them."""
+
+    @property
+    def leads_any(self):
+        return bool(self.leader_of or self.co_leader_of)
+
+    @property
+    def club_ids(self):
+        return self.leader_of | self.co_leader_of | self.member_of
+
+
+NO_CLUB_ROLES = ClubRoles(frozenset(), frozenset(), frozenset())
+
+# Serialises refreshes of the same user; see refresh_club_roles
+_LOCK_CLUB_ROLES = db.text("""
+    SELECT user_id, pg_advisory_xact_lock(hashtext('user_club_roles'), user_id)
+    FROM (
+        SELECT unnest(CAST(:user_ids AS integer[])) AS user_id
+        UNION
+        SELECT user_id FROM club_membership
+        WHERE club_id = ANY(CAST(:club_ids AS integer[]))
+        UNION
+        SELECT leader_id FROM club WHERE id = ANY(CAST(:club_ids AS integer[]))
+    ) AS affected
+    -- Volatile output columns are computed after the sort, so locks are
+    -- always taken in user id order
+    ORDER BY user_id
+""")
+
+REFRESH_CLUB_ROLES = db.text("""
+    INSERT INTO user_club_roles (user_id, leader_of, co_leader_of, member_of)
+    SELECT u.id,
+           ARRAY(SELECT c.id FROM club c
+                 WHERE c.leader_id = u.id AND c.deleted_at IS NULL
+                 ORDER BY c.id),
+           ARRAY(SELECT m.club_id FROM club_membership m
+                 JOIN club c ON c.id = m.club_id
+                 WHERE m.user_id = u.id AND m.role = 'co-leader'
+                   AND c.leader_id <> u.id AND c.deleted_at IS NULL
+                 ORDER BY m.club_id),
+           ARRAY(SELECT m.club_id FROM club_membership m
+                 JOIN club c ON c.id = m.club_id
+                 WHERE m.user_id = u.id AND m.role <> 'co-leader'
+                   AND c.leader_id <> u.id AND c.deleted_at IS NULL
+                 ORDER BY m.club_id)
+    FROM "user" u
+    WHERE u.id = ANY(CAST(:user_ids AS integer[]))
+    ON CONFLICT (user_id) DO UPDATE
+    SET leader_of = EXCLUDED.leader_of,
+        co_leader_of = EXCLUDED.co_leader_of,
+        member_of = EXCLUDED.member_of
+""")
+
+
+BUMP_PRINCIPAL_VERSION = db.text("""
+    UPDATE "user" SET principal_version = nextval('user_principal_version_seq')
+    WHERE id = ANY(CAST(:user_ids AS integer[]))
+""")
+
+
+def refresh_club_roles(connection, user_ids=(), club_ids=()):
+    """Recompute the role summary of ``user_ids`` and of everyone in ``club_ids``.
+
+    Runs in the caller's transaction. The affected users are locked
+    first so that two transactions changing one user's memberships
+    can't each write a summary missing the other's change. Their
+    principal versions are bumped too, so every process drops their
+    cached principals. Returns the refreshed user ids.
+    """
+    user_ids = connection.execute(_LOCK_CLUB_ROLES, {
+        'user_ids': sorted(set(user_ids)),
+        'club_ids': sorted(set(club_ids))
+    }).scalars().all()
+    if user_ids:
+        connection.execute(REFRESH_CLUB_ROLES, {'user_ids': user_ids})
+        connection.execute(BUMP_PRINCIPAL_VERSION, {'user_ids': user_ids})
+    return user_ids
+
+
+def club_roles_for(user_ids):
+    """``{user_id: ClubRoles}`` in one query, cached on the session.
+
+    The session lasts one request, so each user's roles are read at most
+    once per request; flushes that change them drop the cached entry.
+    """
+    cache = db.session.info.setdefault('club_roles', {})
+    missing = {user_id for user_id in user_ids if user_id not in cache}
+    if missing:
+        rows = db.session.query(
+            UserClubRoles.user_id, UserClubRoles.leader_of,
+            UserClubRoles.co_leader_of, UserClubRoles.member_of).filter(
+                UserClubRoles.user_id.in_(missing))
+        for user_id, *roles in rows:
+            cache[user_id] = ClubRoles(*map(frozenset, roles))
+        for user_id in missing - cache.keys():
+            cache[user_id] = NO_CLUB_ROLES
+    return {user_id: cache[user_id] for user_id in user_ids}
+
+
+def _changed_values(obj, key):
+    history = inspect(obj).attrs[key].history
+    return [value for value in chain(history.unchanged, history.added, history.deleted)
+            if value is not None]
+
+
+@event.listens_for(Session, 'before_flush')
+def _bump_principal_versions(session, flush_context, instances):
+    """Give users whose principal fields or deletion changed a new version."""
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            attrs = inspect(obj).attrs
+            if any(attrs[key].history.has_changes()
+                   for key in PRINCIPAL_FIELDS + ('deleted_at',)):
+                obj.principal_version = PRINCIPAL_VERSION.next_value()
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_club_roles(session, flush_context):
+    """Keep user_club_roles in step with ORM changes to clubs and memberships.
+
+    Bulk ``Query.update()``/``delete()`` and raw SQL bypass this; call
+    ``refresh_club_roles`` after those.
+    """
+    user_ids, club_ids = set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, ClubMembership):
+            user_ids.update(_changed_values(obj, 'user_id'))
+        elif isinstance(obj, Club):
+            user_ids.update(_changed_values(obj, 'leader_id'))
+            if (obj in session.deleted
+                    or inspect(obj).attrs.deleted_at.history.has_changes()):
+                club_ids.add(obj.id)
+    if not (user_ids or club_ids):
+        return
+    refreshed = refresh_club_roles(session.connection(), user_ids, club_ids)
+    cache = session.info.get('club_roles', {})
+    for user_id in refreshed:
+        cache.pop(user_id, None)
+    # identity_cache drops these users' principals once this commits
+    session.info.setdefault('club_roles_changed', set()).update(refreshed)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_club_roles(session, previous_transaction):
+    session.info.pop('club_roles', None)
+    session.info.pop('club_roles_changed', None)
+
+
+def content_digest(content):
+    """Hex sha256 of ``content``; matches the SQL backfill in migration 0007."""
+    return hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+
+
 class ClubFeaturedProject(db.Model):
     __tablename__ = 'club_featured_project'
     id = db.Column(db.Integer, primary_key=True)
@@ -353,7 +737,8 @@ class ClubFeaturedProject(db.Model):
     site = db.relationship('Site', backref=db.backref('featured_in', lazy=True))
     user = db.relationship('User', backref=db.backref('featured_projects', lazy=True))
     
-    __table_args__ = (db.UniqueConstraint('club_id', 'site_id', name='uix_club_site_featured'),)
+    __table_args__ = (db.UniqueConstraint('club_id', 'site_id', name='uix_club_site_featured'),
+                      db.Index('ix_club_featured_project_site_id', 'site_id'))
     
     def __repr__(self):
         return f'<ClubFeaturedProject {self.site_id} in club {self.club_id}>'
@@ -0,0 +1,295 @@
+import os
+import atexit
+import threading
+from datetime import datetime, timedelta
+
+from models import db, Club, PurgeJob
+
+_DELETE_SITES = db.text("""
+    WITH doomed AS (
+        SELECT id FROM site
+        WHERE (CAST(:ids AS integer[]) IS NULL OR id = ANY(:ids))
+          AND (CAST(:user_id AS integer) IS NULL OR user_id = :user_id)
+        FOR UPDATE
+    ), repos AS (
+        DELETE FROM github_repo WHERE site_id IN (SELECT id FROM doomed)
+    ), activities AS (
+        UPDATE user_activity SET site_id = NULL
+        WHERE site_id IN (SELECT id FROM doomed)
+    )
+    DELETE FROM site WHERE id IN (SELECT id FROM doomed)
+    RETURNING id, name
+""")
+
+
+def delete_sites(site_ids=None, user_id=None):
+    """Delete sites by id and/or owner in one statement; ``[(id, name)]``.
+
+    Pages, gallery entries (and their tags), club features and revisions
+    go with the site through their ON DELETE CASCADE keys, GitHub repo
+    links are deleted alongside, and activity rows are kept but detached,
+    as the ORM delete used to leave them. Nothing is loaded into the
+    session. Runs in the session's transaction; the caller commits.
+    Raises ValueError if neither filter is given rather than deleting
+    every site.
+    """
+    if site_ids is None and user_id is None:
+        raise ValueError('delete_sites needs site_ids or user_id')
+    return db.session.execute(_DELETE_SITES, {
+        'ids': list(site_ids) if site_ids is not None else None,
+        'user_id': user_id
+    }).all()
+
+
+def _statement(sql):
+    statement = db.text(sql)
+    return lambda params: db.session.execute(statement, params).rowcount
+
+
+def _delete(table, where, key='id'):
+    """One batch of ``DELETE FROM table WHERE where``, at most :batch rows."""
+    return _statement(f'DELETE FROM {table} WHERE ({key}) IN ('
+                      f'SELECT {key} FROM {table} WHERE {where} LIMIT :batch)')
+
+
+def _reassign(table, column):
+    """Hand rows created by the user over to the leader of their club."""
+    return _statement(f"""
+        UPDATE {table} SET {column} = club.leader_id FROM club
+        WHERE {table}.club_id = club.id AND {table}.id IN (
+            SELECT id FROM {table} WHERE {column} = :user_id LIMIT :batch)
+    """)
+
+
+def _delete_sites_batch(params):
+    ids = db.session.execute(
+        db.text('SELECT id FROM site WHERE user_id = :user_id LIMIT :batch'),
+        params).scalars().all()
+    return len(delete_sites(ids)) if ids else 0
+
+
+_CLUB_STEPS = (
+    ('post likes',
+     _delete('club_post_like', 'post_id IN '
+             '(SELECT id FROM club_post WHERE club_id = :club_id)')),
+    ('posts', _delete('club_post', 'club_id = :club_id')),
+    ('chat messages',
+     _delete('club_chat_message', 'channel_id IN '
+             '(SELECT id FROM club_chat_channel WHERE club_id = :club_id)')),
+    ('chat channels', _delete('club_chat_channel', 'club_id = :club_id')),
+    ('assignments', _delete('club_assignment', 'club_id = :club_id')),
+    ('resources', _delete('club_resource', 'club_id = :club_id')),
+    ('meetings', _delete('club_meeting', 'club_id = :club_id')),
+    ('featured projects',
+     _delete('club_featured_project', 'club_id = :club_id')),
+    ('memberships', _delete('club_membership', 'club_id = :club_id')),
+    ('club', _statement('DELETE FROM club '
+                        'WHERE id = :club_id AND deleted_at IS NOT NULL')),
+)
+
+# Likes the user gave are removed without touching ClubPost.likes; the
+# reconcile-likes maintenance job corrects the counts
+_USER_STEPS = (
+    ('likes', _delete('club_post_like', 'user_id = :user_id')),
+    ('likes on posts',
+     _delete('club_post_like', 'post_id IN '
+             '(SELECT id FROM club_post WHERE user_id = :user_id)')),
+    ('posts', _delete('club_post', 'user_id = :user_id')),
+    ('chat messages', _delete('club_chat_message', 'user_id = :user_id')),
+    ('assignments', _reassign('club_assignment', 'created_by')),
+    ('resources', _reassign('club_resource', 'created_by')),
+    ('chat channels', _reassign('club_chat_channel', 'created_by')),
+    ('meetings', _reassign('club_meeting', 'created_by')),
+    ('featured projects', _reassign('club_featured_project', 'featured_by')),
+    ('memberships', _delete('club_membership', 'user_id = :user_id')),
+    ('gallery entries', _delete('gallery_entry', 'user_id = :user_id')),
+    ('sites', _delete_sites_batch),
+    ('activity',
+     _delete('user_activity', 'user_id = :user_id', key='id, timestamp')),
+    ('user', _statement('DELETE FROM "user" '
+                        'WHERE id = :user_id AND deleted_at IS NOT NULL')),
+)
+
+
+def _steps(job):
+    """``[(name, run(params) -> rows, params)]`` for a job, in order."""
+    if job.kind == 'club':
+        return [(name, step, {
+            'club_id': job.target_id
+        }) for name, step in _CLUB_STEPS]
+
+    # Clubs the user leads go first: their leader_id keeps the user row
+    club_ids = db.session.query(Club.id).filter(
+        Club.leader_id == job.target_id).execution_options(
+            include_deleted=True).scalars().all()
+    steps = []
+    for club_id in club_ids:
+        steps += [(f'club {club_id}: {name}', step, {
+            'club_id': club_id
+        }) for name, step in _CLUB_STEPS]
+    steps += [(name, step, {
+        'user_id': job.target_id
+    }) for name, step in _USER_STEPS]
+    return steps
+
+
+def soft_delete_user(user, requested_by=None):
+    """Hide ``user`` and the clubs they lead now; queue the real delete.
+
+    Runs in the caller's transaction. Call ``purge_worker.wake()`` after
+    committing.
+    """
+    now = datetime.utcnow()
+    user.deleted_at = now
+    # Through the ORM, so the members' club role summaries follow
+    for club in Club.query.filter_by(leader_id=user.id):
+        club.deleted_at = now
+    return purge_worker.enqueue('user', user.id, requested_by)
+
+
+def soft_delete_club(club, requested_by=None):
+    club.deleted_at = datetime.utcnow()
+    return purge_worker.enqueue('club', club.id, requested_by)
+
+
+class PurgeWorker:
+    """Deletes soft-deleted users and clubs in the background.
+
+    Each ``PurgeJob`` is a list of steps, and each step deletes (or, for
+    rows a user created in someone else's club, reassigns) at most
+    ``PURGE_BATCH_SIZE`` rows per transaction until nothing matches, so
+    no lock is held for long and the job's progress is visible as it
+    goes. Steps only match rows that still need work, so a job picked up
+    again after its worker died simply starts over from the first step.
+
+    ``PURGE_WORKER`` is ``thread`` (default) to run jobs on a daemon
+    thread of the web process, or ``off`` to leave them to
+    ``python maintenance.py purge``.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.mode = 'thread'
+        self.batch_size = 500
+        self.poll_interval = 60
+        self.stale_after = timedelta(minutes=5)
+        self._thread = None
+        self._pid = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config.get('PURGE_WORKER',
+                                   os.getenv('PURGE_WORKER', 'thread'))
+        if self.mode not in ('thread', 'off'):
+            raise ValueError("PURGE_WORKER must be 'thread' or 'off'")
+        self.batch_size = int(
+            app.config.get('PURGE_BATCH_SIZE',
+                           os.getenv('PURGE_BATCH_SIZE', 500)))
+        self.poll_interval = app.config.get('PURGE_POLL_INTERVAL', 60)
+        atexit.register(self._stop.set)
+
+    def enqueue(self, kind, target_id, requested_by=None):
+        job = PurgeJob(kind=kind,
+                       target_id=target_id,
+                       status='queued',
+                       steps_done=0,
+                       rows_deleted=0,
+                       requested_by=requested_by)
+        db.session.add(job)
+        db.session.flush()
+        return job
+
+    def wake(self):
+        """Start on queued jobs now rather than at the next poll."""
+        if self.mode == 'thread':
+            self._ensure_thread()
+            self._wake.set()
+
+    def claim(self):
+        """Take the oldest queued job, or a running one whose worker died."""
+        now = datetime.utcnow()
+        job = PurgeJob.query.filter(
+            db.or_(
+                PurgeJob.status == 'queued',
+                db.and_(PurgeJob.status == 'running',
+                        PurgeJob.updated_at < now - self.stale_after))
+        ).order_by(PurgeJob.id).with_for_update(skip_locked=True).first()
+        if job is None:
+            return None
+        job.status = 'running'
+        job.started_at = job.started_at or now
+        job.updated_at = now
+        job.steps_done = 0
+        db.session.commit()
+        return job
+
+    def run_job(self, job):
+        try:
+            steps = _steps(job)
+            job.steps_total = len(steps)
+            for name, step, params in steps:
+                job.step = name
+                params = dict(params, batch=self.batch_size)
+                while True:
+                    rows = step(params)
+                    job.rows_deleted += rows
+                    job.updated_at = datetime.utcnow()
+                    db.session.commit()
+                    if rows < self.batch_size:
+                        break
+                job.steps_done += 1
+            job.status = 'done'
+            job.step = None
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.app.logger.error(
+                f'Purge job {job.id} failed at {job.step}: {str(e)}')
+            job.status = 'failed'
+            job.error = str(e)
+            job.updated_at = datetime.utcnow()
+            db.session.commit()
+
+    def run_pending(self, limit=None):
+        """Run claimable jobs until there are none; returns how many ran."""
+        ran = 0
+        while limit is None or ran < limit:
+            job = self.claim()
+            if job is None:
+                break
+            self.run_job(job)
+            ran += 1
+        return ran
+
+    def _ensure_thread(self):
+        # Started lazily, and again after a fork: worker processes don't
+        # inherit the parent's threads
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                name='purge-worker',
+                                                daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    self.run_pending()
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f'Purge worker error: {str(e)}')
+                finally:
+                    db.session.remove()
+            self._wake.wait(self.poll_interval)
+
+
+purge_worker = PurgeWorker()
@@ -0,0 +1,194 @@
+import re
+import time
+import threading
+from collections import Counter, deque
+from functools import lru_cache
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PYFORMAT_PARAM = re.compile(r'%\(\w+\)s|%s|\?|:\w+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape by replacing parameters and literals.
+
+    Two queries that only differ by bound values (e.g. ``User.query.get(1)``
+    and ``User.query.get(2)``) normalize to the same string.
+    """
+    shape = _PYFORMAT_PARAM.sub('?', statement)
+    shape = _STRING_LITERAL.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _VALUE_LIST.sub('(?+)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryMetrics:
+    """Counts queries and DB time per request and flags probable N+1 patterns.
+
+    Every request gets a ``Server-Timing`` header with its query count and
+    total DB time. A rolling window of samples is kept per endpoint so admins
+    can see which endpoints are the most expensive.
+    """
+
+    def __init__(self, n_plus_one_threshold=5, window=200, max_endpoints=300,
+                 skip_endpoints=('static', 'assets')):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.skip_endpoints = frozenset(skip_endpoints)
+        self.window = window
+        self.max_endpoints = max_endpoints
+        self.endpoints = {}
+        self._lock = threading.Lock()
+        self._app = None
+
+    def init_app(self, app):
+        self._app = app
+        self.n_plus_one_threshold = app.config.get(
+            'QUERY_METRICS_N_PLUS_ONE_THRESHOLD', self.n_plus_one_threshold)
+        self.skip_endpoints = frozenset(
+            app.config.get('QUERY_METRICS_SKIP_ENDPOINTS', self.skip_endpoints))
+        event.listen(Engine, 'before_cursor_execute',
+                     self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute',
+                     self._after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    # The start time lives on the execution context, which goes away with
+    # the statement, so one that raises (no after_cursor_execute) leaves
+    # nothing behind on the pooled connection
+    def _before_cursor_execute(self, conn, cursor, statement, parameters,
+                               context, executemany):
+        if context is not None:
+            context._query_metrics_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters,
+                              context, executemany):
+        started = getattr(context, '_query_metrics_start', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if not has_request_context():
+            return
+        stats = g.get('_query_stats')
+        if stats is None:
+            return
+
+        stats['count'] += 1
+        stats['db_ms'] += elapsed_ms
+        stats['shapes'][normalize_statement(statement)] += 1
+
+    def _start_request(self):
+        if request.endpoint in self.skip_endpoints:
+            return
+        g._query_stats = {
+            'count': 0,
+            'db_ms': 0.0,
+            'shapes': Counter(),
+            'started': time.perf_counter()
+        }
+
+    def _finish_request(self, response):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - stats['started']) * 1000
+        repeated = [(shape, count)
+                    for shape, count in stats['shapes'].most_common(3)
+                    if count >= self.n_plus_one_threshold]
+
+        timing = (f'db;dur={stats["db_ms"]:.1f};desc="{stats["count"]} queries", '
+                  f'app;dur={total_ms:.1f}')
+        existing = response.headers.get('Server-Timing')
+        response.headers['Server-Timing'] = (f'{existing}, {timing}'
+                                             if existing else timing)
+
+        endpoint = request.endpoint or request.path
+        if repeated and self._app is not None:
+            shape, count = repeated[0]
+            self._app.logger.warning(
+                'Probable N+1 in %s: %d identical queries: %s', endpoint,
+                count, shape[:200])
+
+        self._record(endpoint, stats['count'], stats['db_ms'], total_ms,
+                     repeated)
+        return response
+
+    def _record(self, endpoint, count, db_ms, total_ms, repeated):
+        with self._lock:
+            entry = self.endpoints.get(endpoint)
+            if entry is None:
+                if len(self.endpoints) >= self.max_endpoints:
+                    # Drop the endpoint with the least DB time to stay bounded
+                    cheapest = min(self.endpoints,
+                                   key=lambda e: self._total_db_ms(e))
+                    del self.endpoints[cheapest]
+                entry = {
+                    'samples': deque(maxlen=self.window),
+                    'requests': 0,
+                    'n_plus_one': Counter()
+                }
+                self.endpoints[endpoint] = entry
+
+            entry['samples'].append((count, db_ms, total_ms))
+            entry['requests'] += 1
+            for shape, repeats in repeated:
+                entry['n_plus_one'][shape] = max(entry['n_plus_one'][shape],
+                                                 repeats)
+
+    def _total_db_ms(self, endpoint):
+        return sum(sample[1] for sample in self.endpoints[endpoint]['samples'])
+
+    def worst_endpoints(self, limit=20, sort_by='db_ms'):
+        """Return per-endpoint aggregates over the rolling window, worst first."""
+        with self._lock:
+            snapshot = {
+                endpoint: (list(entry['samples']), entry['requests'],
+                           entry['n_plus_one'].most_common(3))
+                for endpoint, entry in self.endpoints.items()
+            }
+
+        rows = []
+        for endpoint, (samples, requests_seen, n_plus_one) in snapshot.items():
+            if not samples:
+                continue
+            counts = [s[0] for s in samples]
+            db_times = sorted(s[1] for s in samples)
+            rows.append({
+                'endpoint': endpoint,
+                'requests': requests_seen,
+                'window': len(samples),
+                'avg_queries': round(sum(counts) / len(counts), 1),
+                'max_queries': max(counts),
+                'avg_db_ms': round(sum(db_times) / len(db_times), 2),
+                'p95_db_ms': round(db_times[int(0.95 * (len(db_times) - 1))], 2),
+                'avg_total_ms': round(sum(s[2] for s in samples) / len(samples), 2),
+                'n_plus_one': [{
+                    'statement': shape,
+                    'repeats': repeats
+                } for shape, repeats in n_plus_one]
+            })
+
+        sort_keys = {
+            'db_ms': lambda r: r['avg_db_ms'],
+            'p95': lambda r: r['p95_db_ms'],
+            'queries': lambda r: r['avg_queries'],
+            'total_ms': lambda r: r['avg_total_ms']
+        }
+        rows.sort(key=sort_keys.get(sort_by, sort_keys['db_ms']), reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+
+query_metrics = QueryMetrics()
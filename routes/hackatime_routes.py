@@ -1,23 +1,22 @@
 
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
-import requests
-from models import db, User, Club, ClubMembership
+from models import db, User, ClubMembership
+from club_access import club_access, current_club, shares_club
+from lazy_imports import lazy_module
+
+requests = lazy_module('requests')
 
 hackatime_bp = Blueprint('hackatime', __name__, url_prefix='/api/hackatime')
 
 @hackatime_bp.route('/club/<int:club_id>/members', methods=['GET'])
 @login_required
+@club_access()
 def get_club_hackatime_members(club_id):
     """Get all club members with Hackatime API keys."""
     try:
-        club = Club.query.get_or_404(club_id)
-        
-        # Check if user is a member of the club
-        is_member = ClubMembership.query.filter_by(club_id=club_id, user_id=current_user.id).first()
-        if not is_member and club.leader_id != current_user.id:
-            return jsonify({'error': 'You are not a member of this club'}), 403
-            
+        club = current_club(club_id)
+
         # Get all users in the club with Hackatime API keys
         members = []
         
@@ -75,28 +74,8 @@ def get_user_hackatime_projects(user_id):
         # Check if user is allowed to see stats (must be in same club)
         user = User.query.get_or_404(user_id)
         
-        # Find the clubs that both users are members of
-        current_user_memberships = ClubMembership.query.filter_by(user_id=current_user.id).all()
-        current_user_club_ids = [m.club_id for m in current_user_memberships]
-        # Add clubs where current user is leader
-        leader_clubs = Club.query.filter_by(leader_id=current_user.id).all()
-        current_user_club_ids.extend([c.id for c in leader_clubs])
-        
-        # Check if target user is in any of these clubs
-        target_user_memberships = ClubMembership.query.filter(
-            ClubMembership.user_id == user_id,
-            ClubMembership.club_id.in_(current_user_club_ids)
-        ).first()
-        
-        # Also check if target user is leader of a club the current user is in
-        target_user_clubs = Club.query.filter_by(leader_id=user_id).all()
-        target_user_club_ids = [c.id for c in target_user_clubs]
-        
-        is_in_same_club = (
-            target_user_memberships is not None or 
-            any(club_id in target_user_club_ids for club_id in current_user_club_ids)
-        )
-        
+        is_in_same_club = shares_club(user_id)
+
         # Allow admins to see all
         if not is_in_same_club and not current_user.is_admin:
             return jsonify({'error': 'Not authorized to view this user\'s projects'}), 403
@@ -5,6 +5,8 @@ import os
 import time
 from datetime import datetime
 from airtable_service import airtable_service
+from club_access import ROLE_RANK, has_club_role
+from models import club_roles_for
 
 pizza_grants_bp = Blueprint('pizza_grants', __name__, url_prefix='/api/pizza-grants')
 
@@ -12,6 +14,12 @@ pizza_grants_bp = Blueprint('pizza_grants', __name__, url_prefix='/api/pizza-gra
 data_dir = 'data/pizza_grants'
 os.makedirs(data_dir, exist_ok=True)
 
+def membership_club_ids(user_id):
+    """Clubs where ``user_id`` has a membership row, i.e. not ones they lead."""
+    roles = club_roles_for([user_id])[user_id]
+    return roles.member_of | roles.co_leader_of
+
+
 def get_submissions_file_path():
     """Get the path to the submissions JSON file"""
     return os.path.join(data_dir, 'submissions.json')
@@ -39,8 +47,6 @@ def save_submissions(submissions):
 def submit_pizza_grant():
     """Submit a new pizza grant request"""
     try:
-        from models import Club, ClubMembership
-
         # Get request data
         data = request.get_json()
 
@@ -100,44 +106,18 @@ def submit_pizza_grant():
             
         # Validate submitter is authorized (either submitting for self or as club leader/co-leader)
         is_authorized = False
-        target_user_id = int(data['user_id'])
+        try:
+            target_user_id = int(data['user_id'])
+            club_id = int(data['club_id'])
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'user_id and club_id must be numbers'}), 400
 
         if target_user_id == current_user.id or current_user.is_admin:
             is_authorized = True
         else:
-            # Check if current user is a club leader for this club
-            club = Club.query.filter_by(
-                id=data['club_id'],
-                leader_id=current_user.id
-            ).first()
-
-            if club:
-                # Verify target user is a member of this club
-                membership = ClubMembership.query.filter_by(
-                    club_id=club.id,
-                    user_id=target_user_id
-                ).first()
-
-                if membership:
-                    is_authorized = True
-
-            # If not a leader, check if co-leader
-            if not is_authorized:
-                coleader_membership = ClubMembership.query.filter_by(
-                    club_id=data['club_id'],
-                    user_id=current_user.id,
-                    role='co-leader'
-                ).first()
-
-                if coleader_membership:
-                    # Verify target user is a member of this club
-                    membership = ClubMembership.query.filter_by(
-                        club_id=data['club_id'],
-                        user_id=target_user_id
-                    ).first()
-
-                    if membership:
-                        is_authorized = True
+            # Leaders and co-leaders can submit for members of their club
+            is_authorized = (has_club_role(club_id, 'co-leader')
+                             and club_id in membership_club_ids(target_user_id))
 
         if not is_authorized:
             return jsonify({'success': False, 'message': 'Unauthorized to submit for this user'}), 403
@@ -190,8 +170,6 @@ def submit_pizza_grant():
 def get_user_submissions(user_id):
     """Get all submissions for a specific user"""
     try:
-        from models import Club, ClubMembership
-
         # Validate that the requested user_id matches the current user
         # or current user is an admin/club leader
         is_authorized = False
@@ -199,34 +177,12 @@ def get_user_submissions(user_id):
         if user_id == current_user.id or current_user.is_admin:
             is_authorized = True
         else:
-            # Check if current user is a club leader
-            led_clubs = Club.query.filter_by(leader_id=current_user.id).all()
-            for club in led_clubs:
-                # Check if requested user is a member of this club
-                membership = ClubMembership.query.filter_by(
-                    club_id=club.id,
-                    user_id=user_id
-                ).first()
-                if membership:
-                    is_authorized = True
-                    break
-
-            # Check if current user is a co-leader
-            if not is_authorized:
-                coleader_memberships = ClubMembership.query.filter_by(
-                    user_id=current_user.id,
-                    role='co-leader'
-                ).all()
-
-                for membership in coleader_memberships:
-                    # Check if requested user is a member of this club
-                    user_membership = ClubMembership.query.filter_by(
-                        club_id=membership.club_id,
-                        user_id=user_id
-                    ).first()
-                    if user_membership:
-                        is_authorized = True
-                        break
+            # Leaders and co-leaders can see their members' submissions
+            led = {
+                club_id for club_id, role in current_user.club_roles.items()
+                if ROLE_RANK[role] >= ROLE_RANK['co-leader']
+            }
+            is_authorized = bool(led & membership_club_ids(user_id))
 
         if not is_authorized:
             return jsonify({'success': False, 'message': 'Unauthorized to view these submissions'}), 403
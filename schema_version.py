@@ -0,0 +1,97 @@
+import os
+import re
+
+from sqlalchemy import inspect, text
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(ROOT, 'migrations')
+VERSIONS_DIR = os.path.join(MIGRATIONS_DIR, 'versions')
+
+# Revision that matches a schema made by db.create_all() before migrations
+BASELINE_REVISION = '0001'
+
+_REVISION = re.compile(r"^revision = ['\"](\w+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision = ['\"](\w+)['\"]", re.M)
+
+_head = None
+
+
+def head_revision():
+    """Latest revision in migrations/versions.
+
+    Read straight from the revision files so the startup check doesn't
+    have to import Alembic.
+    """
+    global _head
+    if _head is None:
+        revisions, parents = set(), set()
+        for filename in os.listdir(VERSIONS_DIR):
+            if not filename.endswith('.py'):
+                continue
+            with open(os.path.join(VERSIONS_DIR, filename)) as f:
+                source = f.read()
+            match = _REVISION.search(source)
+            if match:
+                revisions.add(match.group(1))
+            parents.update(_DOWN_REVISION.findall(source))
+        heads = revisions - parents
+        if len(heads) != 1:
+            raise RuntimeError(
+                f'Expected one migration head, found {sorted(heads)}')
+        _head = heads.pop()
+    return _head
+
+
+def current_revision(db):
+    """Revision recorded in the database, or None if it has none."""
+    try:
+        with db.engine.connect() as conn:
+            return conn.execute(
+                text('SELECT version_num FROM alembic_version')).scalar()
+    except Exception:
+        return None
+
+
+def check_schema_version(app, db):
+    """Compare the database revision with the code's; one query.
+
+    Returns True when they match. A mismatch is logged with the command
+    that fixes it rather than failing later on the first query that
+    touches a missing column.
+    """
+    with app.app_context():
+        current = current_revision(db)
+    head = head_revision()
+    if current == head:
+        return True
+    if current is None:
+        app.logger.error(
+            'Database has no schema version; run `flask db upgrade` (or '
+            f'`flask db stamp {BASELINE_REVISION}` first if its tables were '
+            'created before migrations)')
+    else:
+        app.logger.error(f'Database schema is at revision {current} but the '
+                         f'code expects {head}; run `flask db upgrade`')
+    return False
+
+
+def upgrade_database(app, db):
+    """Apply pending migrations, adopting unversioned databases first.
+
+    A database whose tables were made by db.create_all() has no
+    alembic_version table; it is stamped at the baseline so upgrading
+    doesn't try to create those tables again.
+    """
+    from flask_migrate import Migrate, stamp, upgrade
+
+    if 'migrate' not in app.extensions:
+        Migrate(app, db, directory=MIGRATIONS_DIR)
+
+    with app.app_context():
+        if current_revision(db) is None and inspect(
+                db.engine).has_table('user'):
+            app.logger.warning('Adopting unversioned database at revision '
+                               f'{BASELINE_REVISION}')
+            stamp(directory=MIGRATIONS_DIR, revision=BASELINE_REVISION)
+        upgrade(directory=MIGRATIONS_DIR)
+        return current_revision(db)
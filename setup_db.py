@@ -1,14 +1,16 @@
 from app import app, db
 from sqlalchemy import text
+from schema_version import upgrade_database
 from models import User, Site, SitePage, UserActivity, Club, ClubMembership
 from models import ClubPost, ClubAssignment, ClubResource, ClubChatChannel, ClubChatMessage
 
 def setup_database():
-    """Create all database tables if they don't exist."""
+    """Create or upgrade the database tables by running the migrations."""
+    print("Applying database migrations...")
+    revision = upgrade_database(app, db)
+    print(f"Database schema is at revision {revision}.")
+
     with app.app_context():
-        print("Creating database tables...")
-        db.create_all()
-        print("Database tables created successfully.")
 
         # Create default chat channels for existing clubs if they don't have any
         clubs = Club.query.all()
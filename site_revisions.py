@@ -0,0 +1,187 @@
+import json
+import zlib
+import difflib
+
+from models import db, SiteRevision, content_digest
+
+# Revisions per run between full snapshots. Within a run, the revision at
+# position p is a delta against position p & (p - 1) (p with its lowest
+# set bit cleared), so rebuilding any revision reads the snapshot plus at
+# most log2(SNAPSHOT_INTERVAL) deltas, however long the history is.
+SNAPSHOT_INTERVAL = 64
+
+# The lock record() relies on, via the save that wrote the page
+_LOCK_PAGE = db.text("""
+    SELECT id FROM site_page
+    WHERE site_id = :site_id AND filename = :filename
+    FOR UPDATE
+""")
+
+
+def make_delta(base, content):
+    """Line delta from ``base`` to ``content``.
+
+    A list of ``[start, end]`` (copy those lines of ``base``) and strings
+    (insert this text).
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = content.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    delta = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(lines[j1:j2]))
+    return delta
+
+
+def apply_delta(base, delta):
+    base_lines = base.splitlines(keepends=True)
+    return ''.join(
+        ''.join(base_lines[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in delta)
+
+
+def _encode(content, base=None):
+    if base is None:
+        return zlib.compress(content.encode('utf-8'))
+    return zlib.compress(
+        json.dumps(make_delta(base, content),
+                   separators=(',', ':')).encode('utf-8'))
+
+
+def _decode(data, base=None):
+    data = zlib.decompress(data).decode('utf-8')
+    return data if base is None else apply_delta(base, json.loads(data))
+
+
+def _chain(position):
+    """Positions that rebuild ``position``, snapshot first."""
+    positions = [position]
+    while position:
+        position &= position - 1
+        positions.append(position)
+    return positions[::-1]
+
+
+def content_of(revision):
+    """Full content of a SiteRevision, in one query."""
+    rows = SiteRevision.query.filter(
+        SiteRevision.site_id == revision.site_id,
+        SiteRevision.filename == revision.filename,
+        SiteRevision.snapshot_revision == revision.snapshot_revision,
+        SiteRevision.position.in_(_chain(revision.position))).order_by(
+            SiteRevision.position)
+    content = None
+    for row in rows:
+        content = _decode(row.data, content)
+    return content
+
+
+def record(site_id, contents, user_id=None, autosave=False):
+    """Add a revision for each ``{filename: content}`` that changed.
+
+    Runs in the caller's transaction, after the pages themselves were
+    written, so the site_page row locks order concurrent saves.
+    """
+    if not contents:
+        return []
+    latest = {
+        row.filename: row
+        for row in SiteRevision.query.filter(
+            SiteRevision.site_id == site_id,
+            SiteRevision.filename.in_(list(contents))).distinct(
+                SiteRevision.filename).order_by(
+                    SiteRevision.filename, SiteRevision.revision.desc())
+    }
+
+    revisions = []
+    for filename, content in contents.items():
+        content_hash = content_digest(content)
+        previous = latest.get(filename)
+        if previous is not None and previous.content_hash == content_hash:
+            continue
+
+        revision = previous.revision + 1 if previous else 1
+        if previous is None or previous.position + 1 >= SNAPSHOT_INTERVAL:
+            position, snapshot, data = 0, revision, _encode(content)
+        else:
+            position = previous.position + 1
+            snapshot = previous.snapshot_revision
+            base = previous
+            if position & (position - 1) != previous.position:
+                base = SiteRevision.query.filter_by(
+                    site_id=site_id,
+                    filename=filename,
+                    snapshot_revision=snapshot,
+                    position=position & (position - 1)).one()
+            data = _encode(content, content_of(base))
+
+        row = SiteRevision(site_id=site_id,
+                           filename=filename,
+                           revision=revision,
+                           snapshot_revision=snapshot,
+                           position=position,
+                           data=data,
+                           content_hash=content_hash,
+                           size=len(content),
+                           autosave=autosave,
+                           user_id=user_id)
+        db.session.add(row)
+        revisions.append(row)
+    return revisions
+
+
+def compact(site_id, filename, older_than):
+    """Thin out one page's autosaves from before ``older_than``.
+
+    Manual saves, everything since ``older_than`` and the last autosave
+    of each earlier day are kept. Dropping a revision can remove the base
+    of later deltas, so the survivors are re-encoded into fresh runs;
+    revision numbers don't change. Returns how many were removed; the
+    caller commits.
+
+    Holds the page's site_page row lock until then, so a save can't add
+    a delta against the old layout while the runs are renumbered.
+    """
+    db.session.execute(_LOCK_PAGE, {'site_id': site_id, 'filename': filename})
+    rows = SiteRevision.query.filter_by(
+        site_id=site_id, filename=filename).order_by(
+            SiteRevision.revision).all()
+
+    last_of_day = {}
+    for row in rows:
+        if row.autosave and row.created_at < older_than:
+            last_of_day[row.created_at.date()] = row.id
+    dropped = {
+        row.id
+        for row in rows if row.autosave and row.created_at < older_than
+        and last_of_day[row.created_at.date()] != row.id
+    }
+    if not dropped:
+        return 0
+
+    kept, run = [], {}
+    for row in rows:
+        if row.position == 0:
+            run = {}
+        run[row.position] = _decode(
+            row.data, run[row.position & (row.position - 1)]
+            if row.position else None)
+        if row.id in dropped:
+            db.session.delete(row)
+        else:
+            kept.append((row, run[row.position]))
+
+    run = {}
+    for index, (row, content) in enumerate(kept):
+        position = index % SNAPSHOT_INTERVAL
+        if position == 0:
+            run, snapshot = {}, row.revision
+        row.snapshot_revision = snapshot
+        row.position = position
+        row.data = _encode(content,
+                           run[position & (position - 1)] if position else None)
+        run[position] = content
+    return len(dropped)
@@ -0,0 +1,207 @@
+import re
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from query_metrics import normalize_statement
+
+# Row-locking clauses: EXPLAIN ANALYZE would take the locks for real
+_LOCKING_CLAUSE = re.compile(
+    r'\bFOR\s+(?:NO\s+KEY\s+UPDATE|KEY\s+SHARE|UPDATE|SHARE)\b', re.IGNORECASE)
+
+
+def fingerprint_statement(statement):
+    """Return ``(fingerprint, normalized_statement)`` for a SQL statement."""
+    shape = normalize_statement(statement)
+    return hashlib.md5(shape.encode('utf-8')).hexdigest()[:16], shape
+
+
+class SlowQueryLog:
+    """Aggregates query timings by statement fingerprint.
+
+    Keeps a bounded table of the most expensive fingerprints (by total time)
+    with call count, mean, max and p95 latency. Statements slower than the
+    threshold get an ``EXPLAIN (ANALYZE, BUFFERS)`` captured in the background
+    on a separate connection so the request that triggered it is not slowed
+    down further.
+    """
+
+    def __init__(self, max_fingerprints=200, sample_size=500, threshold_ms=250,
+                 explain_interval=3600):
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+        self.explain_enabled = True
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending_explains = set()
+        self._app = None
+
+    def init_app(self, app, db):
+        self._app = app
+        self.threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS',
+                                           self.threshold_ms)
+        self.explain_enabled = app.config.get('SLOW_QUERY_EXPLAIN', True)
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='slow-query-explain')
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute',
+                     self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute',
+                     self._after_cursor_execute)
+
+    @staticmethod
+    def _skip(context):
+        return context is not None and context.execution_options.get(
+            'slow_query_log_skip', False)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters,
+                               context, executemany):
+        # On the context rather than the connection: a statement that
+        # raises never reaches after_cursor_execute to clean up
+        if context is not None and not self._skip(context):
+            context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters,
+                              context, executemany):
+        started = getattr(context, '_slow_query_start', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        fingerprint, shape = fingerprint_statement(statement)
+        needs_explain = self._record(fingerprint, shape, elapsed_ms)
+
+        if needs_explain and not executemany:
+            self._schedule_explain(conn.engine, fingerprint, statement,
+                                   parameters, elapsed_ms)
+
+    def _record(self, fingerprint, shape, elapsed_ms):
+        """Add a timing sample. Returns True if an EXPLAIN should be captured."""
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            if entry is None:
+                if len(self.entries) >= self.max_fingerprints:
+                    cheapest = min(self.entries,
+                                   key=lambda f: self.entries[f]['total_ms'])
+                    del self.entries[cheapest]
+                entry = {
+                    'statement': shape,
+                    'calls': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'samples': deque(maxlen=self.sample_size),
+                    'last_seen': None,
+                    'explain': None,
+                    'explain_captured_at': 0
+                }
+                self.entries[fingerprint] = entry
+
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['samples'].append(elapsed_ms)
+            entry['last_seen'] = time.time()
+
+            return (elapsed_ms >= self.threshold_ms
+                    and time.time() - entry['explain_captured_at']
+                    >= self.explain_interval
+                    and fingerprint not in self._pending_explains)
+
+    def _schedule_explain(self, engine, fingerprint, statement, parameters,
+                          elapsed_ms):
+        if self._app is not None:
+            self._app.logger.warning('Slow query (%.1f ms) [%s]: %s',
+                                     elapsed_ms, fingerprint,
+                                     statement[:300])
+
+        # EXPLAIN ANALYZE executes the statement, so only do it for reads
+        # that take no row locks; others just get the warning once per interval
+        if (not self.explain_enabled or self._executor is None
+                or engine.dialect.name != 'postgresql'
+                or not statement.lstrip().upper().startswith('SELECT')
+                or _LOCKING_CLAUSE.search(statement)):
+            with self._lock:
+                entry = self.entries.get(fingerprint)
+                if entry is not None:
+                    entry['explain_captured_at'] = time.time()
+            return
+
+        with self._lock:
+            if fingerprint in self._pending_explains:
+                return
+            self._pending_explains.add(fingerprint)
+
+        if isinstance(parameters, dict):
+            parameters = dict(parameters)
+        elif parameters is not None:
+            parameters = tuple(parameters)
+        self._executor.submit(self._capture_explain, engine, fingerprint,
+                              statement, parameters)
+
+    def _capture_explain(self, engine, fingerprint, statement, parameters):
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(slow_query_log_skip=True)
+                with conn.begin() as trans:
+                    conn.exec_driver_sql('SET LOCAL statement_timeout = 10000')
+                    result = conn.exec_driver_sql(
+                        'EXPLAIN (ANALYZE, BUFFERS) ' + statement,
+                        parameters or {})
+                    plan = '\n'.join(row[0] for row in result)
+                    trans.rollback()
+        except Exception as e:
+            plan = f'EXPLAIN failed: {e}'
+
+        with self._lock:
+            self._pending_explains.discard(fingerprint)
+            entry = self.entries.get(fingerprint)
+            if entry is not None:
+                entry['explain'] = plan
+                entry['explain_captured_at'] = time.time()
+
+    def top(self, limit=25, sort_by='total'):
+        """Return the slowest fingerprints sorted by total, mean or p95 time."""
+        with self._lock:
+            snapshot = [(fingerprint, dict(entry, samples=list(entry['samples'])))
+                        for fingerprint, entry in self.entries.items()]
+
+        rows = []
+        for fingerprint, entry in snapshot:
+            samples = sorted(entry['samples'])
+            rows.append({
+                'fingerprint': fingerprint,
+                'statement': entry['statement'],
+                'calls': entry['calls'],
+                'total_ms': round(entry['total_ms'], 2),
+                'mean_ms': round(entry['total_ms'] / entry['calls'], 2),
+                'p95_ms': round(samples[int(0.95 * (len(samples) - 1))], 2)
+                if samples else 0,
+                'max_ms': round(entry['max_ms'], 2),
+                'last_seen': entry['last_seen'],
+                'explain': entry['explain']
+            })
+
+        sort_keys = {
+            'total': lambda r: r['total_ms'],
+            'mean': lambda r: r['mean_ms'],
+            'p95': lambda r: r['p95_ms'],
+            'calls': lambda r: r['calls']
+        }
+        rows.sort(key=sort_keys.get(sort_by, sort_keys['total']), reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.entries.clear()
+
+
+slow_query_log = SlowQueryLog()
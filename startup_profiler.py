@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import builtins
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('SPACES_PROFILE_STARTUP', '').lower() in ('1', 'true',
+                                                                   'yes')
+
+_started = time.perf_counter()
+_original_import = None
+_import_stack = []
+_imports = {}
+_phases = []
+_reported = False
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Only the first (real) import of a module is interesting; later
+    # imports are dictionary lookups in sys.modules
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _import_stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += elapsed
+        if name not in _imports:
+            _imports[name] = (elapsed, elapsed - children)
+
+
+def install():
+    """Start recording per-import timings if SPACES_PROFILE_STARTUP is set."""
+    global _original_import
+    if not ENABLED or _original_import is not None:
+        return
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+@contextmanager
+def phase(name):
+    """Time an initializer (e.g. ``db.init_app``) as a named startup phase."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - start))
+
+
+def report(limit=25, stream=None):
+    """Print the slowest imports and all startup phases, once."""
+    global _reported, _original_import
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+
+    stream = stream or sys.stderr
+    total_ms = (time.perf_counter() - _started) * 1000
+    print(f'Startup profile: {total_ms:.1f} ms since profiler import',
+          file=stream)
+
+    print(f'\nSlowest imports (top {limit}, inclusive / self ms):', file=stream)
+    slowest = sorted(_imports.items(), key=lambda i: i[1][0], reverse=True)
+    for name, (inclusive, self_time) in slowest[:limit]:
+        print(f'  {inclusive * 1000:9.1f} {self_time * 1000:9.1f}  {name}',
+              file=stream)
+
+    print('\nInitializers (ms):', file=stream)
+    for name, elapsed in _phases:
+        print(f'  {elapsed * 1000:9.1f}  {name}', file=stream)
+    stream.flush()
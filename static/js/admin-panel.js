@@ -0,0 +1,2096 @@
+// Values rendered by admin_panel.html as data attributes on this script tag
+const adminPanel = (function(data) {
+    return {
+        currentUserId: Number(data.currentUserId),
+        currentUsername: data.currentUsername
+    };
+})(document.currentScript.dataset);
+
+// Sections whose data is only fetched the first time they are opened
+const lazySectionLoaders = {
+    analytics: () => updateAnalytics('day')
+};
+const loadedSections = new Set();
+
+function loadSectionOnce(sectionId) {
+    const loader = lazySectionLoaders[sectionId];
+    if (loader && !loadedSections.has(sectionId)) {
+        loadedSections.add(sectionId);
+        loader();
+    }
+}
+
+function showToast(type, message) {
+    const toastContainer = document.getElementById('toast-container');
+    const toast = document.createElement('div');
+    toast.className = `toast toast-${type}`;
+
+    const icon = type === 'success' ? 'check-circle' : 
+                 type === 'error' ? 'exclamation-circle' :
+                 type === 'warning' ? 'exclamation-triangle' : 'info-circle';
+
+    toast.innerHTML = `
+        <div class="toast-content">
+            <i class="fas fa-${icon}"></i>
+            <span>${message}</span>
+        </div>
+    `;
+
+    toastContainer.appendChild(toast);
+
+    // Force reflow
+    toast.offsetHeight;
+
+    // Show the toast
+    toast.classList.add('show');
+
+    // Automatically remove after 3 seconds
+    setTimeout(() => {
+        toast.classList.remove('show');
+        setTimeout(() => toast.remove(), 300);
+    }, 3000);
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const navLinks = document.querySelectorAll('.nav-link');
+    const sections = document.querySelectorAll('.admin-section');
+
+    navLinks.forEach(link => {
+        link.addEventListener('click', (e) => {
+            e.preventDefault();
+
+            navLinks.forEach(l => l.classList.remove('active'));
+            link.classList.add('active');
+
+            const sectionId = link.getAttribute('data-section');
+            sections.forEach(section => {
+                section.classList.remove('active');
+                if (section.id === sectionId) {
+                    section.classList.add('active');
+                    section.classList.add('section-entrance');
+                    setTimeout(() => {
+                        section.classList.remove('section-entrance');
+                    }, 500);
+                }
+            });
+
+            loadSectionOnce(sectionId);
+            window.location.hash = sectionId;
+        });
+    });
+
+    const hash = window.location.hash.substring(1);
+    if (hash) {
+        const activeLink = document.querySelector(`.nav-link[data-section="${hash}"]`);
+        if (activeLink) {
+            activeLink.click();
+        }
+    }
+
+    const sidebarCollapseBtn = document.getElementById('sidebarCollapseBtn');
+    const adminContainer = document.querySelector('.admin-container');
+
+    sidebarCollapseBtn.addEventListener('click', () => {
+        adminContainer.classList.toggle('sidebar-collapsed');
+    });
+
+    // Initialize all modal close buttons
+    document.querySelectorAll('.close-btn').forEach(button => {
+        button.addEventListener('click', function() {
+            const modal = this.closest('.modal');
+            if (modal) {
+                modal.style.opacity = '0';
+                modal.style.visibility = 'hidden';
+                setTimeout(() => {
+                    modal.style.display = 'none';
+                    document.body.style.overflow = '';
+                }, 300);
+            }
+        });
+    });
+
+    // Initialize action dropdowns
+    initializeActionDropdowns();
+
+    loadAdminList();
+});
+
+function filterUsers() {
+    const searchTerm = document.getElementById('userSearch').value.trim();
+
+    if (searchTerm.length < 2) {
+        return; // Require at least 2 characters
+    }
+
+    // Show loading indicator
+    document.getElementById('userTableBody').innerHTML = `
+        <tr>
+            <td colspan="8" class="text-center">
+                <div class="loading-spinner"></div>
+                <p>Searching users...</p>
+            </td>
+        </tr>
+    `;
+
+    // Make API call to search users
+    fetch(`/api/admin/search/users?term=${encodeURIComponent(searchTerm)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                showToast('error', data.error);
+                return;
+            }
+
+            const userTableBody = document.getElementById('userTableBody');
+            userTableBody.innerHTML = '';
+
+            if (data.users.length === 0) {
+                userTableBody.innerHTML = `
+                    <tr>
+                        <td colspan="8" class="text-center">
+                            <p>No users found matching "${searchTerm}"</p>
+                        </td>
+                    </tr>
+                `;
+                return;
+            }
+
+            data.users.forEach(user => {
+                const row = document.createElement('tr');
+                const currentUserId = adminPanel.currentUserId;
+
+                row.innerHTML = `
+                    <td>
+                        ${user.id !== currentUserId ? 
+                        `<input type="checkbox" class="user-select" data-userid="${user.id}" data-username="${user.username}" onchange="updateBulkActions()">` : 
+                        ''}
+                    </td>
+                    <td>${user.id}</td>
+                    <td>
+                        <div class="user-table-info">
+                            <div class="user-avatar-small">
+                                ${user.avatar ? `<img src="${user.avatar}" alt="${user.username}">` : `<i class="fas fa-user"></i>`}
+                            </div>
+                            ${user.username}
+                        </div>
+                    </td>
+                    <td>${user.email}</td>
+                    <td>${user.created_at}</td>
+                    <td>${user.last_login || 'Never'}</td>
+                    <td>
+                        <span class="status-badge ${user.is_suspended ? 'suspended' : 'active'}">
+                            ${user.is_suspended ? 'Suspended' : 'Active'}
+                        </span>
+                        ${user.is_club_leader ? 
+                        `<span class="status-badge club-leader">
+                            Club Leader
+                        </span>` : ''}
+                        ${user.is_admin ? 
+                        `<span class="status-badge admin">
+                            Admin
+                        </span>` : ''}
+                        ${user.is_profile_public ? 
+                        `<span class="status-badge public-profile">
+                            Public Profile
+                        </span>` : ''}
+                    </td>
+                    <td class="actions-cell">
+                        <div class="action-dropdown">
+                            <button class="action-dropdown-btn">
+                                <i class="fas fa-ellipsis-v"></i>
+                            </button>
+                            <div class="action-dropdown-content">
+                                <button onclick="viewUserDetails(${user.id})" class="dropdown-item">
+                                    <i class="fas fa-eye"></i>
+                                    <span>View Details</span>
+                                </button>
+                                <button onclick="editUserProfile(${user.id})" class="dropdown-item">
+                                    <i class="fas fa-user-edit"></i>
+                                    <span>Edit Profile</span>
+                                </button>
+                                ${user.is_profile_public ? 
+                                `<a href="/p/${user.username}" target="_blank" class="dropdown-item">
+                                    <i class="fas fa-external-link-alt"></i>
+                                    <span>View Public Profile</span>
+                                </a>` : ''}
+                                ${user.id !== currentUserId ? `
+                                <button onclick="impersonateUser(${user.id}, '${user.username}')" class="dropdown-item">
+                                    <i class="fas fa-user-secret"></i>
+                                    <span>Impersonate User</span>
+                                </button>
+                                <button onclick="toggleSuspension(${user.id}, '${user.username}', ${!user.is_suspended})" class="dropdown-item">
+                                    <i class="fas fa-${user.is_suspended ? 'user-check' : 'user-lock'}"></i>
+                                    <span>${user.is_suspended ? 'Unsuspend' : 'Suspend'}</span>
+                                </button>
+                                <button onclick="toggleClubLeader(${user.id}, '${user.username}', ${user.is_club_leader})" class="dropdown-item">
+                                    <i class="fas fa-user-tag"></i>
+                                    <span>${user.is_club_leader ? 'Remove Club Leader Role' : 'Grant Club Leader Role'}</span>
+                                </button>
+                                <button onclick="toggleAdminStatus(${user.id}, '${user.username}', ${!user.is_admin})" class="dropdown-item">
+                                    <i class="fas fa-${user.is_admin ? 'user-minus' : 'user-shield'}"></i>
+                                    <span>${user.is_admin ? 'Remove Admin' : 'Make Admin'}</span>
+                                </button>
+                                <button onclick="toggleStaffStatus(${user.id}, '${user.username}', ${!user.is_staff})" class="dropdown-item">
+                                    <i class="fas fa-${user.is_staff ? 'user-minus' : 'briefcase'}"></i>
+                                    <span>${user.is_staff ? 'Remove Staff' : 'Make Staff'}</span>
+                                </button>
+                                <button onclick="resetUserPassword(${user.id}, '${user.username}')" class="dropdown-item">
+                                    <i class="fas fa-key"></i>
+                                    <span>Reset Password</span>
+                                </button>
+                                <button onclick="deleteAllSites(${user.id}, '${user.username}')" class="dropdown-item">
+                                    <i class="fas fa-trash-alt"></i>
+                                    <span>Delete All Sites</span>
+                                </button>
+                                <button onclick="deleteUser(${user.id}, '${user.username}')" class="dropdown-item text-danger">
+                                    <i class="fas fa-trash-alt"></i>
+                                    <span>Delete User</span>
+                                </button>
+                                ` : ''}
+                            </div>
+                        </div>
+                    </td>
+                `;
+
+                userTableBody.appendChild(row);
+                row.classList.add('fade-in');
+                setTimeout(() => {
+                    row.classList.remove('fade-in');
+                }, 300);
+            });
+
+            // Initialize action dropdowns for the new search results properly
+            initializeActionDropdowns();
+        })
+        .catch(error => {
+            console.error('Error searching users:', error);
+            showToast('error', 'Failed to search users');
+        });
+}
+
+function filterSites() {
+    const searchTerm = document.getElementById('siteSearch').value.trim();
+
+    if (searchTerm.length < 2) {
+        return; // Require at least 2 characters
+    }
+
+    document.getElementById('siteTableBody').innerHTML = `
+        <tr>
+            <td colspan="7" class="text-center">
+                <div class="loading-spinner"></div>
+                <p>Searching sites...</p>
+            </td>
+        </tr>
+    `;
+
+    // Make API call to search sites
+    fetch(`/api/admin/search/sites?term=${encodeURIComponent(searchTerm)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                showToast('error', data.error);
+                return;
+            }
+
+            const siteTableBody = document.getElementById('siteTableBody');
+            siteTableBody.innerHTML = '';
+
+            if (data.sites.length === 0) {
+                siteTableBody.innerHTML = `
+                    <tr>
+                        <td colspan="7" class="text-center">
+                            <p>No sites found matching "${searchTerm}"</p>
+                        </td>
+                    </tr>
+                `;
+                return;
+            }
+
+            data.sites.forEach(site => {
+                const row = document.createElement('tr');
+
+                row.innerHTML = `
+                    <td>${site.id}</td>
+                    <td>
+                        <div class="site-name">
+                            <span class="site-icon">
+                                <i class="fas fa-${site.site_type === 'web' ? 'globe' : 'code'}"></i>
+                            </span>
+                            ${site.name}
+                        </div>
+                    </td>
+                    <td>${site.username}</td>
+                    <td>
+                        <span class="type-badge ${site.site_type}">
+                            ${site.site_type.charAt(0).toUpperCase() + site.site_type.slice(1)}
+                        </span>
+                    </td>
+                    <td>${site.created_at}</td>
+                    <td>${site.updated_at}</td>
+                    <td class="actions-cell">
+                        <div class="action-dropdown">
+                            <button class="action-dropdown-btn" onclick="toggleActionDropdown(this)">
+                                <i class="fas fa-ellipsis-v"></i>
+                            </button>
+                            <div class="action-dropdown-content">
+                                <a href="/s/${site.slug}" target="_blank" class="dropdown-item">
+                                    <i class="fas fa-eye"></i>
+                                    <span>View Site</span>
+                                </a>
+                                <a href="/edit/${site.id}" class="dropdown-item">
+                                    <i class="fas fa-pencil-alt"></i>
+                                    <span>Edit Site</span>
+                                </a>
+                                <button onclick="deleteSite(${site.id}, '${site.name}')" class="dropdown-item text-danger">
+                                    <i class="fas fa-trash-alt"></i>
+                                    <span>Delete Site</span>
+                                </button>
+                            </div>
+                        </div>
+                    </td>
+                `;
+
+                siteTableBody.appendChild(row);
+                row.classList.add('fade-in');
+                setTimeout(() => {
+                    row.classList.remove('fade-in');
+                }, 300);
+            });
+
+            // Initialize action dropdowns for the new search results
+            initializeActionDropdowns();
+        })
+        .catch(error => {
+            console.error('Error searching sites:', error);
+            showToast('error', 'Failed to search sites');
+        });
+}
+
+function toggleSelectAll() {
+    const selectAll = document.getElementById('selectAll');
+    const checkboxes = document.querySelectorAll('.user-select');
+
+    checkboxes.forEach(checkbox => {
+        checkbox.checked = selectAll.checked;
+    });
+
+    updateBulkActions();
+}
+
+function updateBulkActions() {
+    const selectedUsers = document.querySelectorAll('.user-select:checked');
+    const bulkActions = document.querySelectorAll('.bulk-action');
+
+    bulkActions.forEach(button => {
+        button.disabled = selectedUsers.length === 0;
+    });
+}
+
+// Fetch total counts for dashboard stats
+function fetchTotalCounts() {
+    // Fetch total users count
+    fetch('/api/admin/stats/counts')
+        .then(response => response.json())
+        .then(data => {
+            document.getElementById('totalUsers').textContent = data.totalUsers;
+            document.getElementById('totalSites').textContent = data.totalSites;
+        })
+        .catch(error => {
+            console.error('Error fetching total counts:', error);
+            document.getElementById('totalUsers').textContent = 'Error';
+            document.getElementById('totalSites').textContent = 'Error';
+        });
+}
+
+// Call this when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    fetchTotalCounts();
+});
+
+function emailAllUsers() {
+    const rows = document.getElementById('userTableBody').getElementsByTagName('tr');
+    const emails = [];
+
+    for (let row of rows) {
+        const emailCell = row.cells[3]; 
+        if (emailCell) {
+            emails.push(emailCell.textContent.trim());
+        }
+    }
+
+    if (emails.length > 0) {
+        showToast('info', `Preparing email to ${emails.length} users`);
+        window.location.href = `mailto:${emails.join(',')}`;
+    } else {
+        showToast('error', 'No email addresses found');
+    }
+}
+
+async function toggleSuspension(userId, username, suspend) {
+    if (!confirm(`Are you sure you want to ${suspend ? 'suspend' : 'unsuspend'} user "${username}"?`)) return;
+
+    try {
+        showToast('info', `Processing ${suspend ? 'suspension' : 'unsuspension'}...`);
+
+        const response = await fetch(`/api/admin/users/${userId}/suspend`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ suspend })
+        });
+
+        if (response.ok) {
+            showToast('success', `User ${suspend ? 'suspended' : 'unsuspended'} successfully`);
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            const data = await response.json();
+            showToast('error', data.message || 'Failed to update user suspension status');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to update user suspension status');
+    }
+}
+
+async function toggleClubLeader(userId, username, isClubLeader) {
+    // Toggle based on current status - if currently a leader, remove; if not a leader, make one
+    const makeLeader = !isClubLeader;
+    if (!confirm(`Are you sure you want to ${makeLeader ? 'make' : 'remove'} "${username}" ${makeLeader ? 'as a' : 'from being a'} club leader?`)) return;
+
+    try {
+        showToast('info', `${makeLeader ? 'Adding' : 'Removing'} club leader status...`);
+
+        const response = await fetch(`/api/admin/users/${userId}/club-leader`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ is_club_leader: makeLeader })
+        });
+
+        if (response.ok) {
+            showToast('success', `User ${makeLeader ? 'is now' : 'is no longer'} a club leader`);
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            const data = await response.json();
+            showToast('error', data.message || 'Failed to update club leader status');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to update club leader status');
+    }
+}
+
+async function deleteAllSites(userId, username) {
+    if (!confirm(`Are you sure you want to delete ALL sites for user "${username}"? This action cannot be undone.`)) return;
+
+    try {
+        showToast('info', 'Deleting sites...');
+
+        const response = await fetch(`/api/admin/users/${userId}/sites`, {
+            method: 'DELETE'
+        });
+
+        if (response.ok) {
+            showToast('success', `All sites for user "${username}" deleted successfully`);
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            const data = await response.json();
+            showToast('error', data.message || 'Failed to delete user sites');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to delete user sites');
+    }
+}
+
+async function deleteUser(userId, username) {
+    if (!confirm(`Are you sure you want to delete user "${username}"? This action cannot be undone.`)) return;
+
+    try {
+        showToast('info', 'Deleting user...');
+
+        const response = await fetch(`/api/admin/users/${userId}`, {
+            method: 'DELETE'
+        });
+
+        if (response.ok) {
+            showToast('success', `User "${username}" deleted successfully`);
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            const data = await response.json();
+            showToast('error', data.message || 'Failed to delete user');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to delete user');
+    }
+}
+
+async function deleteSite(siteId, siteName) {
+    if (!confirm(`Are you sure you want to delete site "${siteName}"? This action cannot be undone.`)) return;
+
+    try {
+        showToast('info', 'Deleting site...');
+
+        const response = await fetch(`/api/admin/sites/${siteId}`, {
+            method: 'DELETE'
+        });
+
+        if (response.ok) {
+            showToast('success', `Site "${siteName}" deleted successfully`);
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            const data = await response.json();
+            showToast('error', data.message || 'Failed to delete site');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to delete site');
+    }
+}
+
+async function handleBulkAction(action) {
+    const selectedUsers = Array.from(document.querySelectorAll('.user-select:checked')).map(checkbox => ({
+        id: checkbox.dataset.userid,
+        username: checkbox.dataset.username
+    }));
+
+    if (!selectedUsers.length) return;
+
+    const actionMessages = {
+        suspend: 'suspend',
+        unsuspend: 'unsuspend',
+        deleteSites: 'delete all sites for',
+        deleteUsers: 'delete'
+    };
+
+    const usernames = selectedUsers.map(user => user.username).join(', ');
+    if (!confirm(`Are you sure you want to ${actionMessages[action]} the following users: ${usernames}?`)) return;
+
+    showToast('info', `Processing bulk action: ${action}...`);
+
+    try {
+        for (const user of selectedUsers) {
+            let endpoint;
+            let method = 'POST';
+
+            switch(action) {
+                case 'suspend':
+                    endpoint = `/api/admin/users/${user.id}/suspend`;
+                    break;
+                case 'unsuspend':
+                    endpoint = `/api/admin/users/${user.id}/suspend`;
+                    break;
+                case 'deleteSites':
+                    endpoint = `/api/admin/users/${user.id}/sites`;
+                    method = 'DELETE';
+                    break;
+                case 'deleteUsers':
+                    endpoint = `/api/admin/users/${user.id}`;
+                    method = 'DELETE';
+                    break;
+            }
+
+            const response = await fetch(endpoint, {
+                method,
+                headers: { 'Content-Type': 'application/json' },
+                body: action === 'suspend' ? JSON.stringify({ suspend: true }) :
+                      action === 'unsuspend' ? JSON.stringify({ suspend: false }) :
+                      null
+            });
+
+            if (!response.ok) throw new Error(`Failed to ${action} user ${user.username}`);
+        }
+
+        showToast('success', `Successfully performed ${action} on selected users`);
+        setTimeout(() => location.reload(), 1000);
+    } catch (error) {
+        showToast('error', error.message);
+    }
+}
+
+async function loadAdminList() {
+    try {
+        const response = await fetch('/api/admin/admins');
+        if (response.ok) {
+            const data = await response.json();
+            const adminList = document.getElementById('adminList');
+            adminList.innerHTML = '';
+
+            const adminCount = document.getElementById('adminCount');
+            if (adminCount) {
+                adminCount.textContent = data.admins.length;
+            }
+
+            data.admins.forEach(admin => {
+                const li = document.createElement('li');
+                li.className = 'admin-item';
+
+                const adminName = document.createElement('span');
+                adminName.textContent = admin;
+                adminName.className = 'admin-name';
+
+                const adminEmail = document.createElement('span');
+                adminEmail.textContent = '';
+                adminEmail.className = 'admin-email';
+
+                const adminInfo = document.createElement('div');
+                adminInfo.className = 'admin-info';
+                adminInfo.appendChild(adminName);
+                adminInfo.appendChild(adminEmail);
+
+                const removeButton = document.createElement('button');
+                removeButton.innerHTML = '<i class="fas fa-trash-alt"></i>';
+                removeButton.className = 'btn-icon remove-admin';
+                removeButton.onclick = () => removeAdmin(admin);
+
+                if (admin === adminPanel.currentUsername) {
+                    removeButton.disabled = true;
+                    removeButton.title = 'Cannot remove yourself';
+                }
+
+                li.appendChild(adminInfo);
+                li.appendChild(removeButton);
+
+                li.classList.add('fade-in');
+                setTimeout(() => {
+                    li.classList.remove('fade-in');
+                }, 300);
+
+                adminList.appendChild(li);
+            });
+        } else {
+            showToast('error', 'Failed to load admin list');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to load admin list');
+    }
+}
+
+async function addAdmin() {
+    const username = document.getElementById('newAdminUsername').value.trim();
+    if (!username) {
+        showToast('error', 'Please enter a username');
+        return;
+    }
+
+    try {
+        showToast('info', 'Adding administrator...');
+
+        const response = await fetch('/api/admin/admins/add', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ username })
+        });
+
+        const data = await response.json();
+        if (response.ok) {
+            showToast('success', data.message);
+            document.getElementById('newAdminUsername').value = '';
+            loadAdminList();
+        } else {
+            showToast('error', data.error || 'Failed to add admin');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to add admin');
+    }
+}
+
+async function removeAdmin(username) {
+    if (!confirm(`Are you sure you want to remove ${username} as an administrator?`)) {
+        return;
+    }
+
+    try {
+        showToast('info', 'Removing administrator...');
+
+        const response = await fetch('/api/admin/admins/remove', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ username })
+        });
+
+        const data = await response.json();
+        if (response.ok) {
+            showToast('success', data.message);
+            loadAdminList();
+        } else {
+            showToast('error', data.error || 'Failed to remove admin');
+        }
+    } catch (error) {
+        showToast('error', 'Failed to remove admin');
+    }
+}
+
+function viewUserDetails(userId) {
+    const modal = document.getElementById('userDetailModal');
+    const userDetailContent = document.getElementById('userDetailContent');
+    const editUserForm = document.getElementById('editUserForm');
+
+    if (!modal || !userDetailContent) {
+        showToast('error', 'Could not find modal elements');
+        return;
+    }
+
+    userDetailContent.innerHTML = `
+        <div class="user-detail-loading">
+            <div class="loading-spinner"></div>
+            <p>Loading user details...</p>
+        </div>
+    `;
+
+    // Explicitly set display style to make modal visible
+    modal.style.display = 'flex';
+    modal.style.opacity = '1';
+    modal.style.visibility = 'visible';
+    document.body.style.overflow = 'hidden';
+
+    fetchUserDetails(userId, userDetailContent, editUserForm);
+}
+
+async function fetchUserDetails(userId, userDetailContent, editUserForm) {
+    try {
+        const response = await fetch(`/api/users/${userId}`);
+        if (!response.ok) {
+            throw new Error('Failed to fetch user data');
+        }
+
+        const userData = await response.json();
+
+        if (userData) {
+            // Load and display user avatar
+            const avatarPreview = document.getElementById('userAvatarPreview');
+            if (avatarPreview) {
+                if (userData.avatar_url) {
+                    avatarPreview.src = userData.avatar_url;
+                } else {
+                    avatarPreview.innerHTML = '<i class="fas fa-user-circle"></i>';
+                }
+            }
+
+            userDetailContent.innerHTML = `
+                <h3>${userData.username}</h3>
+                <div class="user-meta">
+                    <p><i class="fas fa-envelope"></i> ${userData.email}</p>
+                    <p><i class="fas fa-calendar-alt"></i> Joined: ${new Date(userData.created_at).toLocaleDateString()}</p>
+                    <p><i class="fas fa-clock"></i> Last active: ${userData.last_login ? new Date(userData.last_login).toLocaleDateString() : 'Never'}</p>
+                    <p><i class="fas fa-globe"></i> Status: ${userData.is_suspended ? '<span class="badge badge-danger">Suspended</span>' : '<span class="badge badge-success">Active</span>'}</p>
+                </div>
+
+                <div class="user-stats">
+                    <div class="stat-item">
+                        <span class="stat-value">${userData.site_count || 0}</span>
+                        <span class="stat-label">Sites</span>
+                    </div>
+                    <div class="stat-item">
+                        <span class="stat-value">${userData.deploy_count || 0}</span>
+                        <span class="stat-label">Deploys</span>
+                    </div>
+                </div>
+
+                <div class="user-actions">
+                    <button onclick="editUserProfile(${userData.id})" class="btn-primary">
+                        <i class="fas fa-user-edit"></i> Edit Profile
+                    </button>
+                    ${userData.is_profile_public ? 
+                    `<a href="/p/${userData.username}" target="_blank" class="btn-secondary">
+                        <i class="fas fa-external-link-alt"></i> View Public Profile
+                    </a>` : ''}
+                </div>
+            `;
+
+            // Prepopulate edit form for convenience
+            if (editUserForm) {
+                const editUserIdField = editUserForm.querySelector('#editUserId');
+                const editUsernameField = editUserForm.querySelector('#editUsername');
+                const editEmailField = editUserForm.querySelector('#editEmail');
+
+                if (editUserIdField) editUserIdField.value = userData.id;
+                if (editUsernameField) editUsernameField.value = userData.username;
+                if (editEmailField) editEmailField.value = userData.email;
+            }
+        } else {
+            userDetailContent.innerHTML = `
+                <div class="error-message">
+                    <i class="fas fa-exclamation-triangle"></i>
+                    <p>User not found</p>
+                </div>
+            `;
+        }
+    } catch (error) {
+        console.error('Error fetching user details:', error);
+        userDetailContent.innerHTML = `
+            <div class="error-message">
+                <i class="fas fa-exclamation-triangle"></i>
+                <p>Error loading user details: ${error.message}</p>
+            </div>
+        `;
+    }
+}
+
+function closeUserDetailModal() {
+    const modal = document.getElementById('userDetailModal');
+    modal.style.opacity = '0';
+    modal.style.visibility = 'hidden';
+    setTimeout(() => {
+        modal.style.display = 'none';
+        document.body.style.overflow = '';
+    }, 300);
+}
+
+function closeUserProfileModal() {
+    const modal = document.getElementById('userProfileModal');
+    modal.style.opacity = '0';
+    modal.style.visibility = 'hidden';
+    setTimeout(() => {
+        modal.style.display = 'none';
+        document.body.style.overflow = '';
+    }, 300);
+}
+
+function saveUserChanges() {
+    const userId = document.getElementById('editUserId').value;
+    const username = document.getElementById('editUsername').value;
+    const email = document.getElementById('editEmail').value;
+    const password = document.getElementById('resetPassword').value;
+    const isPublicProfile = document.getElementById('editIsPublicProfile').checked;
+
+    if (!userId) {
+        showToast('error', 'User ID is missing');
+        return;
+    }
+
+    const userData = {
+        username: username,
+        email: email,
+        is_profile_public: isPublicProfile
+    };
+
+    if (password) {
+        userData.password = password;
+    }
+
+    fetch(`/api/admin/users/${userId}`, {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(userData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', 'User information updated successfully');
+            closeUserDetailModal();
+
+            // Refresh the page after a short delay
+            setTimeout(() => {
+                location.reload();
+            }, 1500);
+        } else {
+            showToast('error', data.message || 'Failed to update user information');
+        }
+    })
+    .catch(error => {
+        console.error('Error updating user:', error);
+        showToast('error', 'An error occurred while updating user information');
+    });
+}
+
+// Function to toggle action dropdown visibility
+function toggleActionDropdown(button) {
+    // Safety check for the button
+    if (!button) {
+        console.error("Toggle action dropdown called with null button");
+        return;
+    }
+
+    // Close all other open dropdowns first
+    const allDropdowns = document.querySelectorAll('.action-dropdown-content');
+    allDropdowns.forEach(dropdown => {
+        if (dropdown !== button.nextElementSibling) {
+            dropdown.classList.remove('show');
+        }
+    });
+
+    // Toggle the clicked dropdown
+    const dropdownContent = button.nextElementSibling;
+
+    // Safety check for dropdown content
+    if (!dropdownContent) {
+        console.error("Dropdown content not found for button", button);
+        return;
+    }
+
+    // Toggle show class
+    if (dropdownContent.classList.contains('show')) {
+        dropdownContent.classList.remove('show');
+
+        // If the dropdown is currently a child of the body, move it back
+        if (dropdownContent.parentElement === document.body) {
+            const parentButton = document.getElementById(dropdownContent.dataset.parentButton);
+            if (parentButton) {
+                parentButton.after(dropdownContent);
+            }
+        }
+    } else {
+        dropdownContent.classList.add('show');
+
+        // Save original position before moving
+        if (dropdownContent.parentElement !== document.body) {
+            // Make the dropdown position fixed and visible outside of container
+            dropdownContent.style.position = 'fixed';
+
+            // Store reference to the button for later restoration
+            dropdownContent.dataset.parentButton = button.id || Math.random().toString(36).substring(2);
+            if (!button.id) button.id = dropdownContent.dataset.parentButton;
+
+            // Temporarily store the dropdown in the body to break out of any overflow constraints
+            document.body.appendChild(dropdownContent);
+
+            // Position the dropdown
+            const buttonRect = button.getBoundingClientRect();
+
+            // Calculate the available space
+            const spaceBelow = window.innerHeight - buttonRect.bottom;
+            const spaceAbove = buttonRect.top;
+
+            // Position the dropdown
+            if (spaceBelow >= 200 || spaceBelow > spaceAbove) {
+                // Position below
+                dropdownContent.style.top = `${buttonRect.bottom}px`;
+                dropdownContent.style.bottom = 'auto';
+            } else {
+                // Position above
+                dropdownContent.style.bottom = `${window.innerHeight - buttonRect.top}px`;
+                dropdownContent.style.top = 'auto';
+            }
+
+            dropdownContent.style.left = `${buttonRect.left}px`;
+
+            // Make sure it's not positioned outside the viewport on the right
+            setTimeout(() => {
+                const dropdownRect = dropdownContent.getBoundingClientRect();
+                if (dropdownRect.right > window.innerWidth) {
+                    dropdownContent.style.left = `${buttonRect.right - dropdownRect.width}px`;
+                }
+            }, 0);
+
+            // Stop event propagation to prevent immediate closing
+            dropdownContent.addEventListener('click', function(e) {
+                e.stopPropagation();
+            });
+
+            // Add click outside to close
+            setTimeout(() => {
+                function closeDropdown(e) {
+                    // Don't close if clicking the button or inside the dropdown
+                    if (button.contains(e.target) || dropdownContent.contains(e.target)) {
+                        return;
+                    }
+
+                    dropdownContent.classList.remove('show');
+
+                    // Return the dropdown to its original position in the DOM
+                    const parentButton = document.getElementById(dropdownContent.dataset.parentButton);
+                    if (parentButton) {
+                        parentButton.after(dropdownContent);
+                    }
+
+                    document.removeEventListener('click', closeDropdown);
+                }
+
+                document.addEventListener('click', closeDropdown);
+            }, 50);
+        }
+    }
+}
+
+function initializeActionDropdowns() {
+    // Add event listeners to all dropdown buttons
+    document.querySelectorAll('.action-dropdown-btn').forEach(button => {
+        // Remove existing event listeners by cloning and replacing
+        const newButton = button.cloneNode(true);
+        button.parentNode.replaceChild(newButton, button);
+
+        // Add the event listener
+        newButton.addEventListener('click', function(e) {
+            e.preventDefault();
+            e.stopPropagation();
+            toggleActionDropdown(this);
+        });
+
+        // Ensure the dropdown can appear outside the table container
+        const dropdownContent = newButton.nextElementSibling;
+        if (dropdownContent && dropdownContent.classList.contains('action-dropdown-content')) {
+            dropdownContent.style.position = 'absolute';
+            dropdownContent.style.zIndex = '1000';
+
+            // Prevent dropdown item clicks from closing immediately
+            dropdownContent.querySelectorAll('.dropdown-item').forEach(item => {
+                item.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                });
+            });
+        }
+    });
+
+    // Ensure dropdowns are properly positioned
+    window.addEventListener('resize', function() {
+        const visibleDropdown = document.querySelector('.action-dropdown-content.show');
+        if (visibleDropdown) {
+            const parentButton = document.getElementById(visibleDropdown.dataset.parentButton);
+            if (parentButton) {
+                toggleActionDropdown(parentButton); // Close
+                toggleActionDropdown(parentButton); // Reopen with proper positioning
+            } else {
+                visibleDropdown.classList.remove('show'); // Just close if we can't find the button
+            }
+        }
+    });
+}
+
+// Call this function when the DOM is loaded
+document.addEventListener('DOMContentLoaded', function() {
+    initializeActionDropdowns();
+});
+
+// Create a custom modal for context menu actions
+function openActionModal(userId, username) {
+    // Close any open dropdowns
+    const allDropdowns = document.querySelectorAll('.action-dropdown-content');
+    allDropdowns.forEach(dropdown => {
+        dropdown.classList.remove('show');
+    });
+
+    // Get user data
+    fetch(`/api/users/${userId}`)
+        .then(response => response.json())
+        .then(userData => {
+            // Create modal HTML
+            const modalHTML = `
+                <div id="actionModal" class="modal">
+                    <div class="modal-content">
+                        <div class="modal-header">
+                            <h2><i class="fas fa-user-cog"></i> ${username} - Actions</h2>
+                            <button class="close-btn" onclick="document.getElementById('actionModal').remove()">&times;</button>
+                        </div>
+                        <div class="modal-body">
+                            <div class="action-grid">
+                                <button onclick="viewUserDetails(${userId}); document.getElementById('actionModal').remove();" class="action-btn">
+                                    <i class="fas fa-eye"></i>
+                                    <span>View Details</span>
+                                </button>
+                                <button onclick="editUserProfile(${userId}); document.getElementById('actionModal').remove();" class="action-btn">
+                                    <i class="fas fa-user-edit"></i>
+                                    <span>Edit Profile</span>
+                                </button>
+                                ${userData.is_profile_public ? 
+                                `<a href="/p/${username}" target="_blank" class="action-btn">
+                                    <i class="fas fa-external-link-alt"></i>
+                                    <span>View Public Profile</span>
+                                </a>` : 
+                                `<button class="action-btn disabled">
+                                    <i class="fas fa-external-link-alt"></i>
+                                    <span>Profile Not Public</span>
+                                </button>`}
+                                ${userId !== parseInt(currentUserId) ? 
+                                `<button onclick="impersonateUser(${userId}, '${username}'); document.getElementById('actionModal').remove();" class="action-btn">
+                                    <i class="fas fa-user-secret"></i>
+                                    <span>Impersonate User</span>
+                                </button>
+                                <button onclick="toggleSuspension(${userId}, '${username}', ${!userData.is_suspended}); document.getElementById('actionModal').remove();" class="action-btn ${userData.is_suspended ? 'success-action' : 'danger-action'}">
+                                    <i class="fas fa-${userData.is_suspended ? 'user-check' : 'user-lock'}"></i>
+                                    <span>${userData.is_suspended ? 'Unsuspend' : 'Suspend'}</span>
+                                </button>` : ''}
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            `;
+
+            // Add modal to body
+            const modalContainer = document.createElement('div');
+            modalContainer.innerHTML = modalHTML;
+            document.body.appendChild(modalContainer.firstElementChild);
+
+            // Show modal
+            document.getElementById('actionModal').style.display = 'flex';
+        })
+        .catch(error => {
+            console.error('Error fetching user data:', error);
+            showToast('error', 'Failed to load user data');
+        });
+}
+
+function closeResetPasswordModal() {
+    document.getElementById('resetPasswordModal').style.display = 'none';
+}
+
+function refreshData() {
+    showToast('info', 'Refreshing data...');
+    fetchUsersStats();
+    setTimeout(() => {
+        location.reload();
+    }, 1000);
+}
+
+async function fetchUsersStats() {
+    try {
+        const response = await fetch('/api/admin/users-stats');
+        if (response.ok) {
+            const data = await response.json();
+            document.getElementById('newUsersCount').textContent = data.newUsers;
+            document.getElementById('activeUsers').textContent = data.activeUsers;
+            document.getElementById('suspendedUsers').textContent = data.suspendedUsers;
+        }
+    } catch (error) {
+        console.error('Error fetching user stats:', error);
+    }
+}
+
+function togglePasswordVisibility(inputId) {
+    const input = document.getElementById(inputId);
+    const icon = input.nextElementSibling.querySelector('i');
+
+    if (input.type === 'password') {
+        input.type = 'text';
+        icon.classList.remove('fa-eye');
+        icon.classList.add('fa-eye-slash');
+    } else {
+        input.type = 'password';
+        icon.classList.remove('fa-eye-slash');
+        icon.classList.add('fa-eye');
+    }
+}
+
+function editUserProfile(userId) {
+    // Find necessary elements
+    const profileForm = document.getElementById('profileEditForm');
+    const socialLinksContainer = document.getElementById('socialLinksContainer');
+    const userProfileModal = document.getElementById('userProfileModal');
+
+    if (!profileForm || !socialLinksContainer || !userProfileModal) {
+        showToast('error', 'Could not find necessary elements for profile editing');
+        return;
+    }
+
+    // Reset form
+    profileForm.reset();
+    socialLinksContainer.innerHTML = '';
+
+    const profileUserIdField = document.getElementById('profileUserId');
+    if (profileUserIdField) {
+        profileUserIdField.value = userId;
+    }
+
+    // Show modal with explicit visibility settings
+    userProfileModal.style.display = 'flex';
+    userProfileModal.style.opacity = '1';
+    userProfileModal.style.visibility = 'visible';
+    document.body.style.overflow = 'hidden';
+
+    // Fetch user details
+    fetch(`/api/users/${userId}/profile`)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Failed to fetch user profile');
+            }
+            return response.json();
+        })
+        .then(data => {
+            console.log("Loaded profile data:", data);
+            // Fill form with user data
+            const fields = {
+                'profileUsername': data.username,
+                'profileEmail': data.email,
+                'profileBio': data.bio || '',
+                'profileAvatar': data.avatar_url || '',
+                'profileBanner': data.banner_url || ''
+            };
+
+            // Safely update each field
+            Object.keys(fields).forEach(fieldId => {
+                const field = document.getElementById(fieldId);
+                if (field) {
+                    field.value = fields[fieldId];
+                }
+            });
+
+            // Handle checkbox separately
+            const isPublicCheckbox = document.getElementById('profileIsPublic');
+            if (isPublicCheckbox) {
+                isPublicCheckbox.checked = data.is_profile_public;
+            }
+
+            // Update preview - safely
+            updateProfilePreview();
+
+            // Add social links
+            if (data.social_links && Array.isArray(data.social_links) && data.social_links.length > 0) {
+                socialLinksContainer.innerHTML = '';
+                data.social_links.forEach(link => {
+                    if (typeof addSocialLinkWithData === 'function') {
+                        addSocialLinkWithData(link.platform, link.url);
+                    } else if (typeof addSocialLink === 'function') {
+                        addSocialLink();
+                        // Try to populate the last added link
+                        const lastLink = socialLinksContainer.lastElementChild;
+                        if (lastLink) {
+                            const platformSelect = lastLink.querySelector('.social-platform');
+                            const urlInput = lastLink.querySelector('.social-url');
+                            if (platformSelect) platformSelect.value = link.platform;
+                            if (urlInput) urlInput.value = link.url;
+                        }
+                    }
+                });
+            }
+
+            // If no social links were added, add an empty one
+            if (socialLinksContainer.children.length === 0 && typeof addSocialLink === 'function') {
+                addSocialLink();
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching user profile:', error);
+            showToast('error', 'Failed to load user profile: ' + error.message);
+        });
+}
+
+function updateProfilePreview() {
+    const username = document.getElementById('profileUsername').value;
+    const bio = document.getElementById('profileBio').value;
+    const avatar = document.getElementById('profileAvatar').value;
+    const banner = document.getElementById('profileBanner').value;
+
+    document.getElementById('previewUsername').textContent = username;
+    document.getElementById('previewBio').textContent = bio || 'No bio provided';
+
+    const previewAvatar = document.getElementById('previewAvatar');
+    if (avatar) {
+        previewAvatar.innerHTML = `<img src="${avatar}" alt="${username}" onerror="this.onerror=null; this.parentNode.innerHTML = '<i class=\\'fas fa-user\\'></i>'">`;
+    } else {
+        previewAvatar.innerHTML = '<i class="fas fa-user"></i>';
+    }
+
+    const previewBanner = document.getElementById('previewBanner');
+    if (banner) {
+        previewBanner.style.backgroundImage = `url(${banner})`;
+    } else {
+        previewBanner.style.backgroundImage = '';
+    }
+}
+
+function addSocialLink() {
+    const container = document.getElementById('socialLinksContainer');
+    const socialLinkItem = document.createElement('div');
+    socialLinkItem.className = 'social-link-item';
+    socialLinkItem.innerHTML = `
+        <select class="social-platform settings-input">
+            <option value="github">GitHub</option>
+            <option value="twitter">Twitter</option>
+            <option value="linkedin">LinkedIn</option>
+            <option value="website">Website</option>
+            <option value="instagram">Instagram</option>
+            <option value="youtube">YouTube</option>
+        </select>
+        <input type="url" class="social-url settings-input" placeholder="https://...">
+        <button type="button" class="btn-icon remove-social" onclick="removeSocialLink(this)">
+            <i class="fas fa-times"></i>
+        </button>
+    `;
+    container.appendChild(socialLinkItem);
+}
+
+function addSocialLinkWithValues(platform, url) {
+    const container = document.getElementById('socialLinksContainer');
+    const socialLinkItem = document.createElement('div');
+    socialLinkItem.className = 'social-link-item';
+    socialLinkItem.innerHTML = `
+        <select class="social-platform settings-input">
+            <option value="github">GitHub</option>
+            <option value="twitter">Twitter</option>
+            <option value="linkedin">LinkedIn</option>
+            <option value="website">Website</option>
+            <option value="instagram">Instagram</option>
+            <option value="youtube">YouTube</option>
+        </select>
+        <input type="url" class="social-url settings-input" placeholder="https://..." value="${url}">
+        <button type="button" class="btn-icon remove-social" onclick="removeSocialLink(this)">
+            <i class="fas fa-times"></i>
+        </button>
+    `;
+    container.appendChild(socialLinkItem);
+
+    // Set the selected platform
+    const select = socialLinkItem.querySelector('.social-platform');
+    select.value = platform;
+}
+
+// Add the missing function
+function addSocialLinkWithData(platform, url) {
+    addSocialLinkWithValues(platform, url);
+}
+
+function removeSocialLink(button) {
+    const container = document.getElementById('socialLinksContainer');
+    const item = button.closest('.social-link-item');
+    container.removeChild(item);
+}
+
+function saveUserProfile() {
+    const userId = document.getElementById('profileUserId').value;
+    const bio = document.getElementById('profileBio').value;
+    const avatar = document.getElementById('profileAvatar').value;
+    const banner = document.getElementById('profileBanner').value;
+    const isPublic = document.getElementById('profileIsPublic').checked;
+
+    // Gather social links
+    const socialLinks = {};
+    const socialItems = document.querySelectorAll('.social-link-item');
+    socialItems.forEach(item => {
+        const platform = item.querySelector('.social-platform').value;
+        const url = item.querySelector('.social-url').value;
+        if (url.trim()) {
+            socialLinks[platform] = url;
+        }
+    });
+
+    // Prepare data
+    const formData = {
+        bio: bio,
+        avatar: avatar,
+        profile_banner: banner,
+        is_profile_public: isPublic,
+        social_links: socialLinks
+    };
+
+    // Send to server
+    fetch(`/api/admin/users/${userId}/profile`, {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(formData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', 'Profile updated successfully');
+            closeUserProfileModal();
+
+            // Update user list if possible
+            const userRows = document.querySelectorAll(`#userTableBody tr`);
+            for (const row of userRows) {
+                const rowUserId = row.querySelector('.user-select')?.dataset?.userid;
+                if (rowUserId === userId) {
+                    // Update avatar in table
+                    const avatarContainer = row.querySelector('.user-avatar-small');
+                    if (avatarContainer) {
+                        if (avatar) {
+                            avatarContainer.innerHTML = `<img src="${avatar}" alt="User avatar" onerror="this.onerror=null; this.parentNode.innerHTML = '<i class=\\'fas fa-user\\'></i>'">`;
+                        } else {
+                            avatarContainer.innerHTML = '<i class="fas fa-user"></i>';
+                        }
+                    }
+
+                    // Update public profile badge
+                    const badges = row.querySelector('td:nth-child(7)');
+                    if (badges) {
+                        const publicBadge = Array.from(badges.querySelectorAll('.status-badge')).find(b => b.classList.contains('public-profile'));
+                        if (isPublic && !publicBadge) {
+                            badges.innerHTML += `<span class="status-badge public-profile">Public Profile</span>`;
+                        } else if (!isPublic && publicBadge) {
+                            publicBadge.remove();
+                        }
+                    }
+                    break;
+                }
+            }
+        } else {
+            showToast('error', data.message || 'Failed to update profile');
+        }
+    })
+    .catch(error => {
+        console.error('Error updating profile:', error);
+        showToast('error', 'An error occurred while updating the profile');
+    });
+}
+
+// Listen for changes to preview fields
+document.addEventListener('DOMContentLoaded', function() {
+    const previewFields = ['profileUsername', 'profileBio', 'profileAvatar', 'profileBanner'];
+    previewFields.forEach(field => {
+        const element = document.getElementById(field);
+        if (element) {
+            element.addEventListener('input', updateProfilePreview);
+        }
+    });
+
+    // Setup password strength meter
+    if (document.getElementById('newPasswordInput')) {
+        document.getElementById('newPasswordInput').addEventListener('input', checkPasswordStrength);
+    }
+
+    // Fetch initial user stats
+    fetchUsersStats();
+});
+
+function checkPasswordStrength() {
+    const password = document.getElementById('newPasswordInput').value;
+    const indicator = document.getElementById('passwordStrength');
+    const text = document.getElementById('strengthText');
+
+    if (!password) {
+        indicator.style.width = '0';
+        indicator.style.backgroundColor = '#e0e0e0';
+        text.textContent = 'Password strength';
+        text.style.color = 'var(--text-secondary)';
+        return;
+    }
+
+    // Check strength
+    let strength = 0;
+    if (password.length >= 8) strength += 25;
+    if (password.match(/[a-z]+/)) strength += 25;
+    if (password.match(/[A-Z]+/)) strength += 25;
+    if (password.match(/[0-9]+/)) strength += 25;
+    if (password.match(/[^a-zA-Z0-9]+/)) strength += 25;
+
+    // Cap at 100
+    strength = Math.min(strength, 100);
+
+    // Update UI
+    indicator.style.width = strength + '%';
+
+    if (strength < 30) {
+        indicator.style.backgroundColor = '#f44336';
+        text.textContent = 'Weak';
+        text.style.color = '#f44336';
+    } else if (strength < 60) {
+        indicator.style.backgroundColor = '#ff9800';
+        text.textContent = 'Moderate';
+        text.style.color = '#ff9800';
+    } else if (strength < 80) {
+        indicator.style.backgroundColor = '#4caf50';
+        text.textContent = 'Strong';
+        text.style.color = '#4caf50';
+    } else {
+        indicator.style.backgroundColor = '#2e7d32';
+        text.textContent = 'Very Strong';
+        text.style.color = '#2e7d32';
+    }
+
+    // Check if passwords match
+    const confirmPassword = document.getElementById('confirmPasswordInput').value;
+    if (confirmPassword && password !== confirmPassword) {
+        text.textContent += ' - Passwords do not match';
+        text.style.color = '#f44336';
+        document.getElementById('confirmResetBtn').disabled = true;
+    } else if (confirmPassword) {
+        text.textContent += ' - Passwords match';
+        document.getElementById('confirmResetBtn').disabled = false;
+    }
+}
+
+function resetUserPassword(userId, username) {
+    document.getElementById('resetPasswordUsername').textContent = username;
+    document.getElementById('newPasswordInput').value = '';
+    document.getElementById('confirmPasswordInput').value = '';
+    document.getElementById('passwordStrength').style.width = '0';
+    document.getElementById('strengthText').textContent = 'Password strength';
+    document.getElementById('confirmResetBtn').setAttribute('data-userid', userId);
+
+    document.getElementById('resetPasswordModal').style.display = 'flex';
+}
+
+function confirmPasswordReset() {
+    const userId = document.getElementById('confirmResetBtn').getAttribute('data-userid');
+    const newPassword = document.getElementById('newPasswordInput').value;
+    const confirmPassword = document.getElementById('confirmPasswordInput').value;
+
+    if (!newPassword) {
+        showToast('error', 'Password cannot be empty');
+        return;
+    }
+
+    if (newPassword !== confirmPassword) {
+        showToast('error', 'Passwords do not match');
+        return;
+    }
+
+    fetch(`/api/admin/users/${userId}/reset-password`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ password: newPassword })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', 'Password reset successfully');
+            closeResetPasswordModal();
+        } else {
+            showToast('error', data.message || 'Failed to reset password');
+        }
+    })
+    .catch(error => {
+        console.error('Error resetting password:', error);
+        showToast('error', 'An error occurred while resetting the password');
+    });
+}
+
+function toggleAdminStatus(userId, username, makeAdmin) {
+    if (!confirm(`Are you sure you want to ${makeAdmin ? 'make' : 'remove'} ${username} ${makeAdmin ? 'an admin' : 'from admin role'}?`)) {
+        return;
+    }
+
+    fetch(`/api/admin/users/${userId}/admin-status`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ is_admin: makeAdmin })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', `User ${makeAdmin ? 'is now an admin' : 'is no longer an admin'}`);
+
+            // Update UI
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            showToast('error', data.message || 'Failed to update admin status');
+        }
+    })
+    .catch(error => {
+        console.error('Error updating admin status:', error);
+        showToast('error', 'An error occurred while updating admin status');
+    });
+}
+
+function toggleStaffStatus(userId, username, makeStaff) {
+    if (!confirm(`Are you sure you want to ${makeStaff ? 'make' : 'remove'} ${username} ${makeStaff ? 'a staff member' : 'from staff role'}?`)) {
+        return;
+    }
+
+    fetch(`/api/admin/users/${userId}/staff-status`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ is_staff: makeStaff })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', `User ${makeStaff ? 'is now a staff member' : 'is no longer a staff member'}`);
+
+            // Update UI
+            setTimeout(() => {
+                location.reload();
+            }, 1000);
+        } else {
+            showToast('error', data.message || 'Failed to update staff status');
+        }
+    })
+    .catch(error => {
+        console.error('Error updating staff status:', error);
+        showToast('error', 'An error occurred while updating staff status');
+    });
+}
+
+function impersonateUser(userId, username) {
+    if (!confirm(`Are you sure you want to impersonate ${username}? You will be logged in as this user.`)) {
+        return;
+    }
+
+    fetch(`/api/admin/impersonate/${userId}`, {
+        method: 'POST'
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast('success', `Now impersonating ${username}. Redirecting...`);
+            setTimeout(() => {
+                window.location.href = data.redirect || '/welcome';
+            }, 1500);
+        } else {
+            showToast('error', data.message || 'Failed to impersonate user');
+        }
+    })
+    .catch(error => {
+        console.error('Error impersonating user:', error);
+        showToast('error', 'An error occurred while impersonating the user');
+    });
+}
+
+function exportUserData() {
+    const selectedUsers = Array.from(document.querySelectorAll('.user-select:checked'));
+    if (selectedUsers.length === 0) {
+        showToast('warning', 'Please select at least one user to export');
+        return;
+    }
+
+    const userIds = selectedUsers.map(checkbox => checkbox.dataset.userid);
+
+    fetch('/api/admin/export-users', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ user_ids: userIds })
+    })
+    .then(response => {
+        if (response.ok) {
+            return response.blob();
+        }
+        throw new Error('Export failed');
+    })
+    .then(blob => {
+        const url = window.URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.style.display = 'none';
+        a.href = url;
+        a.download = `user_export_${new Date().toISOString().slice(0, 10)}.csv`;
+        document.body.appendChild(a);
+        a.click();
+        window.URL.revokeObjectURL(url);
+        showToast('success', 'Export successful');
+    })
+    .catch(error => {
+        console.error('Export error:', error);
+        showToast('error', 'Failed to export user data');
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    loadSystemStatus();
+    loadRecentActivities();
+});
+
+async function loadSystemStatus() {
+    try {
+        const response = await fetch('/api/admin/system-status');
+        const data = await response.json();
+
+        const serverStatusEl = document.getElementById('serverStatus');
+        serverStatusEl.innerHTML = data.server.status === 'healthy' 
+            ? `Healthy <i class="fas fa-check-circle"></i>` 
+            : `Unhealthy <i class="fas fa-exclamation-circle"></i>`;
+        serverStatusEl.className = `status-value ${data.server.status}`;
+
+        const dbStatusEl = document.getElementById('databaseStatus');
+        dbStatusEl.innerHTML = data.database.status === 'healthy' 
+            ? `Connected <i class="fas fa-check-circle"></i>` 
+            : `Disconnected <i class="fas fa-exclamation-circle"></i>`;
+        dbStatusEl.className = `status-value ${data.database.status}`;
+
+        const lastBackupEl = document.getElementById('lastBackup');
+        lastBackupEl.textContent = data.backup.last_backup || 'Not available';
+    } catch (error) {
+        console.error('Error loading system status:', error);
+        document.getElementById('serverStatus').innerHTML = `Unknown <i class="fas fa-question-circle"></i>`;
+        document.getElementById('databaseStatus').innerHTML = `Unknown <i class="fas fa-question-circle"></i>`;
+        document.getElementById('lastBackup').textContent = 'Not available';
+    }
+}
+
+function loadVisitData() {
+    loadRecentActivities(true);
+}
+
+function loadRecentActivities(replaceAll = true) {
+    fetch('/api/admin/recent-activities')
+        .then(response => response.json())
+        .then(data => {
+            const activitiesList = document.getElementById('recentActivitiesList');
+            if (replaceAll) {
+                activitiesList.innerHTML = '';
+            }
+
+            if (data.activities && data.activities.length > 0) {
+                data.activities.forEach(activity => {
+                    const li = document.createElement('li');
+                    li.className = 'activity-item';
+
+                    const activityIcon = document.createElement('div');
+                    activityIcon.className = 'activity-icon';
+
+                    let iconClass = 'fa-info-circle';
+                    switch (activity.type) {
+                        case 'user_registration':
+                            iconClass = 'fa-user-plus';
+                            break;
+                        case 'site_creation':
+                            iconClass = 'fa-globe';
+                            break;
+                        case 'admin_change':
+                            iconClass = 'fa-user-shield';
+                            break;
+                        case 'site_deletion':
+                            iconClass = 'fa-trash-alt';
+                            break;
+                        case 'user_login':
+                            iconClass = 'fa-sign-in-alt';
+                            break;
+                    }
+
+                    activityIcon.innerHTML = `<i class="fas ${iconClass}"></i>`;
+
+                    const activityDetails = document.createElement('div');
+                    activityDetails.className = 'activity-details';
+
+                    let message = activity.message;
+                    if (activity.username) {
+                        message = message.replace('{username}', `<strong>${activity.username}</strong>`);
+                    }
+
+                    activityDetails.innerHTML = `
+                        <p>${message}</p>
+                        <span class="activity-time">${formatTimeAgo(activity.timestamp)}</span>
+                    `;
+
+                    li.appendChild(activityIcon);
+                    li.appendChild(activityDetails);
+                    activitiesList.appendChild(li);
+
+                    setTimeout(() => {
+                        li.classList.add('fade-in');
+                    }, 100 * activitiesList.children.length);
+                });
+            } else {
+                activitiesList.innerHTML = `
+                    <li class="activity-item">
+                        <div class="activity-details">
+                            <p>No recent activities found</p>
+                        </div>
+                    </li>
+                `;
+            }
+        })
+        .catch(error => {
+            console.error('Error loading recent activities:', error);
+            document.getElementById('recentActivitiesList').innerHTML = `
+                <li class="activity-item">
+                    <div class="activity-details">
+                        <p>Failed to load recent activities</p>
+                    </div>
+                </li>
+            `;
+        });
+}
+
+function formatTimeAgo(timestamp) {
+    const now = new Date();
+    const activityTime = new Date(timestamp);
+    const diffInSeconds = Math.floor((now - activityTime) / 1000);
+
+    if (diffInSeconds < 60) {
+        return 'just now';
+    } else if (diffInSeconds < 3600) {
+        const minutes = Math.floor(diffInSeconds / 60);
+        return `${minutes} minute${minutes > 1 ? 's' : ''} ago`;
+    } else if (diffInSeconds < 86400) {
+        const hours = Math.floor(diffInSeconds / 3600);
+        return `${hours} hour${hours > 1 ? 's' : ''} ago`;
+    } else if (diffInSeconds < 604800) {
+        const days = Math.floor(diffInSeconds / 86400);
+        return `${days} day${days > 1 ? 's' : ''} ago`;
+    } else {
+        return activityTime.toLocaleDateString();
+    }
+}
+
+async function updateAnalytics(period) {
+    document.querySelectorAll('.time-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    document.querySelector(`.time-btn[data-period="${period}"]`).classList.add('active');
+
+    try {
+        showLoadingState();
+        const response = await fetch(`/api/admin/analytics?period=${period}`);
+        const data = await response.json();
+
+        renderUserRegistrationsChart(data.user_registrations);
+        renderSiteTypesChart(data.site_types);
+        renderTrafficSourcesChart(data.traffic_sources);
+        renderPlatformUsageChart(data.platform_usage);
+    } catch (error) {
+        console.error('Error loading analytics data:', error);
+        showErrorState();
+    }
+}
+
+function showLoadingState() {
+    document.getElementById('userRegistrationsChart').innerHTML = `
+        <div class="loading-spinner"></div>
+        <p>Loading chart data...</p>
+    `;
+    document.getElementById('siteTypesChart').innerHTML = `
+        <div class="loading-spinner"></div>
+        <p>Loading chart data...</p>
+    `;
+    document.getElementById('trafficSourcesChart').innerHTML = `
+        <div class="loading-spinner"></div>
+        <p>Loading chart data...</p>
+    `;
+    document.getElementById('platformUsageChart').innerHTML = `
+        <div class="loading-spinner"></div>
+        <p>Loading chart data...</p>
+    `;
+}
+
+function showErrorState() {
+    const errorMessage = `
+        <div class="error-message">
+            <i class="fas fa-exclamation-triangle"></i>
+            <p>Failed to load analytics data</p>
+        </div>
+    `;
+
+    document.getElementById('userRegistrationsChart').innerHTML = errorMessage;
+    document.getElementById('siteTypesChart').innerHTML = errorMessage;
+    document.getElementById('trafficSourcesChart').innerHTML = errorMessage;
+    document.getElementById('platformUsageChart').innerHTML = errorMessage;
+}
+
+function renderUserRegistrationsChart(data) {
+    const chartContainer = document.getElementById('userRegistrationsChart');
+    chartContainer.innerHTML = '';
+
+    const chartBars = document.createElement('div');
+    chartBars.className = 'chart-bars';
+
+    const maxValue = Math.max(...data.values, 1);
+
+    data.values.forEach((value, index) => {
+        const height = (value / maxValue) * 100;
+        const bar = document.createElement('div');
+        bar.className = 'chart-bar';
+        bar.style.height = `${height}%`;
+
+        bar.setAttribute('title', `${data.labels[index]}: ${value} registrations`);
+
+        chartBars.appendChild(bar);
+
+        setTimeout(() => {
+            bar.style.height = `${height}%`;
+        }, 100 * index);
+    });
+
+    chartContainer.appendChild(chartBars);
+}
+
+function renderSiteTypesChart(data) {
+    const chartContainer = document.getElementById('siteTypesChart');
+    chartContainer.innerHTML = '';
+
+    const webPercentage = data.web;
+    const pythonPercentage = data.python;
+
+    const pieChart = document.createElement('div');
+    pieChart.className = 'pie-chart';
+
+    const webSegment = document.createElement('div');
+    webSegment.className = 'pie-segment';
+    webSegment.style.transform = 'rotate(0deg)';
+    webSegment.style.backgroundColor = 'var(--primary)';
+
+    const pythonSegment = document.createElement('div');
+    pythonSegment.className = 'pie-segment';
+    pythonSegment.style.transform = `rotate(${webPercentage * 3.6}deg)`;
+    pythonSegment.style.backgroundColor = 'var(--accent)';
+
+    const pieCenter = document.createElement('div');
+    pieCenter.className = 'pie-center';
+    pieCenter.textContent = `${webPercentage}%`;
+
+    pieChart.appendChild(webSegment);
+    pieChart.appendChild(pythonSegment);
+    pieChart.appendChild(pieCenter);
+
+    const chartLegend = document.createElement('div');
+    chartLegend.className = 'chart-legend';
+
+    chartLegend.innerHTML = `
+        <div class="legend-item">
+            <span class="legend-color" style="background-color: var(--primary);"></span>
+            <span>Web Sites (${webPercentage}%)</span>
+        </div>
+        <div class="legend-item">
+            <span class="legend-color" style="background-color: var(--accent);"></span>
+            <span>Python Sites (${pythonPercentage}%)</span>
+        </div>
+    `;
+
+    chartContainer.appendChild(pieChart);
+    chartContainer.appendChild(chartLegend);
+
+    setTimeout(() => {
+        pieCenter.textContent = `${webPercentage}%`;
+        pythonSegment.style.transform = `rotate(${webPercentage * 3.6}deg)`;
+    }, 300);
+}
+
+function renderTrafficSourcesChart(data) {
+    const chartContainer = document.getElementById('trafficSourcesChart');
+    chartContainer.innerHTML = '';
+
+    const horizontalBars = document.createElement('div');
+    horizontalBars.className = 'horizontal-bars';
+
+    Object.entries(data).forEach(([source, percentage]) => {
+        const barItem = document.createElement('div');
+        barItem.className = 'horizontal-bar-item';
+
+        barItem.innerHTML = `
+            <span class="bar-label">${source}</span>
+            <div class="bar-container">
+                <div class="horizontal-bar" style="width: 0%"></div>
+            </div>
+            <span class="bar-value">${percentage}%</span>
+        `;
+
+        horizontalBars.appendChild(barItem);
+
+        setTimeout(() => {
+            barItem.querySelector('.horizontal-bar').style.width = `${percentage}%`;
+        }, 300);
+    });
+
+    chartContainer.appendChild(horizontalBars);
+}
+
+function renderPlatformUsageChart(data) {
+    const chartContainer = document.getElementById('platformUsageChart');
+    chartContainer.innerHTML = '';
+
+    const lineChart = document.createElement('div');
+    lineChart.className = 'line-chart';
+
+    const maxValue = Math.max(...data.values, 1);
+    const points = data.values.map((value, index) => {
+        const x = (index / (data.values.length - 1)) * 500;
+        const y = 200 - ((value / maxValue) * 180);
+        return `${x},${y}`;
+    }).join(' ');
+
+    lineChart.innerHTML = `
+        <svg viewBox="0 0 500 200" class="chart">
+            <polyline
+                fill="none"
+                stroke="var(--primary)"
+                stroke-width="3"
+                points="${points}"
+            />
+        </svg>
+    `;
+
+    chartContainer.appendChild(lineChart);
+}
+
+function exportChart(chartId) {
+    showToast('info', `Exporting ${chartId} data...`);
+
+    fetch(`/api/admin/analytics/export?chart=${chartId}`)
+        .then(response => {
+            if (response.ok) {
+                return response.blob();
+            }
+            throw new Error('Export failed');
+        })
+        .then(blob => {
+            const url = window.URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.style.display = 'none';
+            a.href = url;
+            a.download = `${chartId}_export.csv`;
+            document.body.appendChild(a);
+            a.click();
+            window.URL.revokeObjectURL(url);
+            showToast('success', 'Export successful');
+        })
+        .catch(error => {
+            console.error('Export error:', error);
+            showToast('error', 'Failed to export data');
+        });
+}
+
+function saveMaxSitesPerUser() {
+    const maxSites = document.getElementById('maxSitesPerUser').value;
+
+    if (maxSites < 1 || maxSites > 10) {
+        showToast('error', 'Max sites must be between 1 and 10');
+        return;
+    }
+
+    fetch('/api/admin/settings/max-sites', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ maxSites: parseInt(maxSites) })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.message) {
+            showToast('success', data.message);
+        } else {
+            showToast('error', data.error || 'Failed to update max sites setting');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showToast('error', 'Failed to update max sites setting');
+    });
+}
+
+function toggleClubLeader(userId, username, isClubLeader) {
+    if (!confirm(`Are you sure you want to ${isClubLeader ? 'make' : 'remove'} ${username} ${isClubLeader ? 'a Club Leader' : 'as Club Leader'}?`)) {
+        return;
+    }
+
+    showToast('info', `${isClubLeader ? 'Making' : 'Removing'} ${username} as club leader...`);
+
+    fetch(`/api/admin/users/${userId}/club-leader`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ is_club_leader: isClubLeader })
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
+        }
+        return response.json();
+    })
+    .then(data => {
+        showToast('success', data.message || `Successfully ${isClubLeader ? 'made' : 'removed'} ${username} ${isClubLeader ? 'a' : 'as'} club leader`);
+        // Force reload after a short delay to ensure the UI updates
+        setTimeout(() => {
+            window.location.href = window.location.pathname + '?updated=' + new Date().getTime();
+        }, 1500);
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showToast('error', 'Failed to update club leader status: ' + error.message);
+    });
+}
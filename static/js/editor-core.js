@@ -1,6 +1,10 @@
 let editor;
 let currentFile = "index.html";
 let fileContents = {};
+// Content and hash of each page as last stored on the server; autosave
+// sends patches against these
+let savedContents = {};
+let savedHashes = {};
 let siteId = null;
 let siteType = null;
 let lastCursorPosition = { line: 0, ch: 0 };
@@ -200,6 +204,8 @@ function fetchSitePages() {
             if (data.success && data.pages) {
                 data.pages.forEach(page => {
                     fileContents[page.filename] = page.content;
+                    savedContents[page.filename] = page.content;
+                    savedHashes[page.filename] = page.content_hash;
 
                     if (!document.querySelector(`.file-tab[data-filename="${page.filename}"]`) && 
                         !["index.html", "styles.css", "script.js"].includes(page.filename)) {
@@ -378,6 +384,8 @@ function removeFile(filename) {
         tab.remove();
 
         delete fileContents[filename];
+        delete savedContents[filename];
+        delete savedHashes[filename];
 
         fetch(`/api/site/${siteId}/page/${filename}`, {
             method: 'DELETE',
@@ -534,29 +542,13 @@ function saveContent(silent = false) {
             return;
         }
 
-        const pages = Object.keys(fileContents).map(filename => {
-            const extension = filename.split('.').pop().toLowerCase();
-            return {
-                filename: filename,
-                content: fileContents[filename],
-                file_type: extension
-            };
-        });
-
         const saveBtn = document.getElementById('saveBtn');
         saveBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Saving...';
         saveBtn.disabled = true;
 
-        fetch(`/api/site/${siteId}/save_pages`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ pages: pages })
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
+        savePages(Object.keys(fileContents), false, silent)
+        .then(saved => {
+            if (saved) {
                 isDirty = false;
                 if (!silent) {
                     showToast("success", "Changes saved successfully!");
@@ -608,6 +600,90 @@ function saveContent(silent = false) {
     }
 }
 
+// Sends only the pages that changed since the last save, each as a patch
+// against the stored version where we have one. Pages the server can't
+// patch (stale base, e.g. saved from another tab) are sent again in full.
+function savePages(filenames, fullContent, autosave) {
+    const sent = {};
+    const pages = [];
+    filenames.forEach(filename => {
+        const content = fileContents[filename];
+        if (content === undefined || content === savedContents[filename]) {
+            return;
+        }
+        sent[filename] = content;
+        const page = {
+            filename: filename,
+            file_type: filename.split('.').pop().toLowerCase()
+        };
+        if (!fullContent && savedHashes[filename] && savedContents[filename] !== undefined) {
+            page.base_hash = savedHashes[filename];
+            page.ops = textOps(savedContents[filename], content);
+        } else {
+            page.content = content;
+        }
+        pages.push(page);
+    });
+
+    if (pages.length === 0) {
+        return Promise.resolve(true);
+    }
+
+    return fetch(`/api/site/${siteId}/patch_pages`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ pages: pages, autosave: autosave })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.success) {
+            return false;
+        }
+        Object.keys(data.hashes).forEach(filename => {
+            savedContents[filename] = sent[filename];
+            savedHashes[filename] = data.hashes[filename];
+        });
+        if (data.conflicts.length && !fullContent) {
+            return savePages(data.conflicts, true, autosave);
+        }
+        return data.conflicts.length === 0;
+    });
+}
+
+// One [start, end, text] op replacing the changed middle of `base`, found by
+// trimming the common prefix and suffix. Offsets are UTF-16 code units and
+// never split a surrogate pair.
+function textOps(base, content) {
+    const isLowSurrogate = (text, i) => {
+        const code = text.charCodeAt(i);
+        return code >= 0xDC00 && code <= 0xDFFF;
+    };
+
+    let prefix = 0;
+    const maxPrefix = Math.min(base.length, content.length);
+    while (prefix < maxPrefix && base[prefix] === content[prefix]) {
+        prefix++;
+    }
+    if (prefix > 0 && (isLowSurrogate(base, prefix) || isLowSurrogate(content, prefix))) {
+        prefix--;
+    }
+
+    let suffix = 0;
+    const maxSuffix = maxPrefix - prefix;
+    while (suffix < maxSuffix &&
+           base[base.length - 1 - suffix] === content[content.length - 1 - suffix]) {
+        suffix++;
+    }
+    if (suffix > 0 && (isLowSurrogate(base, base.length - suffix) ||
+                       isLowSurrogate(content, content.length - suffix))) {
+        suffix--;
+    }
+
+    return [[prefix, base.length - suffix, content.slice(prefix, content.length - suffix)]];
+}
+
 function updatePreview() {
     if (siteType !== 'web') return;
 
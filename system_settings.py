@@ -0,0 +1,140 @@
+import time
+import threading
+from collections import namedtuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db
+
+Setting = namedtuple('Setting', ['type', 'default', 'minimum'])
+
+SETTINGS = {
+    'max_sites_per_user': Setting(int, 10, 1),
+}
+
+# Row bumped by every write; workers compare it to notice changes
+VERSION_KEY = '_version'
+
+_BUMP_VERSION = db.text("""
+    INSERT INTO system_settings (key, value) VALUES (:key, '1')
+    ON CONFLICT (key) DO UPDATE
+    SET value = CAST(CAST(system_settings.value AS bigint) + 1 AS text)
+""")
+
+_UPSERT = db.text("""
+    INSERT INTO system_settings (key, value) VALUES (:key, :value)
+    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+""")
+
+
+def _parse(setting, value):
+    if setting.type is bool:
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return setting.type(value)
+
+
+def _format(value):
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+class SystemSettings:
+    """Per-process cache of the admin-editable ``system_settings`` rows.
+
+    Values are parsed to the types declared in ``SETTINGS``; missing or
+    unparseable rows fall back to the defaults. Every ``set()`` bumps a
+    version row in the same transaction, and each process checks that
+    row (a primary key lookup) at most every ``SYSTEM_SETTINGS_CHECK_INTERVAL``
+    seconds (default 1), reloading the table when it moved.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.check_interval = 1.0
+        self._values = None
+        self._version = None
+        # Only a successful read counts; the defaults after a failure don't
+        self._loaded = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.check_interval = app.config.get('SYSTEM_SETTINGS_CHECK_INTERVAL',
+                                             self.check_interval)
+
+    def get(self, key):
+        return self.get_all()[key]
+
+    def get_all(self):
+        """``{key: value}`` for every setting in ``SETTINGS``."""
+        values = self._values
+        if (values is not None
+                and time.monotonic() - self._checked_at < self.check_interval):
+            return values
+
+        with self._lock:
+            if (self._values is None or time.monotonic() - self._checked_at
+                    >= self.check_interval):
+                try:
+                    self._refresh()
+                except SQLAlchemyError as e:
+                    self.app.logger.error(
+                        f'Error loading system settings: {str(e)}')
+                    if self._values is None:
+                        self._values = self._parse_rows({})
+                # Retry a failed load on the next interval, not every call
+                self._checked_at = time.monotonic()
+            return self._values
+
+    def set(self, key, value):
+        """Store one setting and commit; other workers pick it up shortly.
+
+        Raises ValueError for unknown keys and invalid values.
+        """
+        if key not in SETTINGS:
+            raise ValueError(f'Unknown setting: {key}')
+        setting = SETTINGS[key]
+        try:
+            value = _parse(setting, str(value))
+        except ValueError:
+            raise ValueError(
+                f'{key} must be a {setting.type.__name__}') from None
+        if setting.minimum is not None and value < setting.minimum:
+            raise ValueError(f'{key} must be at least {setting.minimum}')
+
+        db.session.execute(_UPSERT, {'key': key, 'value': _format(value)})
+        db.session.execute(_BUMP_VERSION, {'key': VERSION_KEY})
+        db.session.commit()
+        # This process needn't wait for the next check
+        self._checked_at = 0.0
+        return value
+
+    def _refresh(self):
+        # Own connection, so a failure can't abort the request's transaction
+        with db.engine.connect() as conn:
+            version = conn.execute(
+                db.text('SELECT value FROM system_settings WHERE key = :key'),
+                {'key': VERSION_KEY}).scalar()
+            if self._loaded and version == self._version:
+                return
+            rows = dict(
+                conn.execute(
+                    db.text('SELECT key, value FROM system_settings')).all())
+        self._version = rows.get(VERSION_KEY)
+        self._values = self._parse_rows(rows)
+        self._loaded = True
+
+    def _parse_rows(self, rows):
+        values = {}
+        for key, setting in SETTINGS.items():
+            values[key] = setting.default
+            if rows.get(key) is not None:
+                try:
+                    values[key] = _parse(setting, rows[key])
+                except ValueError:
+                    self.app.logger.warning(
+                        f'Ignoring invalid system setting {key}={rows[key]!r}')
+        return values
+
+
+system_settings = SystemSettings()
@@ -0,0 +1,48 @@
+import time
+import threading
+
+from sqlalchemy import func
+
+from models import db, GalleryTag
+
+
+class TagFacetCache:
+    """Per-process cache of gallery tag counts for the filter bar.
+
+    The counts come from one GROUP BY over gallery_tag and are kept until
+    ``invalidate()`` is called by the gallery submit/remove/feature
+    routes. Other worker processes don't see that call, so entries also
+    expire after ``GALLERY_FACET_TTL`` seconds (default 300).
+    """
+
+    def __init__(self):
+        self.ttl = 300
+        self._facets = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('GALLERY_FACET_TTL', self.ttl)
+
+    def get(self):
+        """``[(tag, entry_count), ...]`` sorted by tag."""
+        facets = self._facets
+        if facets is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return facets
+
+        with self._lock:
+            if (self._facets is None
+                    or time.monotonic() - self._loaded_at >= self.ttl):
+                self._facets = [
+                    (tag, count) for tag, count in db.session.query(
+                        GalleryTag.tag, func.count()).group_by(
+                            GalleryTag.tag).order_by(GalleryTag.tag)
+                ]
+                self._loaded_at = time.monotonic()
+            return self._facets
+
+    def invalidate(self):
+        self._facets = None
+
+
+tag_facets = TagFacetCache()
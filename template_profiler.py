@@ -0,0 +1,86 @@
+import time
+import threading
+from collections import deque
+
+from flask import before_render_template, template_rendered
+
+
+class TemplateProfiler:
+    """Records how long each template takes to render.
+
+    Uses Flask's ``before_render_template`` / ``template_rendered`` signals,
+    so only top-level ``render_template`` calls are timed; includes and
+    macros are counted towards the template that pulls them in.
+    """
+
+    def __init__(self, window=200):
+        self.window = window
+        self.templates = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        before_render_template.connect(self._before_render, app, weak=False)
+        template_rendered.connect(self._after_render, app, weak=False)
+
+    def _before_render(self, sender, template, context, **extra):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return
+        elapsed_ms = (time.perf_counter() - stack.pop()) * 1000
+        name = template.name or '<string>'
+
+        with self._lock:
+            entry = self.templates.get(name)
+            if entry is None:
+                entry = self.templates[name] = {
+                    'renders': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'samples': deque(maxlen=self.window)
+                }
+            entry['renders'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['samples'].append(elapsed_ms)
+
+    def slowest(self, limit=20, sort_by='p95'):
+        """Return per-template render timings, slowest first."""
+        with self._lock:
+            snapshot = [(name, dict(entry, samples=sorted(entry['samples'])))
+                        for name, entry in self.templates.items()]
+
+        rows = []
+        for name, entry in snapshot:
+            samples = entry['samples']
+            rows.append({
+                'template': name,
+                'renders': entry['renders'],
+                'mean_ms': round(entry['total_ms'] / entry['renders'], 2),
+                'p95_ms': round(samples[int(0.95 * (len(samples) - 1))], 2)
+                if samples else 0,
+                'max_ms': round(entry['max_ms'], 2),
+                'total_ms': round(entry['total_ms'], 2)
+            })
+
+        sort_keys = {
+            'p95': lambda r: r['p95_ms'],
+            'mean': lambda r: r['mean_ms'],
+            'max': lambda r: r['max_ms'],
+            'total': lambda r: r['total_ms']
+        }
+        rows.sort(key=sort_keys.get(sort_by, sort_keys['p95']), reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.templates.clear()
+
+
+template_profiler = TemplateProfiler()
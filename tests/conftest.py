@@ -0,0 +1,58 @@
+"""Shared fixtures.
+
+Tests that need the database run against the scratch Postgres database
+in TEST_DATABASE_URL (its tables are dropped and recreated) and are
+skipped when it isn't set.
+"""
+import os
+import sys
+import importlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def spaces():
+    """The ``app`` module, bound to TEST_DATABASE_URL with fresh tables."""
+    url = os.environ.get('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('Set TEST_DATABASE_URL to a scratch Postgres database')
+    os.environ['DATABASE_URL'] = url
+    os.environ['PURGE_WORKER'] = 'off'
+    module = importlib.import_module('app')
+
+    from models import db
+    with module.app.app_context():
+        db.session.execute(db.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        db.session.commit()
+        db.drop_all()
+        db.create_all()
+        yield module
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def count_statements(spaces):
+    """``count_statements(fn)`` -> number of SQL statements ``fn()`` sent."""
+    from sqlalchemy import event
+    from models import db
+
+    def count(fn):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return len(statements)
+
+    return count
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+from models import db, User, Club, ClubMembership, ClubFeaturedProject, Site
+
+
+def make_club(name, members, sites_each=2):
+    leader = User(username=f'{name}-leader', email=f'{name}-leader@example.com')
+    leader.set_password('password')
+    db.session.add(leader)
+    db.session.flush()
+    club = Club(name=name, leader_id=leader.id)
+    db.session.add(club)
+    db.session.flush()
+
+    for i in range(members):
+        user = User(username=f'{name}-{i}', email=f'{name}-{i}@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(ClubMembership(user_id=user.id, club_id=club.id))
+        for j in range(sites_each):
+            site = Site(name=f'{name} site {i}-{j}', user_id=user.id)
+            db.session.add(site)
+            db.session.flush()
+            if j == 0:
+                db.session.add(
+                    ClubFeaturedProject(club_id=club.id, site_id=site.id,
+                                        featured_by=leader.id))
+    db.session.commit()
+    return club
+
+
+@pytest.fixture(scope='module')
+def clubs(spaces):
+    return make_club('small', members=1), make_club('large', members=50)
+
+
+def listing(spaces, club, path='/?page=1&per_page=100'):
+    with spaces.app.test_request_context(path):
+        rows, pagination = spaces.paginate_rows(
+            spaces.club_projects_query(club.id, leader_id=club.leader_id))
+        # Touch every column the endpoints serialise
+        return [(row.id, row.name, row.slug, row.owner_id,
+                 row.owner_username, row.featured) for row in rows], pagination
+
+
+def test_query_count_does_not_grow_with_members(spaces, clubs,
+                                                count_statements):
+    small, large = clubs
+    small_count = count_statements(lambda: listing(spaces, small))
+    large_count = count_statements(lambda: listing(spaces, large))
+    assert small_count == large_count == 1
+
+
+def test_listing_covers_every_member_site(spaces, clubs):
+    small, large = clubs
+    rows, pagination = listing(spaces, large)
+    assert pagination['total'] == 100
+    assert len(rows) == 100
+    assert sum(featured for *_, featured in rows) == 50
+
+    rows, pagination = listing(spaces, small)
+    assert pagination['total'] == len(rows) == 2
+
+
+def test_page_past_the_end_keeps_the_total(spaces, clubs):
+    _, large = clubs
+    rows, pagination = listing(spaces, large, '/?page=9&per_page=20')
+    assert rows == []
+    assert pagination['total'] == 100
+    assert pagination['pages'] == 5
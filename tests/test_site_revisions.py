@@ -0,0 +1,109 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+import site_revisions
+from site_revisions import (SNAPSHOT_INTERVAL, _chain, _decode, _encode,
+                            apply_delta, make_delta)
+from models import db, Site, SiteRevision, User, content_digest
+
+
+@pytest.mark.parametrize('base, content', [
+    ('', ''),
+    ('', '<p>new</p>\n'),
+    ('<p>old</p>\n', ''),
+    ('a\nb\nc\n', 'a\nB\nc\n'),
+    ('a\nb\nc', 'a\nb\nc\nd'),
+    ('no newline at end', 'no newline at end\n'),
+    ('dos\r\nline\r\n', 'dos\r\nline two\r\n'),
+    ('mac\rline\r', 'mac\rchanged\rline\r'),
+    ('mixed\nends\r\nhere\r', 'mixed\r\nends\nhere\n'),
+    ('page\x0cbreak\n', 'page\x0cnew break\x0c\n'),
+    ('emoji 😀\nline\n', 'emoji 😁\nline\n'),
+])
+def test_delta_round_trips(base, content):
+    assert apply_delta(base, make_delta(base, content)) == content
+    assert _decode(_encode(content, base), base) == content
+
+
+def test_snapshot_round_trips():
+    content = 'full\r\ncontent\x0c\n'
+    assert _decode(_encode(content)) == content
+
+
+def test_random_deltas_round_trip():
+    rng = random.Random(45)
+    pieces = ['a', 'b\n', '\r\n', '\r', '\x0c', '<p>', '😀', '\n']
+    for _ in range(1000):
+        base = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        content = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        assert apply_delta(base, make_delta(base, content)) == content
+
+
+def test_chain_starts_at_the_snapshot_and_stays_short():
+    limit = math.log2(SNAPSHOT_INTERVAL) + 1
+    for position in range(SNAPSHOT_INTERVAL):
+        chain = _chain(position)
+        assert chain[0] == 0
+        assert chain[-1] == position
+        assert chain == sorted(set(chain))
+        assert len(chain) <= limit
+        # Each step is a delta against the position with its low bit cleared
+        for base, target in zip(chain, chain[1:]):
+            assert target & (target - 1) == base
+
+
+def rebuild_all(site_id, filename):
+    rows = SiteRevision.query.filter_by(
+        site_id=site_id, filename=filename).order_by(SiteRevision.revision)
+    return [(row.revision, site_revisions.content_of(row), row.content_hash)
+            for row in rows]
+
+
+def test_compact_keeps_every_survivor_rebuildable(spaces):
+    user = User(username='revisions', email='revisions@example.com')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.flush()
+    site = Site(name='Revisions test', user_id=user.id)
+    db.session.add(site)
+    db.session.commit()
+
+    # Three runs' worth of saves, mostly autosaves, spread over 30 days
+    rng = random.Random(145)
+    lines = [f'<p>line {i}</p>\r\n' if i % 5 else f'<p>line {i}</p>\n'
+             for i in range(40)]
+    start = datetime.utcnow() - timedelta(days=30)
+    saves = 3 * SNAPSHOT_INTERVAL + 10
+    for i in range(saves):
+        lines[rng.randrange(len(lines))] = f'<p>edit {i}</p>\r\n'
+        if rng.random() < 0.2:
+            lines.insert(rng.randrange(len(lines)), f'<p>new {i}</p>\x0c\n')
+        (row,) = site_revisions.record(site.id, {'index.html': ''.join(lines)},
+                                       user_id=user.id, autosave=i % 7 != 0)
+        row.created_at = start + timedelta(hours=3 * i)
+        db.session.commit()
+
+    before = {revision: content
+              for revision, content, _ in rebuild_all(site.id, 'index.html')}
+    assert len(before) == saves
+
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    removed = site_revisions.compact(site.id, 'index.html', cutoff)
+    db.session.commit()
+    assert removed > 0
+
+    after = rebuild_all(site.id, 'index.html')
+    assert len(after) == saves - removed
+    for revision, content, content_hash in after:
+        assert content_digest(content) == content_hash
+        assert content == before[revision]
+
+    # Saves after compaction build on the new layout
+    (row,) = site_revisions.record(site.id, {'index.html': 'after compaction'})
+    db.session.commit()
+    assert site_revisions.content_of(row) == 'after compaction'
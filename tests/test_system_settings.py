@@ -0,0 +1,92 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+from sqlalchemy.exc import OperationalError
+
+import system_settings as settings_module
+from system_settings import SystemSettings, VERSION_KEY
+
+
+class FakeEngine:
+    """Stands in for db.engine: serves ``rows`` or fails while ``down``."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.down = False
+        self.full_reads = 0
+
+    def connect(self):
+        if self.down:
+            raise OperationalError('SELECT 1', {}, Exception('server closed'))
+        return FakeConnection(self)
+
+
+class FakeConnection:
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        rows = self.engine.rows
+        if params is not None:
+            return SimpleNamespace(scalar=lambda: rows.get(params['key']))
+        self.engine.full_reads += 1
+        return SimpleNamespace(all=lambda: list(rows.items()))
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = FakeEngine({'max_sites_per_user': '25'})
+    monkeypatch.setattr(settings_module, 'db',
+                        SimpleNamespace(engine=engine,
+                                        text=settings_module.db.text))
+    return engine
+
+
+@pytest.fixture
+def settings():
+    settings = SystemSettings()
+    settings.app = SimpleNamespace(logger=logging.getLogger(__name__))
+    settings.check_interval = 0
+    return settings
+
+
+def test_reads_stored_values(engine, settings):
+    assert settings.get('max_sites_per_user') == 25
+
+
+def test_stored_value_is_read_after_a_failed_first_load(engine, settings):
+    # No _version row, as in every database that predates the cache
+    assert VERSION_KEY not in engine.rows
+    engine.down = True
+    assert settings.get('max_sites_per_user') == 10
+
+    engine.down = False
+    assert settings.get('max_sites_per_user') == 25
+
+
+def test_failed_reload_keeps_the_last_values(engine, settings):
+    assert settings.get('max_sites_per_user') == 25
+    engine.down = True
+    assert settings.get('max_sites_per_user') == 25
+
+
+def test_unchanged_version_skips_the_reload(engine, settings):
+    engine.rows[VERSION_KEY] = '3'
+    settings.get_all()
+    settings.get_all()
+    assert engine.full_reads == 1
+
+    engine.rows.update({VERSION_KEY: '4', 'max_sites_per_user': '40'})
+    assert settings.get('max_sites_per_user') == 40
+    assert engine.full_reads == 2
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from text_patch import apply_ops
+
+
+def utf16(text):
+    """``text`` as a list of UTF-16 code units, like a JavaScript string."""
+    data = text.encode('utf-16-le', 'surrogatepass')
+    return [int.from_bytes(data[i:i + 2], 'little')
+            for i in range(0, len(data), 2)]
+
+
+def from_utf16(units):
+    return b''.join(unit.to_bytes(2, 'little') for unit in units).decode(
+        'utf-16-le', 'surrogatepass')
+
+
+def text_ops(base, content):
+    """Port of textOps() in static/js/editor-core.js."""
+    base, content = utf16(base), utf16(content)
+
+    def is_low_surrogate(units, i):
+        return i < len(units) and 0xDC00 <= units[i] <= 0xDFFF
+
+    prefix = 0
+    max_prefix = min(len(base), len(content))
+    while prefix < max_prefix and base[prefix] == content[prefix]:
+        prefix += 1
+    if prefix > 0 and (is_low_surrogate(base, prefix)
+                       or is_low_surrogate(content, prefix)):
+        prefix -= 1
+
+    suffix = 0
+    max_suffix = max_prefix - prefix
+    while (suffix < max_suffix
+           and base[len(base) - 1 - suffix] == content[len(content) - 1 - suffix]):
+        suffix += 1
+    if suffix > 0 and (is_low_surrogate(base, len(base) - suffix)
+                       or is_low_surrogate(content, len(content) - suffix)):
+        suffix -= 1
+
+    return [[prefix, len(base) - suffix,
+             from_utf16(content[prefix:len(content) - suffix])]]
+
+
+def test_insert():
+    assert apply_ops('<p>hi</p>', [[5, 5, ' there']]) == '<p>hi there</p>'
+
+
+def test_delete():
+    assert apply_ops('<p>hi there</p>', [[5, 11, '']]) == '<p>hi</p>'
+
+
+def test_replace():
+    assert apply_ops('color: red;', [[7, 10, 'blue']]) == 'color: blue;'
+
+
+def test_several_ops_refer_to_the_base():
+    assert apply_ops('abcdef', [[0, 1, 'X'], [2, 4, ''], [6, 6, '!']]) == 'Xbef!'
+
+
+def test_no_ops_returns_the_base():
+    assert apply_ops('unchanged', []) == 'unchanged'
+
+
+def test_offsets_count_utf16_code_units():
+    # Each emoji is two code units, so 'b' is at offset 3, not 2
+    assert apply_ops('a😀b', [[3, 4, 'c']]) == 'a😀c'
+    assert apply_ops('😀😁', [[2, 4, '🎉']]) == '😀🎉'
+
+
+def test_replacing_a_whole_surrogate_pair():
+    assert apply_ops('x😀y', [[1, 3, 'é']]) == 'xéy'
+    assert apply_ops('x😀y', [[1, 3, '']]) == 'xy'
+
+
+@pytest.mark.parametrize('op', [[2, 2, 'z'], [1, 2, ''], [2, 3, '']])
+def test_op_splitting_a_surrogate_pair_raises(op):
+    with pytest.raises(ValueError):
+        apply_ops('x😀y', [op])
+
+
+@pytest.mark.parametrize('op', [[0, 10, ''], [5, 4, 'x'], [-1, 0, 'x']])
+def test_out_of_range_offsets_raise(op):
+    with pytest.raises(ValueError):
+        apply_ops('short', [op])
+
+
+def test_overlapping_or_unsorted_ops_raise():
+    with pytest.raises(ValueError):
+        apply_ops('abcdef', [[2, 4, 'x'], [3, 5, 'y']])
+    with pytest.raises(ValueError):
+        apply_ops('abcdef', [[4, 5, 'x'], [0, 1, 'y']])
+
+
+@pytest.mark.parametrize('op', [[1, 2], [1, 2, 3], ['1', 2, 'x'], 'op', None])
+def test_malformed_ops_raise(op):
+    with pytest.raises(ValueError):
+        apply_ops('abc', [op])
+
+
+def test_ops_for_a_stale_base_raise():
+    # The client diffed against a longer version than the server has
+    saved = '<h1>Hello, world</h1>'
+    ops = text_ops(saved + '\n<p>more</p>', saved + '\n<p>more!</p>')
+    with pytest.raises(ValueError):
+        apply_ops('<h1>Hi</h1>', ops)
+
+
+@pytest.mark.parametrize('base, content', [
+    ('', 'new page'),
+    ('old page', ''),
+    ('<p>hello</p>', '<p>hello world</p>'),
+    ('aaaa', 'aaaaa'),
+    ('😀', '😁'),
+    ('a😀b', 'a😁b'),
+    ('😀😀', '😀'),
+    ('\U0001F600', '\U0001F601\U0001F600'),
+    ('x\U0001F600', 'x\U0001F680'),
+])
+def test_client_ops_reproduce_the_content(base, content):
+    assert apply_ops(base, text_ops(base, content)) == content
+
+
+def test_client_ops_reproduce_random_edits():
+    rng = random.Random(44)
+    alphabet = 'ab <>\né😀😁🎉\U0001F680'
+    for _ in range(2000):
+        base = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        content = list(base)
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randint(0, len(content))
+            j = rng.randint(i, min(len(content), i + 3))
+            content[i:j] = rng.choice(alphabet) * rng.randint(0, 2)
+        content = ''.join(content)
+        assert apply_ops(base, text_ops(base, content)) == content
@@ -0,0 +1,29 @@
+def apply_ops(base, ops):
+    """Apply ``[[start, end, text], ...]`` to ``base`` and return the result.
+
+    Each op replaces ``base[start:end]`` with ``text``. Offsets count
+    UTF-16 code units, as JavaScript string indices do, and all refer to
+    ``base``, so ops must be sorted and must not overlap. Raises
+    ValueError for malformed ops or a result that isn't valid text.
+    """
+    units = base.encode('utf-16-le', 'surrogatepass')
+    length = len(units) // 2
+    parts, position = [], 0
+    for op in ops:
+        if not isinstance(op, (list, tuple)) or len(op) != 3:
+            raise ValueError(f'Malformed op: {op!r}')
+        start, end, text = op
+        if not (isinstance(start, int) and isinstance(end, int)
+                and isinstance(text, str)):
+            raise ValueError(f'Malformed op: {op!r}')
+        if not position <= start <= end <= length:
+            raise ValueError(f'Op out of order or out of range: {op!r}')
+        parts.append(units[2 * position:2 * start])
+        parts.append(text.encode('utf-16-le', 'surrogatepass'))
+        position = end
+    parts.append(units[2 * position:])
+
+    result = b''.join(parts).decode('utf-16-le', 'surrogatepass')
+    # A patch that splits a surrogate pair leaves one unpaired
+    result.encode('utf-8')
+    return result
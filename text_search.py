@@ -0,0 +1,50 @@
+from sqlalchemy import func, or_, text
+
+from models import db
+
+_has_pg_trgm = None
+
+
+def has_pg_trgm():
+    """Whether the pg_trgm extension is installed; checked once."""
+    global _has_pg_trgm
+    if _has_pg_trgm is None:
+        try:
+            _has_pg_trgm = db.session.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).scalar() is not None
+        except Exception:
+            db.session.rollback()
+            _has_pg_trgm = False
+    return _has_pg_trgm
+
+
+def escape_like(term):
+    return (term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+
+
+def match_filter(term, *columns):
+    """Rows where any column contains ``term`` (or, with pg_trgm, is close).
+
+    Substring ILIKE and the % similarity operator (threshold
+    pg_trgm.similarity_threshold, 0.3 by default) can both use the
+    gin_trgm_ops indexes from migration 0004, so neither scans the table.
+    """
+    pattern = f'%{escape_like(term)}%'
+    clauses = [column.ilike(pattern, escape='\\') for column in columns]
+    if has_pg_trgm():
+        clauses += [column.op('%')(term) for column in columns]
+    return or_(*clauses)
+
+
+def rank(term, *columns):
+    """ORDER BY expression: best trigram similarity across ``columns``.
+
+    Without pg_trgm the order falls back to the columns themselves.
+    """
+    if not has_pg_trgm():
+        return columns[0]
+    scores = [func.similarity(func.coalesce(column, ''), term)
+              for column in columns]
+    score = scores[0] if len(scores) == 1 else func.greatest(*scores)
+    return score.desc()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Check that the hot lookup queries are planned with their indexes.
+
+Runs EXPLAIN (FORMAT JSON) for each query in HOT_QUERIES against the
+configured DATABASE_URL and reports whether the expected index shows up
+in the plan. On small tables Postgres rightly prefers a sequential scan,
+so those are reported as SKIP rather than FAIL; pass ``--force-index`` to
+plan with enable_seqscan off and check that the index is usable at all.
+
+    flask db upgrade && python verify_indexes.py --force-index
+"""
+import sys
+import json
+import argparse
+
+from sqlalchemy import text
+
+from app import app, db
+
+# Below this many rows a seq scan is the better plan anyway
+SMALL_TABLE_ROWS = 1000
+
+# (description, table, expected index, query); bind values are arbitrary,
+# only the shape of the plan matters
+HOT_QUERIES = (
+    ('Sites on a user dashboard', 'site', 'ix_site_user_id_updated_at',
+     'SELECT * FROM site WHERE user_id = 1 ORDER BY updated_at DESC'),
+    ('Recent activity of one type for a user', 'user_activity',
+     'ix_user_activity_user_type_timestamp',
+     "SELECT * FROM user_activity WHERE user_id = 1 "
+     "AND activity_type = 'login' ORDER BY timestamp DESC LIMIT 20"),
+    ('Members of a club', 'club_membership', 'ix_club_membership_club_id',
+     'SELECT * FROM club_membership WHERE club_id = 1'),
+    ('Memberships of a user', 'club_membership', 'uix_user_club',
+     'SELECT * FROM club_membership WHERE user_id = 1'),
+    ('Clubs led by a user', 'club', 'ix_club_leader_id',
+     'SELECT * FROM club WHERE leader_id = 1'),
+    ('Principals changed since a version', 'user', 'ix_user_principal_version',
+     'SELECT id, principal_version FROM "user" WHERE principal_version > 1000'),
+    ('Latest activity', 'user_activity', 'ix_user_activity_timestamp',
+     'SELECT * FROM user_activity ORDER BY timestamp DESC LIMIT 10'),
+    ('Gallery entries of a user', 'gallery_entry', 'ix_gallery_entry_user_id',
+     'SELECT * FROM gallery_entry WHERE user_id = 1'),
+    ('Featured gallery entries', 'gallery_entry',
+     'ix_gallery_entry_is_featured_added_at',
+     'SELECT * FROM gallery_entry WHERE is_featured '
+     'ORDER BY added_at DESC LIMIT 12'),
+    ('Latest gallery entries', 'gallery_entry', 'ix_gallery_entry_added_at',
+     'SELECT * FROM gallery_entry ORDER BY added_at DESC LIMIT 12'),
+    ('Gallery entries with a tag', 'gallery_tag',
+     'ix_gallery_tag_tag_entry_id',
+     "SELECT entry_id FROM gallery_tag WHERE tag = 'game'"),
+    ('Club feed', 'club_post', 'ix_club_post_club_id_created_at',
+     'SELECT * FROM club_post WHERE club_id = 1 '
+     'ORDER BY created_at DESC LIMIT 20'),
+    ('Channel history', 'club_chat_message',
+     'ix_club_chat_message_channel_id_created_at',
+     'SELECT * FROM club_chat_message WHERE channel_id = 1 '
+     'ORDER BY created_at DESC LIMIT 50'),
+    ('Pages of a site', 'site_page', 'uix_site_page',
+     'SELECT * FROM site_page WHERE site_id = 1'),
+)
+
+
+def plan_indexes(node):
+    """Every index name referenced anywhere in a JSON plan node."""
+    names = set()
+    if 'Index Name' in node:
+        names.add(node['Index Name'])
+    for child in node.get('Plans', ()):
+        names |= plan_indexes(child)
+    return names
+
+
+def with_partitions(conn, name):
+    """``name`` plus the partitions of it, for partitioned tables/indexes."""
+    return {name} | set(
+        conn.execute(
+            text('SELECT c.relname FROM pg_inherits i '
+                 'JOIN pg_class c ON c.oid = i.inhrelid '
+                 'JOIN pg_class p ON p.oid = i.inhparent '
+                 'WHERE p.relname = :name'), {'name': name}).scalars())
+
+
+def estimated_rows(conn, table):
+    return conn.execute(
+        text('SELECT sum(greatest(reltuples, 0)) FROM pg_class '
+             'WHERE relname = ANY(:tables)'),
+        {'tables': list(with_partitions(conn, table))}).scalar() or 0
+
+
+def verify(force_index=False):
+    failed = 0
+    with app.app_context(), db.engine.connect() as conn:
+        if force_index:
+            conn.execute(text('SET enable_seqscan = off'))
+
+        for description, table, index, query in HOT_QUERIES:
+            plan = conn.execute(text(f'EXPLAIN (FORMAT JSON) {query}')).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            used = plan_indexes(plan[0]['Plan'])
+
+            if used & with_partitions(conn, index):
+                status = 'OK'
+            elif (not force_index
+                  and estimated_rows(conn, table) < SMALL_TABLE_ROWS):
+                status = 'SKIP'
+            else:
+                status = 'FAIL'
+                failed += 1
+            found = ', '.join(sorted(used)) or 'seq scan'
+            print(f'{status:4}  {description:40} {index:45} ({found})')
+
+    print(f'{len(HOT_QUERIES) - failed}/{len(HOT_QUERIES)} queries use '
+          f'their index')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--force-index',
+                        action='store_true',
+                        help='plan with enable_seqscan off')
+    args = parser.parse_args()
+    sys.exit(verify(args.force_index))